@@ -3,4 +3,6 @@ from .bellman_ford import run_bellman_ford
 from .bfs_equal import run_bfs_equal
 from .dag_shortest import run_dag_shortest
 from .a_star import run_a_star
+from .jps import run_jps
 from .spfa import run_spfa
+from .multi_source import run_multi_source_dijkstra, run_multi_source_bfs
@@ -31,6 +31,7 @@ def run_a_star(G: nx.DiGraph, start_node, end_node):
     
     # Priority Queue stores (f_score, node) where f = g + h
     pq = [(0 + h(start_node), start_node)]
+    metrics.queue_pushes = metrics.peak_queue = 1
     
     yield {
         "visited": visited.copy(),
@@ -42,11 +43,14 @@ def run_a_star(G: nx.DiGraph, start_node, end_node):
     
     while pq:
         _, current_node = heapq.heappop(pq)
+        metrics.queue_pops += 1
         
         if current_node in visited:
+            metrics.stale_pops += 1
             continue
             
         visited.add(current_node)
+        metrics.nodes_settled += 1
         
         yield {
             "visited": visited.copy(),
@@ -80,6 +84,8 @@ def run_a_star(G: nx.DiGraph, start_node, end_node):
                 f_score = new_g + h(neighbor)
                 heapq.heappush(pq, (f_score, neighbor))
                 metrics.relaxations += 1
+                metrics.queue_pushes += 1
+                metrics.peak_queue = max(metrics.peak_queue, len(pq))
                 
                 yield {
                     "visited": visited.copy(),
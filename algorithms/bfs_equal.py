@@ -16,6 +16,7 @@ def run_bfs_equal(G: nx.DiGraph, start_node, end_node):
     parents = {node: None for node in G.nodes()}
     visited = set([start_node])
     queue = collections.deque([start_node])
+    metrics.queue_pushes = metrics.peak_queue = 1
     
     yield {
         "visited": visited.copy(),
@@ -27,6 +28,8 @@ def run_bfs_equal(G: nx.DiGraph, start_node, end_node):
     
     while queue:
         current_node = queue.popleft()
+        metrics.queue_pops += 1
+        metrics.nodes_settled += 1 # FIFO order: dequeued nodes are final
         
         yield {
             "visited": visited.copy(),
@@ -55,6 +58,8 @@ def run_bfs_equal(G: nx.DiGraph, start_node, end_node):
                 distances[neighbor] = distances[current_node] + 1
                 parents[neighbor] = current_node
                 queue.append(neighbor)
+                metrics.queue_pushes += 1
+                metrics.peak_queue = max(metrics.peak_queue, len(queue))
                 
                 metrics.comparisons += 1 # Conceptually checking if visited
                 metrics.relaxations += 1 # "Relaxing" by finding shortest path in unweighted
@@ -34,6 +34,7 @@ def run_dag_shortest(G: nx.DiGraph, start_node, end_node):
         # If we can't reach u, we can't reach its neighbors via u
         if distances[u] == float('inf'):
             continue
+        metrics.nodes_settled += 1 # topological order: dist[u] is final here
             
         yield {
             "visited": set(),
@@ -17,6 +17,7 @@ def run_dijkstra(G: nx.DiGraph, start_node, end_node):
     parents = {node: None for node in G.nodes()}
     visited = set()
     pq = [(0, start_node)]  # (distance, node)
+    metrics.queue_pushes = metrics.peak_queue = 1
     
     # Initial Yield
     yield {
@@ -29,15 +30,18 @@ def run_dijkstra(G: nx.DiGraph, start_node, end_node):
     
     while pq:
         current_dist, current_node = heapq.heappop(pq)
+        metrics.queue_pops += 1
         
         # Optimization: If we found end_node, we can stop (for single pair)
         # But for full visualization, we might want to continue or stop.
         # Let's stop early for now if target is found and processed.
         
         if current_node in visited:
+            metrics.stale_pops += 1
             continue
             
         visited.add(current_node)
+        metrics.nodes_settled += 1
         
         yield {
             "visited": visited.copy(),
@@ -70,6 +74,8 @@ def run_dijkstra(G: nx.DiGraph, start_node, end_node):
                 parents[neighbor] = current_node
                 heapq.heappush(pq, (new_dist, neighbor))
                 metrics.relaxations += 1
+                metrics.queue_pushes += 1
+                metrics.peak_queue = max(metrics.peak_queue, len(pq))
                 
                 yield {
                     "visited": visited.copy(),
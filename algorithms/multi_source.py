@@ -0,0 +1,163 @@
+import collections
+import heapq
+import time
+import networkx as nx
+from metrics import Metrics
+
+def run_multi_source_dijkstra(G: nx.DiGraph, sources, end_node=None):
+    """
+    Multi-Source Dijkstra generator (graph Voronoi partition).
+    All sources start in the queue at distance 0, so one pass gives every node
+    its nearest source ('owner') and the distance to it.
+    Yields: (graph_state, metrics, log_message)
+    """
+    metrics = Metrics()
+    metrics.start_time = time.perf_counter()
+    sources = list(dict.fromkeys(sources))
+
+    distances = {node: float('inf') for node in G.nodes()}
+    parents = {node: None for node in G.nodes()}
+    owner = {node: None for node in G.nodes()}
+    visited = set()
+    pq = []
+    for s in sources:
+        distances[s] = 0
+        owner[s] = s
+        heapq.heappush(pq, (0, s))
+    metrics.queue_pushes = metrics.peak_queue = len(pq)
+
+    yield {
+        "visited": visited.copy(),
+        "processing": set(sources),
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "owner": owner.copy(),
+        "q_nodes": [x[1] for x in pq]
+    }, metrics, f"Initialized Multi-Source Dijkstra. Sources: {sources}"
+
+    while pq:
+        current_dist, current_node = heapq.heappop(pq)
+        metrics.queue_pops += 1
+
+        if current_node in visited:
+            metrics.stale_pops += 1
+            continue
+
+        visited.add(current_node)
+        metrics.nodes_settled += 1
+
+        yield {
+            "visited": visited.copy(),
+            "processing": {current_node},
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "owner": owner.copy(),
+            "q_nodes": [x[1] for x in pq]
+        }, metrics, f"Settled {current_node} -> nearest source {owner[current_node]} (dist: {current_dist})"
+
+        for neighbor in G.neighbors(current_node):
+            weight = G.edges[current_node, neighbor].get('weight', 1)
+            new_dist = current_dist + weight
+
+            metrics.comparisons += 1
+
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                parents[neighbor] = current_node
+                owner[neighbor] = owner[current_node]
+                heapq.heappush(pq, (new_dist, neighbor))
+                metrics.relaxations += 1
+                metrics.queue_pushes += 1
+                metrics.peak_queue = max(metrics.peak_queue, len(pq))
+
+                yield {
+                    "visited": visited.copy(),
+                    "processing": {current_node, neighbor},
+                    "distances": distances.copy(),
+                    "parents": parents.copy(),
+                    "owner": owner.copy(),
+                    "q_nodes": [x[1] for x in pq]
+                }, metrics, f"Relaxing edge {current_node}->{neighbor}. New dist: {new_dist} (source {owner[neighbor]})"
+
+    metrics.end_time = time.perf_counter()
+    if end_node is not None:
+        metrics.final_cost = distances[end_node]
+        metrics.path_found = distances[end_node] != float('inf')
+
+    yield {
+        "visited": visited.copy(),
+        "processing": set(),
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "owner": owner.copy(),
+        "q_nodes": []
+    }, metrics, f"Voronoi partition complete: {len(visited)} nodes assigned to {len(sources)} sources."
+
+def run_multi_source_bfs(G: nx.DiGraph, sources, end_node=None):
+    """
+    Multi-Source BFS (Unweighted/Equal Weights) generator.
+    Same partition as Multi-Source Dijkstra when every edge costs 1, in O(V + E).
+    Yields: (graph_state, metrics, log_message)
+    """
+    metrics = Metrics()
+    metrics.start_time = time.perf_counter()
+    sources = list(dict.fromkeys(sources))
+
+    distances = {node: float('inf') for node in G.nodes()}
+    parents = {node: None for node in G.nodes()}
+    owner = {node: None for node in G.nodes()}
+    for s in sources:
+        distances[s] = 0
+        owner[s] = s
+    visited = set(sources)
+    queue = collections.deque(sources)
+    metrics.queue_pushes = metrics.peak_queue = len(queue)
+
+    yield {
+        "visited": visited.copy(),
+        "processing": set(sources),
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "owner": owner.copy(),
+        "q_nodes": list(queue)
+    }, metrics, f"Initialized Multi-Source BFS. Sources: {sources}"
+
+    while queue:
+        current_node = queue.popleft()
+        metrics.queue_pops += 1
+        metrics.nodes_settled += 1
+
+        for neighbor in G.neighbors(current_node):
+            metrics.comparisons += 1
+            if neighbor not in visited:
+                visited.add(neighbor)
+                distances[neighbor] = distances[current_node] + 1
+                parents[neighbor] = current_node
+                owner[neighbor] = owner[current_node]
+                queue.append(neighbor)
+                metrics.relaxations += 1
+                metrics.queue_pushes += 1
+                metrics.peak_queue = max(metrics.peak_queue, len(queue))
+
+                yield {
+                    "visited": visited.copy(),
+                    "processing": {current_node, neighbor},
+                    "distances": distances.copy(),
+                    "parents": parents.copy(),
+                    "owner": owner.copy(),
+                    "q_nodes": list(queue)
+                }, metrics, f"Discovered {neighbor} from source {owner[neighbor]}. Dist: {distances[neighbor]}"
+
+    metrics.end_time = time.perf_counter()
+    if end_node is not None:
+        metrics.final_cost = distances[end_node]
+        metrics.path_found = distances[end_node] != float('inf')
+
+    yield {
+        "visited": visited.copy(),
+        "processing": set(),
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "owner": owner.copy(),
+        "q_nodes": []
+    }, metrics, f"Voronoi partition complete: {len(visited)} nodes assigned to {len(sources)} sources."
@@ -17,6 +17,7 @@ def run_spfa(G: nx.DiGraph, start_node, end_node):
     parents = {node: None for node in G.nodes()}
     
     queue = collections.deque([start_node])
+    metrics.queue_pushes = metrics.peak_queue = 1
     in_queue = {node: False for node in G.nodes()}
     in_queue[start_node] = True
     
@@ -34,6 +35,7 @@ def run_spfa(G: nx.DiGraph, start_node, end_node):
     
     while queue:
         u = queue.popleft()
+        metrics.queue_pops += 1
         in_queue[u] = False
         
         yield {
@@ -55,6 +57,8 @@ def run_spfa(G: nx.DiGraph, start_node, end_node):
                 
                 if not in_queue[v]:
                     queue.append(v)
+                    metrics.queue_pushes += 1
+                    metrics.peak_queue = max(metrics.peak_queue, len(queue))
                     in_queue[v] = True
                     update_count[v] += 1
                     
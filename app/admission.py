@@ -0,0 +1,186 @@
+"""
+Cost-based admission control for the algorithm endpoints.
+
+Every run is priced before it starts from the graph size (n nodes, m arcs), the
+algorithm and how much of the trace is built. Then, against ADMISSION_BUDGET_S:
+
+    cheap                    -> runs straight away
+    expensive, within budget -> waits for one of ADMISSION_SLOTS slots (503 after
+                                ADMISSION_QUEUE_TIMEOUT_S), so a few big runs can't
+                                pin every worker thread
+    full trace over budget   -> downgraded to a sampled trace (DOWNGRADE_MAX_STEPS)
+                                when that fits
+    still over budget        -> 413 with the estimate and the budget
+
+Admitted runs still stop at their deadline (the request's timeout_ms, at most
+RUN_TIMEOUT_S) and answer with what they have, flagged partial.
+
+Estimates are rough upper bounds in seconds on the reference machine; scale them
+with ADMISSION_SECONDS_PER_UNIT on slower or faster hardware.
+"""
+import asyncio
+import contextlib
+import math
+import os
+
+from fastapi import HTTPException
+
+from app.algorithms import CancelToken
+from app.telemetry import ADMISSION_DECISIONS
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+SECONDS_PER_UNIT = _env_float("ADMISSION_SECONDS_PER_UNIT", 1e-7)
+BUDGET_S = _env_float("ADMISSION_BUDGET_S", 5.0)
+QUEUE_THRESHOLD_S = _env_float("ADMISSION_QUEUE_THRESHOLD_S", 0.25) # below this, no slot needed
+SLOTS = int(_env_float("ADMISSION_SLOTS", 2))
+QUEUE_TIMEOUT_S = _env_float("ADMISSION_QUEUE_TIMEOUT_S", 30.0)
+DOWNGRADE_MAX_STEPS = 200
+RUN_TIMEOUT_S = _env_float("RUN_TIMEOUT_S", 30.0) # longest a request may keep an engine running
+
+# One node's entries in one step (snapshot copy, sanitize, encode), relative to one
+# unit of algorithm work. The JSON path dominates traced runs; the binary one is lean.
+SNAPSHOT_UNITS = 80
+BINARY_SNAPSHOT_UNITS = 4
+# The SciPy solvers on a CompiledGraph do the same work in C
+COMPILED_FACTOR = 0.05
+K_PATHS = 5 # default k of the K-Shortest Paths engine (requests may ask for up to 50)
+
+def _log(n):
+    return math.log2(n + 2)
+
+# name -> (work units, steps of a full trace), as functions of n nodes, m arcs and
+# k paths (only K-Shortest Paths uses k).
+# Bellman-Ford stops early, after about as many rounds as the shortest-path tree is
+# deep; sqrt(n) is exact for grids and generous for random graphs.
+COST_MODELS = {
+    "Dijkstra": (lambda n, m, k: (n + m) * _log(n), lambda n, m, k: 2 * n),
+    "Uniform Cost Search": (lambda n, m, k: (n + m) * _log(n), lambda n, m, k: 2 * n),
+    "A*": (lambda n, m, k: (n + m) * _log(n), lambda n, m, k: 2 * n),
+    "Bellman-Ford": (lambda n, m, k: (n + m) * math.sqrt(n), lambda n, m, k: 2 * n),
+    "Floyd-Warshall": (lambda n, m, k: 2 * n ** 3, lambda n, m, k: 100 * n),
+    "K-Shortest Paths": (lambda n, m, k: k * (n + m) * _log(n), lambda n, m, k: k + 1),
+    "BFS": (lambda n, m, k: n + m, lambda n, m, k: 2 * n),
+    "DAG Shortest Path": (lambda n, m, k: 2 * (n + m), lambda n, m, k: 2 * n),
+}
+# "auto" before its graph has been scanned: priced as the slowest engine it may pick
+COST_MODELS["auto"] = COST_MODELS["Bellman-Ford"]
+
+def estimate(algorithm, n, m, trace="full", max_steps=None, compiled=False, binary=False, k=K_PATHS):
+    """
+    Estimated seconds for one run, response encoding included. trace is "full"
+    (every step), "sampled" (at most max_steps snapshots) or "result" (final state only).
+    """
+    work, full_steps = COST_MODELS[algorithm]
+    units = work(n, m, k) * (COMPILED_FACTOR if compiled else 1)
+    if trace != "result":
+        steps = full_steps(n, m, k)
+        if trace == "sampled" and max_steps is not None:
+            steps = min(steps, max_steps)
+        units += steps * n * (BINARY_SNAPSHOT_UNITS if binary else SNAPSHOT_UNITS)
+    return units * SECONDS_PER_UNIT
+
+def generation_estimate(num_nodes, density, directed):
+    """Estimated seconds for GraphGenerator.generate_graph; the spring layout is quadratic in n."""
+    _, m = generated_graph_size(num_nodes, density, directed)
+    return (35 * num_nodes ** 2 + 90 * m) * SECONDS_PER_UNIT
+
+def all_pairs_estimate(n, m):
+    """Estimated seconds for AllPairs.compute: one SciPy search per source."""
+    return n * (n + m) * _log(n) * COMPILED_FACTOR * SECONDS_PER_UNIT
+
+def json_graph_size(graph):
+    """(n, m arcs) of a /generate-graph style dict without building it."""
+    arcs = len(graph.get("edges", ()))
+    return len(graph.get("nodes", ())), arcs if graph.get("directed") else 2 * arcs
+
+def columns_graph_size(columns):
+    """(n, m arcs) of a columnar upload. O(m log m) without a nodes column: call it in the threadpool."""
+    if columns.nodes is not None:
+        n = len(columns.nodes)
+    else:
+        n = len(np.unique(np.concatenate((np.asarray(columns.source, dtype=np.int64),
+                                          np.asarray(columns.target, dtype=np.int64)))))
+    arcs = len(columns.source)
+    return n, arcs if columns.directed else 2 * arcs
+
+def generated_graph_size(num_nodes, density, directed):
+    """(n, m arcs) GraphGenerator.generate_graph will produce (the spanning path included)."""
+    pairs = num_nodes * (num_nodes - 1) if directed else num_nodes * (num_nodes - 1) // 2
+    edges = max(int(pairs * density), num_nodes - 1)
+    return num_nodes, edges if directed else 2 * edges
+
+def admit(route, seconds, what, hint="use a smaller graph or a cheaper algorithm"):
+    """Rejects (413) a run estimated over the budget. Returns the estimate."""
+    if seconds > BUDGET_S:
+        ADMISSION_DECISIONS.inc(route, "rejected")
+        raise HTTPException(status_code=413, detail={
+            "error": f"{what} is estimated at {seconds:.1f}s, over the {BUDGET_S:g}s budget; {hint}",
+            "estimate_s": round(seconds, 3),
+            "budget_s": BUDGET_S,
+        })
+    return seconds
+
+def admit_trace(route, algorithm, n, m, max_steps, binary=False, k=K_PATHS):
+    """
+    Admission for a traced run (/api/run-algorithm). Returns (seconds, max_steps):
+    max_steps is lowered to DOWNGRADE_MAX_STEPS when the requested trace is over
+    budget but the sampled one fits.
+    """
+    trace = "full" if max_steps is None else "sampled"
+    seconds = estimate(algorithm, n, m, trace, max_steps, binary=binary, k=k)
+    if seconds > BUDGET_S and (max_steps is None or max_steps > DOWNGRADE_MAX_STEPS):
+        cheaper = estimate(algorithm, n, m, "sampled", DOWNGRADE_MAX_STEPS, binary=binary, k=k)
+        if cheaper <= BUDGET_S:
+            ADMISSION_DECISIONS.inc(route, "downgraded")
+            return cheaper, DOWNGRADE_MAX_STEPS
+    return admit(route, seconds, f"{algorithm} on {n} nodes / {m} arcs",
+                 "use a smaller graph, a cheaper algorithm or a smaller max_steps"), max_steps
+
+# Created on first use, inside the running event loop
+_slots = None
+
+@contextlib.asynccontextmanager
+async def slot(route, seconds):
+    """Holds an expensive-run slot for the duration of the block; cheap runs pass through."""
+    global _slots
+    if seconds < QUEUE_THRESHOLD_S:
+        ADMISSION_DECISIONS.inc(route, "admitted")
+        yield
+        return
+
+    if _slots is None:
+        _slots = asyncio.Semaphore(SLOTS)
+    if not _slots.locked():
+        ADMISSION_DECISIONS.inc(route, "admitted")
+        await _slots.acquire()
+    else:
+        ADMISSION_DECISIONS.inc(route, "queued")
+        try:
+            await asyncio.wait_for(_slots.acquire(), QUEUE_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            ADMISSION_DECISIONS.inc(route, "timed_out")
+            raise HTTPException(status_code=503, detail={
+                "error": "Too many expensive runs in progress, try again later",
+                "estimate_s": round(seconds, 3),
+            }, headers={"Retry-After": str(math.ceil(QUEUE_TIMEOUT_S))})
+    try:
+        yield
+    finally:
+        _slots.release()
+
+def cancel_token(timeout_ms=None):
+    """CancelToken for one run: the request's timeout_ms, capped at RUN_TIMEOUT_S."""
+    timeout = RUN_TIMEOUT_S if timeout_ms is None else min(timeout_ms / 1000, RUN_TIMEOUT_S)
+    return CancelToken(timeout)
+
+def cost_headers(response, seconds, downgraded_steps=None):
+    response.headers["X-Cost-Estimate"] = f"{seconds:.3f}"
+    if downgraded_steps is not None:
+        response.headers["X-Admission"] = f"downgraded; max_steps={downgraded_steps}"
+    return response
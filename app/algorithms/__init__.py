@@ -1,13 +1,51 @@
-from .dijkstra import dijkstra_generator
-from .bellman_ford import bellman_ford_generator
-from .a_star import a_star_generator
-from .uniform_cost_search import uniform_cost_search_generator
-from .floyd_warshall import floyd_warshall_generator
-
-ALGORITHMS = {
-    "Dijkstra": dijkstra_generator,
-    "Bellman-Ford": bellman_ford_generator,
-    "A*": a_star_generator,
-    "Uniform Cost Search": uniform_cost_search_generator,
-    "Floyd-Warshall": floyd_warshall_generator
-}
+import importlib
+from collections.abc import Mapping
+
+class LazyRegistry(Mapping):
+    """
+    name -> engine generator, importing each engine module the first time it's asked
+    for, so worker startup doesn't pay for engines (and networkx) nobody has used yet.
+    Listing the names (keys, `in`) imports nothing.
+    """
+
+    def __init__(self, specs):
+        self._specs = dict(specs) # name -> "module:function", relative to this package
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        fn = self._loaded.get(name)
+        if fn is None:
+            module_name, attr = self._specs[name].split(":")
+            fn = getattr(importlib.import_module(module_name, __name__), attr)
+            self._loaded[name] = fn
+        return fn
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+ALGORITHMS = LazyRegistry({
+    "Dijkstra": ".dijkstra:dijkstra_generator",
+    "Bellman-Ford": ".bellman_ford:bellman_ford_generator",
+    "A*": ".a_star:a_star_generator",
+    "Uniform Cost Search": ".uniform_cost_search:uniform_cost_search_generator",
+    "Floyd-Warshall": ".floyd_warshall:floyd_warshall_generator",
+    "K-Shortest Paths": ".k_shortest_paths:k_shortest_generator"
+})
+
+# Exact only on some graphs (equal weights, DAGs), so not offered directly: the
+# "auto" planner (app/planner.py) picks them when a graph qualifies
+SPECIALIZED_ALGORITHMS = LazyRegistry({
+    "BFS": ".bfs:bfs_generator",
+    "DAG Shortest Path": ".dag_shortest:dag_shortest_generator"
+})
+
+from .tracing import Tracer, StepSampler, EventCounter, CancelToken, result_only
+from .paths import reconstruct_path
+from .distance_table import distance_table
+from .multi_source import nearest_sources
@@ -1,6 +1,7 @@
 import heapq
 import networkx as nx
 import math
+from .tracing import Tracer, INIT, SETTLE, RELAX, FINAL
 
 def heuristic(a, b, G):
     # Simple Euclidean distance heuristic (assuming x, y coords exist)
@@ -11,7 +12,8 @@ def heuristic(a, b, G):
          return math.sqrt((pos_a['x'] - pos_b['x'])**2 + (pos_a['y'] - pos_b['y'])**2)
     return 0
 
-def a_star_generator(G, start_node, end_node):
+def a_star_generator(G, start_node, end_node, tracer=None):
+    tracer = tracer or Tracer()
     distances = {node: float('inf') for node in G.nodes()} # g_score
     distances[start_node] = 0
     f_scores = {node: float('inf') for node in G.nodes()}
@@ -24,14 +26,15 @@ def a_star_generator(G, start_node, end_node):
     frontier_set = {start_node}
     pq = [(h_start, start_node)] # Sort by f_score
     
-    yield {
-        "visited": list(visited),
-        "frontier": list(frontier_set),
-        "current_node": start_node,
-        "distances": distances.copy(),
-        "parents": parents.copy(),
-        "description": f"Initialized A*. Start: {start_node}, h: {h_start:.2f}"
-    }
+    if tracer.wants(INIT):
+        yield {
+            "visited": list(visited),
+            "frontier": list(frontier_set),
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Initialized A*. Start: {start_node}, h: {h_start:.2f}"
+        }
     
     while pq:
         _, current_node = heapq.heappop(pq)
@@ -43,16 +46,18 @@ def a_star_generator(G, start_node, end_node):
         if current_node in frontier_set:
             frontier_set.remove(current_node)
 
-        yield {
-            "visited": list(visited),
-            "frontier": list(frontier_set),
-            "current_node": current_node,
-            "distances": distances.copy(),
-            "parents": parents.copy(),
-            "description": f"Processing {current_node}. g: {distances[current_node]:.2f}"
-        }
+        if tracer.wants(SETTLE):
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Processing {current_node}. g: {distances[current_node]:.2f}"
+            }
 
         if current_node == end_node:
+             tracer.wants(FINAL)
              yield {
                 "visited": list(visited),
                 "frontier": list(frontier_set),
@@ -77,11 +82,23 @@ def a_star_generator(G, start_node, end_node):
                 heapq.heappush(pq, (f, neighbor))
                 frontier_set.add(neighbor)
                 
-                yield {
-                    "visited": list(visited),
-                    "frontier": list(frontier_set),
-                    "current_node": neighbor,
-                    "distances": distances.copy(),
-                    "parents": parents.copy(),
-                    "description": f"Updated {neighbor}. g: {tentative_g:.2f}, h: {h:.2f}, f: {f:.2f}"
-                }
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(visited),
+                        "frontier": list(frontier_set),
+                        "current_node": neighbor,
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Updated {neighbor}. g: {tentative_g:.2f}, h: {h:.2f}, f: {f:.2f}"
+                    }
+    else:
+        # Open set ran dry without reaching the goal
+        tracer.wants(FINAL)
+        yield {
+            "visited": list(visited),
+            "frontier": [],
+            "current_node": end_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Goal {end_node} unreachable."
+        }
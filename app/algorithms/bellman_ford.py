@@ -1,6 +1,8 @@
 import networkx as nx
+from .tracing import Tracer, INIT, RELAX, FINAL
 
-def bellman_ford_generator(G, start_node, end_node):
+def bellman_ford_generator(G, start_node, end_node, tracer=None):
+    tracer = tracer or Tracer()
     distances = {node: float('inf') for node in G.nodes()}
     distances[start_node] = 0
     parents = {node: None for node in G.nodes()}
@@ -8,14 +10,15 @@ def bellman_ford_generator(G, start_node, end_node):
     nodes = list(G.nodes())
     num_nodes = len(nodes)
     
-    yield {
-        "visited": [],
-        "frontier": [],
-        "current_node": start_node,
-        "distances": distances.copy(),
-        "parents": parents.copy(),
-        "description": "Initialized Bellman-Ford"
-    }
+    if tracer.wants(INIT):
+        yield {
+            "visited": [],
+            "frontier": [],
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": "Initialized Bellman-Ford"
+        }
     
     # Relax edges |V| - 1 times
     for i in range(num_nodes - 1):
@@ -32,16 +35,19 @@ def bellman_ford_generator(G, start_node, end_node):
                 parents[v] = u
                 changed = True
                 
-                yield {
-                    "visited": list(iteration_nodes), # Not really "visited" in same sense, but "touched"
-                    "frontier": [],
-                    "current_node": v,
-                    "distances": distances.copy(),
-                    "parents": parents.copy(),
-                    "description": f"Round {i+1}: Relaxed {u}->{v}"
-                }
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(iteration_nodes), # Not really "visited" in same sense, but "touched"
+                        "frontier": [],
+                        "current_node": v,
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Round {i+1}: Relaxed {u}->{v}"
+                    }
                 
         if not changed:
+            # Nothing relaxes any more, so there's no negative cycle either: this is the final step
+            tracer.wants(FINAL)
             yield {
                 "visited": nodes,
                 "frontier": [],
@@ -50,17 +56,30 @@ def bellman_ford_generator(G, start_node, end_node):
                 "parents": parents.copy(),
                 "description": f"Converged early at round {i+1}"
             }
-            break
+            return
             
     # Check for negative cycles (optional, though user said +ve weights only)
     # But for completeness:
+    negative_cycle = False
     for u, v, data in G.edges(data=True):
         if distances[u] + data.get('weight', 1) < distances[v]:
-             yield {
-                "visited": nodes,
-                "frontier": [],
-                "current_node": v,
-                "distances": distances.copy(),
-                "parents": parents.copy(),
-                "description": "Negative cycle detected!"
-            }
+            negative_cycle = True
+            if tracer.wants(RELAX):
+                yield {
+                    "visited": nodes,
+                    "frontier": [],
+                    "current_node": v,
+                    "distances": distances.copy(),
+                    "parents": parents.copy(),
+                    "description": "Negative cycle detected!"
+                }
+
+    tracer.wants(FINAL)
+    yield {
+        "visited": nodes,
+        "frontier": [],
+        "current_node": end_node,
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "description": "Negative cycle detected!" if negative_cycle else "Bellman-Ford complete"
+    }
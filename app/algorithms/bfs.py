@@ -0,0 +1,80 @@
+from collections import deque
+from .tracing import Tracer, INIT, SETTLE, RELAX, FINAL
+
+def bfs_generator(G, start_node, end_node, tracer=None):
+    # Exact only when every edge has the same weight w >= 0 (the "auto" planner checks):
+    # nodes are discovered level by level, so distance = hops * w, in O(n + m) with no heap.
+    tracer = tracer or Tracer()
+    weight = next((w for _, _, w in G.edges(data='weight', default=1)), 1)
+    distances = {node: float('inf') for node in G.nodes()}
+    distances[start_node] = 0
+    parents = {node: None for node in G.nodes()}
+    visited = set()
+    frontier_set = {start_node}
+    queue = deque([start_node])
+
+    if tracer.wants(INIT):
+        yield {
+            "visited": list(visited),
+            "frontier": list(frontier_set),
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Initialized BFS (every edge weighs {weight}). Start: {start_node}"
+        }
+
+    while queue:
+        current_node = queue.popleft()
+        visited.add(current_node)
+        frontier_set.discard(current_node)
+
+        if tracer.wants(SETTLE):
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Processing node {current_node} (Distance: {distances[current_node]})"
+            }
+
+        if current_node == end_node:
+            tracer.wants(FINAL)
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Goal {end_node} reached!"
+            }
+            break
+
+        new_dist = distances[current_node] + weight
+        for neighbor in G.neighbors(current_node):
+            # First discovery is on the shortest level; later ones never improve it
+            if parents[neighbor] is None and neighbor != start_node:
+                distances[neighbor] = new_dist
+                parents[neighbor] = current_node
+                queue.append(neighbor)
+                frontier_set.add(neighbor)
+
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(visited),
+                        "frontier": list(frontier_set),
+                        "current_node": neighbor,
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Discovered {neighbor}. Dist: {new_dist}"
+                    }
+    else:
+        tracer.wants(FINAL)
+        yield {
+            "visited": list(visited),
+            "frontier": [],
+            "current_node": end_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Goal {end_node} unreachable."
+        }
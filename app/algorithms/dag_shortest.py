@@ -0,0 +1,81 @@
+import networkx as nx
+from .tracing import Tracer, INIT, SETTLE, RELAX, FINAL
+
+def dag_shortest_generator(G, start_node, end_node, tracer=None):
+    # Directed acyclic graphs only (the "auto" planner checks): every edge is relaxed
+    # once, in topological order, so negative weights are fine and no heap is needed.
+    # Raises networkx.NetworkXUnfeasible on a cycle.
+    tracer = tracer or Tracer()
+    order = list(nx.topological_sort(G))
+    distances = {node: float('inf') for node in G.nodes()}
+    distances[start_node] = 0
+    parents = {node: None for node in G.nodes()}
+    visited = set()
+    frontier_set = {start_node}
+
+    if tracer.wants(INIT):
+        yield {
+            "visited": list(visited),
+            "frontier": list(frontier_set),
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Initialized DAG shortest path. Start: {start_node}"
+        }
+
+    # Nodes before the start in topological order can't be reached from it
+    for current_node in order[order.index(start_node):]:
+        if distances[current_node] == float('inf'):
+            continue
+        visited.add(current_node)
+        frontier_set.discard(current_node)
+
+        if tracer.wants(SETTLE):
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Processing node {current_node} (Distance: {distances[current_node]})"
+            }
+
+        # All of its predecessors came earlier, so its distance is final
+        if current_node == end_node:
+            tracer.wants(FINAL)
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Goal {end_node} reached!"
+            }
+            return
+
+        for neighbor in G.neighbors(current_node):
+            new_dist = distances[current_node] + G.edges[current_node, neighbor].get('weight', 1)
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                parents[neighbor] = current_node
+                frontier_set.add(neighbor)
+
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(visited),
+                        "frontier": list(frontier_set),
+                        "current_node": neighbor,
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Updated neighbor {neighbor}. New dist: {new_dist}"
+                    }
+
+    tracer.wants(FINAL)
+    yield {
+        "visited": list(visited),
+        "frontier": [],
+        "current_node": end_node,
+        "distances": distances.copy(),
+        "parents": parents.copy(),
+        "description": f"Goal {end_node} unreachable."
+    }
@@ -1,7 +1,9 @@
 import heapq
 import networkx as nx
+from .tracing import Tracer, INIT, SETTLE, RELAX, FINAL
 
-def dijkstra_generator(G, start_node, end_node):
+def dijkstra_generator(G, start_node, end_node, tracer=None):
+    tracer = tracer or Tracer()
     distances = {node: float('inf') for node in G.nodes()}
     distances[start_node] = 0
     parents = {node: None for node in G.nodes()}
@@ -9,14 +11,15 @@ def dijkstra_generator(G, start_node, end_node):
     frontier_set = {start_node}
     pq = [(0, start_node)]
     
-    yield {
-        "visited": list(visited),
-        "frontier": list(frontier_set),
-        "current_node": start_node,
-        "distances": distances.copy(),
-        "parents": parents.copy(),
-        "description": f"Initialized Dijkstra. Start: {start_node}"
-    }
+    if tracer.wants(INIT):
+        yield {
+            "visited": list(visited),
+            "frontier": list(frontier_set),
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Initialized Dijkstra. Start: {start_node}"
+        }
     
     while pq:
         current_dist, current_node = heapq.heappop(pq)
@@ -28,16 +31,18 @@ def dijkstra_generator(G, start_node, end_node):
         if current_node in frontier_set:
             frontier_set.remove(current_node)
             
-        yield {
-            "visited": list(visited),
-            "frontier": list(frontier_set),
-            "current_node": current_node,
-            "distances": distances.copy(),
-            "parents": parents.copy(),
-            "description": f"Processing node {current_node} (Distance: {current_dist})"
-        }
+        if tracer.wants(SETTLE):
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Processing node {current_node} (Distance: {current_dist})"
+            }
         
         if current_node == end_node:
+            tracer.wants(FINAL)
             yield {
                 "visited": list(visited),
                 "frontier": list(frontier_set),
@@ -58,11 +63,23 @@ def dijkstra_generator(G, start_node, end_node):
                 heapq.heappush(pq, (new_dist, neighbor))
                 frontier_set.add(neighbor)
                 
-                yield {
-                    "visited": list(visited),
-                    "frontier": list(frontier_set),
-                    "current_node": neighbor, # Highlight the neighbor being updated
-                    "distances": distances.copy(),
-                    "parents": parents.copy(),
-                    "description": f"Updated neighbor {neighbor}. New dist: {new_dist}"
-                }
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(visited),
+                        "frontier": list(frontier_set),
+                        "current_node": neighbor, # Highlight the neighbor being updated
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Updated neighbor {neighbor}. New dist: {new_dist}"
+                    }
+    else:
+        # Queue ran dry without settling the goal
+        tracer.wants(FINAL)
+        yield {
+            "visited": list(visited),
+            "frontier": [],
+            "current_node": end_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Goal {end_node} unreachable."
+        }
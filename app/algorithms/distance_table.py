@@ -0,0 +1,99 @@
+import heapq
+import os
+import threading
+
+# Below this much work (sources * edges) a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 200_000
+
+def build_adjacency(G):
+    """
+    Plain {node: [(neighbor, weight), ...]} view of G.
+    Much cheaper to walk than G.edges[u, v] lookups, and cheap to pickle to workers.
+    """
+    return {
+        u: [(v, data.get('weight', 1)) for v, data in nbrs.items()]
+        for u, nbrs in G.adj.items()
+    }
+
+def bounded_dijkstra(adj, source, targets):
+    """
+    Dijkstra from one source that stops as soon as every target is settled.
+    Returns {target: distance}, with inf for unreachable targets.
+    """
+    result = {t: float('inf') for t in targets}
+    remaining = set(targets)
+    distances = {source: 0}
+    visited = set()
+    pq = [(0, source)]
+
+    while pq and remaining:
+        current_dist, current_node = heapq.heappop(pq)
+
+        if current_node in visited:
+            continue
+
+        visited.add(current_node)
+        if current_node in remaining:
+            result[current_node] = current_dist
+            remaining.discard(current_node)
+
+        for neighbor, weight in adj.get(current_node, ()):
+            new_dist = current_dist + weight
+            if new_dist < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_dist
+                heapq.heappush(pq, (new_dist, neighbor))
+
+    return result
+
+def _search_chunk(args):
+    adj, sources, targets = args
+    return [(source, bounded_dijkstra(adj, source, targets)) for source in sources]
+
+# One process pool for the whole process, created on first parallel table and reused:
+# spawning a pool per request costs more than most tables and lets requests pile up processes
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Imported here: multiprocessing is a noticeable chunk of worker startup
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _pool
+
+def distance_table(G, sources, targets, workers=None):
+    """
+    One-to-many / many-to-many shortest distances.
+    Runs a single bounded Dijkstra per source and spreads sources over worker processes.
+
+    Args:
+        G: NetworkX graph with 'weight' edge attributes (non-negative).
+        sources: Iterable of source nodes.
+        targets: Iterable of target nodes.
+        workers: Number of worker processes, at most os.cpu_count(). None picks
+                 one automatically (in-process for small jobs), 1 forces in-process.
+
+    Returns:
+        {source: {target: distance}}
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(dict.fromkeys(targets))
+    adj = build_adjacency(G)
+
+    cpus = os.cpu_count() or 1
+    if workers is None:
+        work = len(sources) * max(1, G.number_of_edges())
+        workers = min(len(sources), cpus) if work >= PARALLEL_THRESHOLD else 1
+    workers = min(workers, cpus, len(sources))
+
+    if workers <= 1:
+        return {s: bounded_dijkstra(adj, s, targets) for s in sources}
+
+    # One chunk of sources per worker, so the adjacency is pickled once per worker
+    chunks = [(adj, sources[i::workers], targets) for i in range(workers)]
+    table = {}
+    for results in _get_pool().map(_search_chunk, chunks):
+        table.update(results)
+    return {s: table[s] for s in sources}
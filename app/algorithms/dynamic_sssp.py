@@ -0,0 +1,137 @@
+import heapq
+
+class DynamicSSSP:
+    """
+    Single-source shortest paths kept up to date under edge updates (Ramalingam–Reps style).
+    Non-negative weights only.
+
+    The graph G is shared with the caller: mutate G first, then call repair() with the
+    old and new weight of the changed edge. Work is proportional to the nodes whose
+    distance or parent actually changes (plus their incident edges), not to the graph.
+    """
+
+    def __init__(self, G, source):
+        self.G = G
+        self.source = source
+        self.distances = {source: 0}
+        self.parents = {source: None}
+        self.children = {}
+        self._dijkstra([(0, source)])
+
+    def _pred(self, node):
+        return self.G.pred[node] if self.G.is_directed() else self.G.adj[node]
+
+    def _set_parent(self, node, parent):
+        old = self.parents.get(node)
+        if old is not None:
+            self.children[old].discard(node)
+        self.parents[node] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(node)
+
+    def _dijkstra(self, pq, allowed=None):
+        """Dijkstra from an already seeded heap, optionally restricted to the allowed node set."""
+        settled = []
+        done = set()
+        while pq:
+            dist, u = heapq.heappop(pq)
+            if u in done or dist > self.distances.get(u, float('inf')):
+                continue
+            done.add(u)
+            settled.append(u)
+
+            for v, data in self.G.adj[u].items():
+                if allowed is not None and v not in allowed:
+                    continue
+                new_dist = dist + data.get('weight', 1)
+                if new_dist < self.distances.get(v, float('inf')):
+                    self.distances[v] = new_dist
+                    self._set_parent(v, u)
+                    heapq.heappush(pq, (new_dist, v))
+        return settled
+
+    def _step(self, node, description):
+        # Only the node repaired in this step is reported (O(1) per step); callers
+        # merge the steps into their own copy
+        return {
+            "visited": [node],
+            "frontier": [],
+            "current_node": node,
+            "distances": {node: self.distances.get(node, float('inf'))},
+            "parents": {node: self.parents.get(node)},
+            "description": description
+        }
+
+    def repair(self, u, v, old_weight, new_weight):
+        """
+        Repairs distances after edge u->v changed from old_weight to new_weight
+        (None means the edge is absent). Yields one step per repaired node, holding
+        just that node.
+        For undirected graphs call it for both directions.
+        """
+        inf = float('inf')
+        old_weight = inf if old_weight is None else old_weight
+        new_weight = inf if new_weight is None else new_weight
+
+        if new_weight < old_weight:
+            # Insertion / decrease: only v and what it now reaches more cheaply can improve
+            if self.distances.get(u, inf) + new_weight >= self.distances.get(v, inf):
+                return
+            self.distances[v] = self.distances[u] + new_weight
+            self._set_parent(v, u)
+            for node in self._dijkstra([(self.distances[v], v)]):
+                yield self._step(node, f"Repaired {node}: dist {self.distances[node]}")
+            return
+
+        if new_weight == old_weight or self.parents.get(v) != u:
+            # Non-tree edge got worse: no shortest path used it
+            return
+
+        # Deletion / increase of a tree edge.
+        # Phase 1: walk v's subtree in old-distance order. A node keeps its distance if it
+        # has an equally short parent that is already known to be unaffected.
+        affected = set()
+        candidates = [(self.distances[v], v)]
+        while candidates:
+            dist, x = heapq.heappop(candidates)
+            alternative = None
+            for p, data in self._pred(x).items():
+                if p in affected or (p == u and x == v):
+                    continue
+                if self.distances.get(p, inf) + data.get('weight', 1) == dist and self.distances[p] < dist:
+                    alternative = p
+                    break
+
+            if alternative is not None:
+                self._set_parent(x, alternative)
+                continue
+
+            affected.add(x)
+            for child in self.children.get(x, ()):
+                heapq.heappush(candidates, (self.distances[child], child))
+
+        # Phase 2: affected nodes take their best edge from the unaffected region,
+        # then Dijkstra runs inside the affected region only.
+        pq = []
+        for x in affected:
+            best, best_parent = inf, None
+            for p, data in self._pred(x).items():
+                if p in affected:
+                    continue
+                candidate = self.distances.get(p, inf) + data.get('weight', 1)
+                if candidate < best:
+                    best, best_parent = candidate, p
+            self.distances[x] = best
+            self._set_parent(x, best_parent)
+            if best < inf:
+                heapq.heappush(pq, (best, x))
+
+        settled = set(self._dijkstra(pq, allowed=affected))
+
+        for x in sorted(affected, key=lambda n: self.distances[n]):
+            if x in settled:
+                yield self._step(x, f"Repaired {x}: dist {self.distances[x]}")
+            else:
+                self.distances.pop(x, None)
+                self._set_parent(x, None)
+                yield self._step(x, f"{x} is now unreachable")
@@ -1,6 +1,8 @@
 import networkx as nx
+from .tracing import Tracer, ROUND, FINAL
 
-def floyd_warshall_generator(G, start_node, end_node):
+def floyd_warshall_generator(G, start_node, end_node, tracer=None):
+    tracer = tracer or Tracer()
     # Floyd-Warshall is O(N^3), very slow for visualization but requested.
     # It computes ALL pairs. We will just yield progress.
     
@@ -8,8 +10,10 @@ def floyd_warshall_generator(G, start_node, end_node):
     n = len(nodes)
     node_to_idx = {node: i for i, node in enumerate(nodes)}
     
-    # Initialize dist matrix
+    # Initialize dist matrix, and next_node[i][j] = index of the node after i on the
+    # best i -> j path found so far (None = no path yet), for path reconstruction
     dist = [[float('inf')] * n for _ in range(n)]
+    next_node = [[None] * n for _ in range(n)]
     
     # Set init distances
     for i in range(n):
@@ -18,8 +22,10 @@ def floyd_warshall_generator(G, start_node, end_node):
     for u, v, data in G.edges(data=True):
         weight = data.get('weight', 1)
         dist[node_to_idx[u]][node_to_idx[v]] = weight
+        next_node[node_to_idx[u]][node_to_idx[v]] = node_to_idx[v]
         if not G.is_directed():
              dist[node_to_idx[v]][node_to_idx[u]] = weight
+             next_node[node_to_idx[v]][node_to_idx[u]] = node_to_idx[u]
 
     # Visualization: yield snapshots occasionally
     count = 0
@@ -30,9 +36,10 @@ def floyd_warshall_generator(G, start_node, end_node):
             for j in range(n):
                 if dist[i][j] > dist[i][k] + dist[k][j]:
                     dist[i][j] = dist[i][k] + dist[k][j]
+                    next_node[i][j] = next_node[i][k]
                     
                 count += 1
-                if count % yield_freq == 0:
+                if count % yield_freq == 0 and tracer.wants(ROUND):
                      # Convert current dist row for start_node to our standard 'distances' dict
                     start_idx = node_to_idx[start_node]
                     curr_dists = {nodes[x]: dist[start_idx][x] for x in range(n)}
@@ -42,11 +49,12 @@ def floyd_warshall_generator(G, start_node, end_node):
                         "frontier": [nodes[k]], # Show k as the pivot
                         "current_node": nodes[i] if count % 5 == 0 else nodes[j], # Just some activity
                         "distances": curr_dists,
-                        "parents": {}, # FW doesn't easily track parents without extra matrix
+                        "parents": {}, # Only the final step walks next_node for the start row's parents
                         "description": f"Pivot k={nodes[k]}, checking i={nodes[i]}, j={nodes[j]}"
                     }
 
     # Final yield
+    tracer.wants(FINAL)
     start_idx = node_to_idx[start_node]
     curr_dists = {nodes[x]: dist[start_idx][x] for x in range(n)}
     yield {
@@ -54,6 +62,21 @@ def floyd_warshall_generator(G, start_node, end_node):
         "frontier": [],
         "current_node": end_node,
         "distances": curr_dists,
-        "parents": {},
+        "parents": _parents_from(next_node, start_idx, nodes),
         "description": "Floyd-Warshall Completed"
     }
+
+def _parents_from(next_node, start_idx, nodes):
+    """Parent of every node on its best path from the start, by walking the next hops."""
+    parents = {node: None for node in nodes}
+    for target in range(len(nodes)):
+        if target == start_idx or next_node[start_idx][target] is None:
+            continue
+        i = start_idx
+        seen = set()
+        while i is not None and i != target and i not in seen: # negative cycles can break the hops
+            seen.add(i)
+            prev, i = i, next_node[i][target]
+        if i == target:
+            parents[nodes[target]] = nodes[prev]
+    return parents
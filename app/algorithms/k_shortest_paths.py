@@ -0,0 +1,226 @@
+import heapq
+import itertools
+from .tracing import Tracer, SETTLE, FINAL
+
+def reverse_shortest_path_tree(G, target):
+    """
+    Dijkstra from target over reversed edges.
+    Returns (dist_to, next_hop): distance from every node to target and the
+    next node on its shortest path towards target.
+    """
+    pred = G.pred if G.is_directed() else G.adj
+    dist_to = {target: 0}
+    next_hop = {target: None}
+    done = set()
+    pq = [(0, target)]
+
+    while pq:
+        d, v = heapq.heappop(pq)
+        if v in done:
+            continue
+        done.add(v)
+
+        for u, data in pred[v].items():
+            new_dist = d + data.get('weight', 1)
+            if new_dist < dist_to.get(u, float('inf')):
+                dist_to[u] = new_dist
+                next_hop[u] = v
+                heapq.heappush(pq, (new_dist, u))
+
+    return dist_to, next_hop
+
+def _tree_path(next_hop, node):
+    path = [node]
+    while next_hop[path[-1]] is not None:
+        path.append(next_hop[path[-1]])
+    return path
+
+def _spur_search(G, spur, target, dist_to, blocked_nodes, blocked_edges, limit, stats):
+    """
+    A* from spur to target avoiding blocked nodes/edges.
+    dist_to (reverse tree) is an admissible heuristic: removing nodes/edges only makes paths longer.
+    Gives up once the best f-score reaches limit.
+    """
+    g = {spur: 0}
+    parents = {spur: None}
+    closed = set()
+    pq = [(dist_to[spur], spur)]
+
+    while pq:
+        f, u = heapq.heappop(pq)
+        if f >= limit:
+            return None
+        if u in closed:
+            continue
+        closed.add(u)
+        stats["nodes_expanded"] += 1
+
+        if u == target:
+            path = [u]
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+            return g[u], path[::-1]
+
+        for v, data in G.adj[u].items():
+            # Nodes that can't reach target at all are never worth entering
+            if v in blocked_nodes or v not in dist_to or (u, v) in blocked_edges:
+                continue
+            new_g = g[u] + data.get('weight', 1)
+            if new_g < g.get(v, float('inf')):
+                g[v] = new_g
+                parents[v] = u
+                heapq.heappush(pq, (new_g + dist_to[v], v))
+
+    return None
+
+def k_shortest_paths(G, source, target, k, stats=None, stop=None):
+    """
+    K shortest loopless paths (Yen) for non-negative weights.
+
+    The reverse shortest-path tree from target is built once and reused:
+    - if a spur node's tree path avoids everything the spur step removes, it is the
+      spur path and no search is needed (lazy spur);
+    - otherwise the spur search is A* guided by exact tree distances;
+    - spur nodes whose lower bound can't beat the candidates we already hold are skipped.
+    Spurs before a path's deviation point are skipped too (Lawler), they only rediscover old candidates.
+
+    stop: optional callable polled before every spur node; when it returns True the
+    paths accepted so far are returned.
+    Raises ValueError on a negative weight (spur searches are Dijkstra-based).
+
+    Returns:
+        List of (cost, path) in non-decreasing cost order, at most k long.
+    """
+    if any(w < 0 for _, _, w in G.edges(data='weight', default=1)):
+        raise ValueError("K-Shortest Paths needs non-negative edge weights")
+    if stats is None:
+        stats = {}
+    for key in ("spur_nodes", "lazy_spurs", "pruned_spurs", "spur_searches", "nodes_expanded"):
+        stats.setdefault(key, 0)
+
+    dist_to, next_hop = reverse_shortest_path_tree(G, target)
+    if source not in dist_to:
+        return []
+
+    def edge_weight(u, v):
+        return G.adj[u][v].get('weight', 1)
+
+    accepted = [(dist_to[source], _tree_path(next_hop, source))]
+    seen = {tuple(accepted[0][1])}
+    candidates = [] # heap of (cost, tie, deviation index, path)
+    tie = itertools.count()
+    deviation = 0
+
+    while len(accepted) < k:
+        _, last_path = accepted[-1]
+        root_cost = sum(edge_weight(u, v) for u, v in zip(last_path[:deviation], last_path[1:deviation + 1]))
+
+        for i in range(deviation, len(last_path) - 1):
+            if stop is not None and stop():
+                return accepted
+            spur = last_path[i]
+            root = last_path[:i + 1]
+            stats["spur_nodes"] += 1
+            if i > deviation:
+                root_cost += edge_weight(last_path[i - 1], spur)
+
+            # Only the best (k - accepted) candidates can still make the output
+            needed = k - len(accepted)
+            limit = float('inf')
+            if len(candidates) >= needed:
+                limit = heapq.nsmallest(needed, candidates)[-1][0] - root_cost
+
+            if dist_to[spur] >= limit:
+                stats["pruned_spurs"] += 1
+                continue
+
+            blocked_edges = set()
+            for _, path in accepted:
+                if len(path) > i and path[:i + 1] == root:
+                    blocked_edges.add((path[i], path[i + 1]))
+            blocked_nodes = set(root[:-1])
+
+            tree = _tree_path(next_hop, spur)
+            if (spur, tree[1]) not in blocked_edges and blocked_nodes.isdisjoint(tree):
+                stats["lazy_spurs"] += 1
+                spur_result = (dist_to[spur], tree)
+            else:
+                stats["spur_searches"] += 1
+                spur_result = _spur_search(G, spur, target, dist_to, blocked_nodes, blocked_edges, limit, stats)
+                if spur_result is None:
+                    continue
+
+            spur_cost, spur_path = spur_result
+            full_path = root[:-1] + spur_path
+            key = tuple(full_path)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(candidates, (root_cost + spur_cost, next(tie), i, full_path))
+
+        if not candidates:
+            break
+        cost, _, deviation, path = heapq.heappop(candidates)
+        accepted.append((cost, path))
+
+    return accepted
+
+def k_shortest_generator(G, start_node, end_node, tracer=None, k=5):
+    """
+    Step generator for the visualizer: one step per accepted path.
+    The final step shows the shortest path again so its distances[end_node] is the optimum.
+    """
+    def path_state(cost, path, description):
+        distances = {node: float('inf') for node in G.nodes()}
+        parents = {node: None for node in G.nodes()}
+        prefix = 0
+        distances[path[0]] = 0
+        for u, v in zip(path, path[1:]):
+            prefix += G.adj[u][v].get('weight', 1)
+            distances[v] = prefix
+            parents[v] = u
+        return {
+            "visited": list(path),
+            "frontier": [],
+            "current_node": path[-1],
+            "distances": distances,
+            "parents": parents,
+            "paths": summary,
+            "description": description
+        }
+
+    tracer = tracer or Tracer()
+    stats = {}
+    paths = k_shortest_paths(G, start_node, end_node, k, stats=stats, stop=tracer.should_stop)
+    summary = [{"cost": cost, "path": path} for cost, path in paths]
+
+    if not paths:
+        tracer.wants(FINAL)
+        yield {
+            "visited": [],
+            "frontier": [],
+            "current_node": start_node,
+            "distances": {node: float('inf') for node in G.nodes()},
+            "parents": {node: None for node in G.nodes()},
+            "paths": [],
+            "description": f"No path from {start_node} to {end_node}"
+        }
+        return
+
+    if tracer.stopped is not None:
+        # Cut short: just the paths found so far, in one step
+        cost, path = paths[0]
+        tracer.wants(FINAL)
+        yield path_state(cost, path, f"Stopped ({tracer.stopped}) after {len(paths)} of {k} paths")
+        return
+
+    for rank, (cost, path) in enumerate(paths, start=1):
+        if tracer.wants(SETTLE):
+            yield path_state(cost, path, f"Path #{rank}: cost {cost}, {len(path) - 1} edges")
+
+    cost, path = paths[0]
+    tracer.wants(FINAL)
+    yield path_state(
+        cost, path,
+        f"Found {len(paths)} paths. Spur searches: {stats['spur_searches']}, "
+        f"lazy: {stats['lazy_spurs']}, pruned: {stats['pruned_spurs']}"
+    )
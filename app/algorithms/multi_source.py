@@ -0,0 +1,44 @@
+import collections
+import heapq
+
+def nearest_sources(G, sources, unweighted=False):
+    """
+    Multi-source shortest paths (graph Voronoi partition) in one pass.
+    Every source is seeded into the queue at distance 0; each node ends up owned
+    by its nearest source. unweighted=True uses BFS (every edge costs 1).
+
+    Returns:
+        (distances, owner): {node: distance to nearest source}, {node: that source}.
+        Unreachable nodes are left out of both.
+    """
+    sources = list(dict.fromkeys(sources))
+    distances = {s: 0 for s in sources}
+    owner = {s: s for s in sources}
+
+    if unweighted:
+        queue = collections.deque(sources)
+        while queue:
+            u = queue.popleft()
+            for v in G.neighbors(u):
+                if v not in distances:
+                    distances[v] = distances[u] + 1
+                    owner[v] = owner[u]
+                    queue.append(v)
+        return distances, owner
+
+    visited = set()
+    pq = [(0, s) for s in sources]
+    heapq.heapify(pq)
+    while pq:
+        dist, u = heapq.heappop(pq)
+        if u in visited:
+            continue
+        visited.add(u)
+        for v, data in G.adj[u].items():
+            new_dist = dist + data.get('weight', 1)
+            if new_dist < distances.get(v, float('inf')):
+                distances[v] = new_dist
+                owner[v] = owner[u]
+                heapq.heappush(pq, (new_dist, v))
+
+    return distances, owner
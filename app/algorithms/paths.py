@@ -0,0 +1,18 @@
+def reconstruct_path(parents, start_node, end_node):
+    """
+    Walks parents back from end_node. Returns [start_node, ..., end_node],
+    or [] if end_node was not reached from start_node.
+    """
+    if end_node == start_node:
+        return [start_node]
+
+    path = [end_node]
+    seen = {end_node}
+    while path[-1] != start_node:
+        parent = parents.get(path[-1])
+        # Missing parent = unreached; repeated node = parents from a negative cycle
+        if parent is None or parent in seen:
+            return []
+        path.append(parent)
+        seen.add(parent)
+    return path[::-1]
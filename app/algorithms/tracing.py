@@ -0,0 +1,166 @@
+import time
+
+# Event kinds engines report for each potential step.
+INIT = "init"       # initial state
+SETTLE = "settle"   # a node is popped / finalized
+RELAX = "relax"     # a distance improved
+ROUND = "round"     # end of a pass (Bellman-Ford rounds, FW pivots)
+FINAL = "final"     # last, exact state: always emitted
+
+# The cancel token is polled on every CHECK_EVERY-th event (a clock read per event would show)
+CHECK_EVERY = 32
+
+class CancelToken:
+    """
+    Deadline and cancel flag shared by a request and the thread running its engine.
+    reason() is None while the run may go on, else "deadline" or the cancel reason.
+    """
+
+    def __init__(self, timeout=None):
+        self.deadline = time.perf_counter() + timeout if timeout is not None else None
+        self._reason = None
+
+    def cancel(self, reason="cancelled"):
+        if self._reason is None:
+            self._reason = reason
+
+    def reason(self):
+        if self._reason is None and self.deadline is not None and time.perf_counter() >= self.deadline:
+            self._reason = "deadline"
+        return self._reason
+
+class Tracer:
+    """
+    Decides which steps an engine materializes.
+    Engines ask wants(kind) BEFORE building a step dict, so skipped steps cost no copies.
+
+    With a CancelToken, wants() also polls it: once it fires, wants() says yes so the
+    engine yields its current state, and stopped holds the reason. The consumer
+    should then stop iterating and treat that step as a partial result.
+    """
+
+    def __init__(self, enabled=True, cancel=None):
+        self.enabled = enabled
+        self.events = 0
+        self.cancel = cancel
+        self.stopped = None
+
+    def should_stop(self):
+        """Polls the cancel token (for engines with long stretches between events)."""
+        if self.stopped is None and self.cancel is not None:
+            self.stopped = self.cancel.reason()
+        return self.stopped is not None
+
+    def _cancel_due(self, kind):
+        return (self.cancel is not None and kind != FINAL
+                and self.events % CHECK_EVERY == 0 and self.should_stop())
+
+    def wants(self, kind):
+        self.events += 1
+        if self._cancel_due(kind):
+            return True
+        return self.enabled or kind == FINAL
+
+def result_only(cancel=None):
+    """Tracer for callers that only need the final state."""
+    return Tracer(enabled=False, cancel=cancel)
+
+class EventCounter(Tracer):
+    """
+    Tracer that also tallies every event the engine reports, materialized or not:
+    counts[SETTLE] is nodes settled, counts[RELAX] distance improvements, counts[ROUND]
+    passes. Result-only by default, so the work is measured without building steps.
+    """
+
+    def __init__(self, enabled=False, cancel=None):
+        super().__init__(enabled=enabled, cancel=cancel)
+        self.counts = dict.fromkeys((INIT, SETTLE, RELAX, ROUND, FINAL), 0)
+
+    def wants(self, kind):
+        self.counts[kind] += 1
+        return super().wants(kind)
+
+# Events that mark progress milestones; "events" sampling favours these over relaxations
+MAJOR_EVENTS = {INIT, SETTLE, ROUND}
+
+class StepSampler(Tracer):
+    """
+    Tracer that keeps at most max_steps steps however long the run is.
+
+    Each event class keeps every stride-th event; when the kept steps overflow the
+    budget, the class is thinned to every other kept step and its stride doubles.
+    Steps stay evenly spread, and at most O(max_steps * log(events / max_steps))
+    step dicts are ever built. Two slots are reserved: the first step (the initial
+    state) and a closing step, the final state or the one a cancelled run stops on;
+    a later closing step replaces an earlier one, so the bound holds either way.
+
+    sampling:
+        "uniform" - one stride for all events.
+        "events"  - settles / round ends keep their own stride and relaxations are
+                    thinned first, so milestones survive at coarse budgets.
+
+    Usage:
+        sampler = StepSampler(500)
+        for step in engine(G, s, t, tracer=sampler):
+            sampler.add(step)
+        steps = sampler.steps()
+    """
+
+    def __init__(self, max_steps, sampling="uniform", cancel=None):
+        super().__init__(enabled=True, cancel=cancel)
+        self.max_steps = max(2, max_steps)
+        self.sampling = sampling
+        self.stride = {"major": 1, "minor": 1}
+        self.counts = {"major": 0, "minor": 0}
+        self.kept = {"major": [], "minor": []} # (event index, class count, step)
+        self.first = None # (event index, step): the initial step, always kept
+        self.closing = None # (event index, step): the latest final / cancel step
+        self._pending = None
+
+    def _class(self, kind):
+        if self.sampling == "events" and kind in MAJOR_EVENTS:
+            return "major"
+        return "minor"
+
+    def wants(self, kind):
+        self.events += 1
+        if kind in (INIT, FINAL) or self._cancel_due(kind): # the step a cancelled run stops on is kept too
+            self._pending = ("pinned", self.events, 0)
+            return True
+
+        cls = self._class(kind)
+        self.counts[cls] += 1
+        if self.counts[cls] % self.stride[cls] == 0:
+            self._pending = (cls, self.events, self.counts[cls])
+            return True
+        return False
+
+    def add(self, step):
+        """Hands over the step the engine yielded after wants() returned True."""
+        cls, index, count = self._pending
+        self._pending = None
+        if cls == "pinned":
+            if self.first is None:
+                self.first = (index, step)
+            else:
+                self.closing = (index, step)
+            return
+
+        self.kept[cls].append((index, count, step))
+        budget = self.max_steps - 2 # slots reserved for the initial and final steps
+        while len(self.kept["major"]) + len(self.kept["minor"]) > budget:
+            # Thin relaxations first while they hold more than a quarter of the budget
+            if not self.kept["minor"] or (self.kept["major"] and len(self.kept["minor"]) <= budget // 4):
+                self._thin("major")
+            else:
+                self._thin("minor")
+
+    def _thin(self, cls):
+        self.stride[cls] *= 2
+        self.kept[cls] = [entry for entry in self.kept[cls] if entry[1] % self.stride[cls] == 0]
+
+    def steps(self):
+        entries = [(index, step) for index, _, step in self.kept["major"] + self.kept["minor"]]
+        entries.extend(entry for entry in (self.first, self.closing) if entry is not None)
+        entries.sort(key=lambda entry: entry[0])
+        return [step for _, step in entries]
@@ -1,7 +1,8 @@
 import heapq
 import networkx as nx
+from .tracing import Tracer, INIT, SETTLE, RELAX, FINAL
 
-def uniform_cost_search_generator(G, start_node, end_node):
+def uniform_cost_search_generator(G, start_node, end_node, tracer=None):
     # Uniform Cost Search is identical to Dijkstra's Algorithm for this context.
     # It explores the path with the lowest cumulative cost (distance) using a Priority Queue.
     
@@ -11,15 +12,17 @@ def uniform_cost_search_generator(G, start_node, end_node):
     visited = set()
     frontier_set = {start_node}
     pq = [(0, start_node)]
+    tracer = tracer or Tracer()
     
-    yield {
-        "visited": list(visited),
-        "frontier": list(frontier_set),
-        "current_node": start_node,
-        "distances": distances.copy(),
-        "parents": parents.copy(),
-        "description": f"Initialized UCS. Start: {start_node}"
-    }
+    if tracer.wants(INIT):
+        yield {
+            "visited": list(visited),
+            "frontier": list(frontier_set),
+            "current_node": start_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Initialized UCS. Start: {start_node}"
+        }
     
     while pq:
         current_dist, current_node = heapq.heappop(pq)
@@ -31,16 +34,18 @@ def uniform_cost_search_generator(G, start_node, end_node):
         if current_node in frontier_set:
             frontier_set.remove(current_node)
             
-        yield {
-            "visited": list(visited),
-            "frontier": list(frontier_set),
-            "current_node": current_node,
-            "distances": distances.copy(),
-            "parents": parents.copy(),
-            "description": f"Processing node {current_node} (Cost: {current_dist})"
-        }
+        if tracer.wants(SETTLE):
+            yield {
+                "visited": list(visited),
+                "frontier": list(frontier_set),
+                "current_node": current_node,
+                "distances": distances.copy(),
+                "parents": parents.copy(),
+                "description": f"Processing node {current_node} (Cost: {current_dist})"
+            }
         
         if current_node == end_node:
+            tracer.wants(FINAL)
             yield {
                 "visited": list(visited),
                 "frontier": list(frontier_set),
@@ -61,11 +66,23 @@ def uniform_cost_search_generator(G, start_node, end_node):
                 heapq.heappush(pq, (new_dist, neighbor))
                 frontier_set.add(neighbor)
                 
-                yield {
-                    "visited": list(visited),
-                    "frontier": list(frontier_set),
-                    "current_node": neighbor, # Highlight the neighbor being updated
-                    "distances": distances.copy(),
-                    "parents": parents.copy(),
-                    "description": f"Updated neighbor {neighbor}. New cost: {new_dist}"
-                }
+                if tracer.wants(RELAX):
+                    yield {
+                        "visited": list(visited),
+                        "frontier": list(frontier_set),
+                        "current_node": neighbor, # Highlight the neighbor being updated
+                        "distances": distances.copy(),
+                        "parents": parents.copy(),
+                        "description": f"Updated neighbor {neighbor}. New cost: {new_dist}"
+                    }
+    else:
+        # Queue ran dry without reaching the goal
+        tracer.wants(FINAL)
+        yield {
+            "visited": list(visited),
+            "frontier": [],
+            "current_node": end_node,
+            "distances": distances.copy(),
+            "parents": parents.copy(),
+            "description": f"Goal {end_node} unreachable."
+        }
@@ -0,0 +1,136 @@
+"""
+K SHORTEST LOOPLESS PATHS (YEN)
+===============================
+
+Finds the K cheapest simple paths from start to end, not just the best one.
+Each new path is built from an already accepted path: keep a prefix (the "root"),
+then search a different continuation from the last root node (the "spur" node).
+
+Time Complexity: O(K * V * (E + V log V)) for plain Yen
+Space Complexity: O(K * V + E)
+
+Algorithm Steps:
+1. Find the shortest path, accept it
+2. For every node of the last accepted path, block the edges that other accepted
+   paths with the same root take, and block the root nodes themselves
+3. Search a spur path from that node; root + spur is a candidate
+4. Accept the cheapest candidate, repeat until K paths are accepted
+
+Speed-up: one Dijkstra from the END node over reversed edges gives the exact
+distance from every node to the end. If a spur node's tree path is not blocked
+it IS the spur path (no search), and otherwise it is a perfect A* heuristic.
+"""
+
+import heapq
+
+def distances_to(graph, end):
+    """Dijkstra over reversed edges: dist[v] = shortest distance v -> end."""
+    reverse = {node: [] for node in graph}
+    for u in graph:
+        for v, w in graph[u]:
+            reverse[v].append((u, w))
+
+    dist = {end: 0}
+    pq = [(0, end)]
+    while pq:
+        d, v = heapq.heappop(pq)
+        if d > dist[v]:
+            continue
+        for u, w in reverse[v]:
+            if d + w < dist.get(u, float('infinity')):
+                dist[u] = d + w
+                heapq.heappush(pq, (d + w, u))
+    return dist
+
+def spur_search(graph, spur, end, h, blocked_nodes, blocked_edges):
+    """A* from spur to end, using the reverse distances h as the heuristic."""
+    g = {spur: 0}
+    parents = {spur: None}
+    pq = [(h[spur], spur)]
+    visited = set()
+
+    while pq:
+        _, current = heapq.heappop(pq)
+        if current in visited:
+            continue
+        visited.add(current)
+
+        if current == end:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            return g[end], path[::-1]
+
+        for neighbor, weight in graph[current]:
+            if neighbor in blocked_nodes or (current, neighbor) in blocked_edges or neighbor not in h:
+                continue
+            if g[current] + weight < g.get(neighbor, float('infinity')):
+                g[neighbor] = g[current] + weight
+                parents[neighbor] = current
+                heapq.heappush(pq, (g[neighbor] + h[neighbor], neighbor))
+
+    return None
+
+def k_shortest_paths(graph, start, end, k):
+    """
+    Find up to k shortest simple paths from start to end.
+
+    Args:
+        graph: Dictionary where graph[node] = [(neighbor, weight), ...]
+        start: Starting node
+        end: Destination node
+        k: Number of paths wanted
+
+    Returns:
+        List of (cost, path), cheapest first
+    """
+    weights = {(u, v): w for u in graph for v, w in graph[u]}
+    h = distances_to(graph, end)
+    if start not in h:
+        return []
+
+    # Shortest path: A* with an exact heuristic walks straight down the reverse tree
+    _, first = spur_search(graph, start, end, h, set(), set())
+    accepted = [(h[start], first)]
+    candidates = []
+
+    while len(accepted) < k:
+        _, last = accepted[-1]
+
+        for i in range(len(last) - 1):
+            spur, root = last[i], last[:i + 1]
+            root_cost = sum(weights[(last[j], last[j + 1])] for j in range(i))
+
+            # Block the next edge of every accepted path sharing this root
+            blocked_edges = {(p[i], p[i + 1]) for _, p in accepted if p[:i + 1] == root}
+            blocked_nodes = set(root[:-1])
+
+            result = spur_search(graph, spur, end, h, blocked_nodes, blocked_edges)
+            if result is None:
+                continue
+
+            spur_cost, spur_path = result
+            candidate = (root_cost + spur_cost, root[:-1] + spur_path)
+            if candidate not in candidates and candidate not in accepted:
+                heapq.heappush(candidates, candidate)
+
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+
+    return accepted
+
+
+# Example Usage:
+if __name__ == "__main__":
+    graph = {
+        'A': [('B', 4), ('C', 2)],
+        'B': [('C', 1), ('D', 5)],
+        'C': [('B', 1), ('D', 8), ('E', 10)],
+        'D': [('E', 2)],
+        'E': []
+    }
+
+    for cost, path in k_shortest_paths(graph, 'A', 'E', 3):
+        print(f"Cost {cost}: {' -> '.join(path)}")
@@ -1,5 +1,8 @@
-import networkx as nx
 import random
+from lazy_import import lazy_import
+from compiled_graph import CompiledGraph
+
+nx = lazy_import("networkx")
 
 class GraphGenerator:
     @staticmethod
@@ -71,6 +74,27 @@ class GraphGenerator:
             
         return G
 
+    @staticmethod
+    def from_json(data):
+        """Rebuilds a NetworkX graph from the JSON produced by to_json."""
+        G = nx.DiGraph() if data.get('directed') else nx.Graph()
+
+        for node in data['nodes']:
+            G.add_node(node['id'], x=node.get('x', 0), y=node.get('y', 0))
+
+        for edge in data['edges']:
+            G.add_edge(edge['source'], edge['target'], weight=edge.get('weight', 1))
+
+        return G
+
+    @staticmethod
+    def from_columns(columns):
+        """Compiles a ColumnarGraph upload straight to arrays. Raises ValueError on bad input."""
+        return CompiledGraph.from_arrays(
+            columns.source, columns.target, columns.weight,
+            directed=columns.directed, node_ids=columns.nodes, x=columns.x, y=columns.y
+        )
+
     @staticmethod
     def to_json(G):
         """Converts graph to JSON serializable format."""
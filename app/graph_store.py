@@ -0,0 +1,334 @@
+import contextlib
+import os
+import shutil
+import threading
+import uuid
+
+from app.algorithms.dynamic_sssp import DynamicSSSP
+from app.planner import GraphProperties
+from app.spatial_index import GridPyramid
+from compiled_graph import AllPairs, CompiledGraph
+
+try:
+    import fcntl
+except ImportError: # Windows: no cross-process edit lock (run a single worker there)
+    fcntl = None
+
+class ReadWriteLock:
+    """
+    Many readers or one writer. Queries on a stored graph run in the threadpool as
+    readers; an edit batch waits for them and holds off new ones until it is done
+    (waiting writers go first, so a stream of queries can't starve an edit).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextlib.contextmanager
+    def reading(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writing or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+class StoredGraph:
+    def __init__(self, G=None, compiled=None, version=0):
+        self.lock = ReadWriteLock() # queries read, edit batches write (this process only)
+        self._G = G
+        self.compiled = compiled # CompiledGraph, memory-mapped from the shared directory (shared mode only)
+        self.version = version
+        self.dirty = False # edited since the last publish
+        self.sssp = {} # source -> DynamicSSSP, repaired in place on every edge update
+        self.spatial = None # GridPyramid for viewport queries, built on first use
+        self.all_pairs = None # AllPairs distance / next-hop matrices, built on first pair query
+        self.properties = None # GraphProperties for the "auto" planner, computed on first use
+
+    @property
+    def G(self):
+        """networkx graph for the step engines; in shared mode built from the arrays on first use per worker."""
+        if self._G is None:
+            self._G = self.compiled.to_networkx()
+        return self._G
+
+    def size(self):
+        """(nodes, arcs), from the arrays when there are any (no networkx copy needed)."""
+        if self.compiled is not None and not self.dirty:
+            return self.compiled.n, self.compiled.m
+        G = self.G
+        return G.number_of_nodes(), G.number_of_edges() * (1 if G.is_directed() else 2)
+
+class SharedGraphDirectory:
+    """
+    Cross-process index of compiled graphs, one directory per graph id:
+
+        <root>/<graph_id>/CURRENT   name of the live version ("v3"), replaced atomically
+        <root>/<graph_id>/v3/       CompiledGraph.save() output
+
+    Workers memory-map the live version, so every process reads the same pages
+    (put root on /dev/shm to keep them in RAM). An edit writes a new version and
+    swaps CURRENT; workers notice the new name on their next lookup.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, graph_id):
+        # ids are our own hex uuids; anything else can't name a graph (or escape root)
+        if not graph_id.isalnum():
+            raise KeyError(graph_id)
+        return os.path.join(self.root, graph_id)
+
+    def version(self, graph_id):
+        """Live version number, or None if the graph doesn't exist (anymore)."""
+        try:
+            with open(os.path.join(self._dir(graph_id), "CURRENT")) as f:
+                return int(f.read().strip()[1:])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def load(self, graph_id, version):
+        return CompiledGraph.load(os.path.join(self._dir(graph_id), f"v{version}"), mmap=True)
+
+    def publish(self, graph_id, compiled, version):
+        path = self._dir(graph_id)
+        os.makedirs(path, exist_ok=True)
+        compiled.save(os.path.join(path, f"v{version}"))
+        tmp = os.path.join(path, f".CURRENT-{os.getpid()}")
+        with open(tmp, "w") as f:
+            f.write(f"v{version}")
+        os.replace(tmp, os.path.join(path, "CURRENT"))
+
+        # Keep the previous version for readers that just read the old CURRENT;
+        # mapped files of older ones stay valid for processes still holding them
+        for name in os.listdir(path):
+            if name.startswith("v") and name[1:].isdigit() and int(name[1:]) < version - 1:
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    def remove(self, graph_id):
+        path = self._dir(graph_id)
+        try:
+            os.unlink(os.path.join(path, "CURRENT"))
+        except OSError:
+            return False
+        shutil.rmtree(path, ignore_errors=True)
+        return True
+
+    @contextlib.contextmanager
+    def lock(self, graph_id):
+        """
+        Exclusive edit lock on one graph across processes (flock on <graph_id>/LOCK).
+        Blocks while another worker edits: take it in the threadpool. Yields False
+        (holding nothing) if the graph doesn't exist.
+        """
+        if fcntl is None:
+            yield True
+            return
+        try:
+            f = open(os.path.join(self._dir(graph_id), "LOCK"), "a")
+        except (FileNotFoundError, KeyError):
+            yield False
+            return
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class GraphStore:
+    """
+    Graphs addressed by id, so clients can upload once and then query / mutate by
+    id instead of re-posting the whole graph.
+
+    By default graphs live in this process. With shared_dir (GRAPH_STORE_DIR) they
+    are published as compiled arrays to a SharedGraphDirectory, so every uvicorn
+    worker sees the same ids and maps the same memory; per-worker caches (networkx
+    copy, cached sources, spatial index) are rebuilt when another worker edits.
+    """
+
+    def __init__(self, shared_dir=None):
+        self._graphs = {}
+        self._lock = threading.Lock()
+        self._shared = SharedGraphDirectory(shared_dir) if shared_dir else None
+
+    def add(self, G):
+        graph_id = uuid.uuid4().hex[:12]
+        entry = StoredGraph(G)
+        if self._shared is not None:
+            entry.version = 1
+            self._shared.publish(graph_id, CompiledGraph.from_networkx(G), entry.version)
+            entry.compiled = self._shared.load(graph_id, entry.version)
+        with self._lock:
+            self._graphs[graph_id] = entry
+        return graph_id
+
+    def get(self, graph_id):
+        if self._shared is None:
+            return self._graphs.get(graph_id)
+
+        version = self._shared.version(graph_id)
+        entry = self._graphs.get(graph_id)
+        if version is None:
+            # Deleted by another worker
+            if entry is not None:
+                with self._lock:
+                    self._graphs.pop(graph_id, None)
+            return None
+        if entry is None or entry.version != version:
+            entry = StoredGraph(compiled=self._shared.load(graph_id, version), version=version)
+            with self._lock:
+                self._graphs[graph_id] = entry
+        return entry
+
+    def remove(self, graph_id):
+        with self._lock:
+            removed = self._graphs.pop(graph_id, None) is not None
+        if self._shared is not None:
+            removed = self._shared.remove(graph_id) or removed
+        return removed
+
+    @contextlib.contextmanager
+    def reading(self, graph_id):
+        """
+        The graph's entry (None if there is no such graph) under its read lock, for
+        queries run in the threadpool: edit batches in this process wait until the
+        block ends. In shared mode other workers' edits publish new versions instead,
+        so the block keeps reading the version it started on.
+        """
+        entry = self.get(graph_id)
+        if entry is None:
+            yield None
+            return
+        with entry.lock.reading():
+            yield entry
+
+    @contextlib.contextmanager
+    def editing(self, graph_id):
+        """
+        Wraps a batch of update_edge() calls under the graph's write lock, so no query
+        reads a half-applied batch. In shared mode it also holds the graph's
+        cross-process lock, starts from the live version and publishes the edited
+        graph once at the end. If the block raises, nothing is published and this
+        worker's half-edited copy is dropped (the next get() reloads the live version);
+        callers validate the whole batch first so that doesn't happen in practice.
+        Yields None if the graph doesn't exist (e.g. deleted since the caller looked).
+        Both locks block: run edit batches in the threadpool.
+        """
+        if self._shared is None:
+            entry = self._graphs.get(graph_id)
+            if entry is None:
+                yield None
+                return
+            with entry.lock.writing():
+                yield entry
+            return
+
+        with self._shared.lock(graph_id) as found:
+            entry = self.get(graph_id) if found else None
+            if entry is None:
+                yield None
+                return
+            with entry.lock.writing():
+                try:
+                    yield entry
+                except BaseException:
+                    if entry.dirty:
+                        with self._lock:
+                            self._graphs.pop(graph_id, None)
+                    raise
+                if entry.dirty:
+                    compiled = CompiledGraph.from_networkx(entry.G)
+                    self._shared.publish(graph_id, compiled, entry.version + 1)
+                    entry.version += 1
+                    entry.compiled = self._shared.load(graph_id, entry.version)
+                    entry.dirty = False
+
+    def sssp(self, graph_id, source):
+        """Cached single-source result for a stored graph, computed on first use."""
+        entry = self._graphs[graph_id]
+        if source not in entry.sssp:
+            entry.sssp[source] = DynamicSSSP(entry.G, source)
+        return entry.sssp[source]
+
+    def spatial(self, graph_id):
+        """Spatial index of a stored graph, built on first viewport query."""
+        entry = self._graphs[graph_id]
+        if entry.spatial is None:
+            entry.spatial = GridPyramid(entry.G)
+        return entry.spatial
+
+    def all_pairs(self, graph_id):
+        """All-pairs matrices of a stored graph, computed on first use (from the shared arrays if clean)."""
+        entry = self._graphs[graph_id]
+        if entry.all_pairs is None:
+            compiled = entry.compiled if entry.compiled is not None and not entry.dirty else CompiledGraph.from_networkx(entry.G)
+            entry.all_pairs = AllPairs.compute(compiled)
+        return entry.all_pairs
+
+    def properties(self, graph_id):
+        """Planner properties of a stored graph, computed on first use (from the shared arrays if clean)."""
+        entry = self._graphs[graph_id]
+        if entry.properties is None:
+            if entry.compiled is not None and not entry.dirty:
+                entry.properties = GraphProperties.from_compiled(entry.compiled)
+            else:
+                entry.properties = GraphProperties.from_networkx(entry.G)
+        return entry.properties
+
+    def update_edge(self, graph_id, u, v, weight):
+        """
+        Sets edge u->v to weight (None removes it) and repairs every cached source.
+        Returns {source: [repair steps]}. In shared mode call it inside editing().
+        """
+        entry = self._graphs[graph_id]
+        G = entry.G
+
+        old_weight = G.edges[u, v].get('weight', 1) if G.has_edge(u, v) else None
+        if weight is None:
+            G.remove_edge(u, v)
+        else:
+            G.add_edge(u, v, weight=weight)
+        entry.spatial = None # aggregated cell edges are stale
+        entry.all_pairs = None # recomputed on the next pair query
+        entry.properties = None # weights / acyclicity may have changed
+        entry.dirty = True
+
+        directions = [(u, v)] if G.is_directed() else [(u, v), (v, u)]
+        repairs = {}
+        for source, sssp in entry.sssp.items():
+            steps = []
+            for a, b in directions:
+                steps.extend(sssp.repair(a, b, old_weight, weight))
+            repairs[source] = steps
+        return repairs
+
+# Process-wide store used by the routers; GRAPH_STORE_DIR shares it between workers
+store = GraphStore(os.environ.get("GRAPH_STORE_DIR"))
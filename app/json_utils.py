@@ -0,0 +1,13 @@
+import math
+
+def sanitize_floats(obj):
+    """Recursively replaces inf/nan floats with "Infinity" so the payload is valid JSON."""
+    if isinstance(obj, float):
+        if math.isinf(obj) or math.isnan(obj):
+            return "Infinity"
+        return obj
+    if isinstance(obj, dict):
+        return {k: sanitize_floats(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [sanitize_floats(i) for i in obj]
+    return obj
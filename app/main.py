@@ -1,8 +1,9 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from app.routers import visualization, statistics
+from app.routers import visualization, statistics, queries, graphs
 from fastapi.middleware.cors import CORSMiddleware
+from app.telemetry import TelemetryMiddleware, registry, CONTENT_TYPE
 
 app = FastAPI(title="Shortest Path Visualizer")
 
@@ -15,6 +16,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts / latency / sizes per route, scraped from /metrics
+app.add_middleware(TelemetryMiddleware)
+
 # Mount Static Files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -24,6 +28,8 @@ templates = Jinja2Templates(directory="app/templates")
 # Include Routers
 app.include_router(visualization.router)
 app.include_router(statistics.router)
+app.include_router(queries.router)
+app.include_router(graphs.router)
 
 @app.get("/")
 async def read_root(request: Request):
@@ -32,3 +38,7 @@ async def read_root(request: Request):
 @app.get("/batch")
 async def read_batch(request: Request):
     return templates.TemplateResponse("batch.html", {"request": request})
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
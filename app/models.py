@@ -1,25 +1,92 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal
 
 class GraphGenerateRequest(BaseModel):
-    num_nodes: int = 20
-    density: float = 0.2
+    num_nodes: int = Field(20, ge=1) # No fixed cap: admission prices generation (spring layout is quadratic)
+    density: float = Field(0.2, ge=0, le=1)
     directed: bool = False
     weight_min: int = 1
     weight_max: int = 10
     allow_disconnected: bool = False
 
+class ColumnarGraph(BaseModel):
+    # Parallel arrays (edge i = source[i] -> target[i]); validated and compiled in bulk
+    source: List[int]
+    target: List[int]
+    weight: Optional[List[float]] = None # Defaults to 1 per edge
+    nodes: Optional[List[int]] = None # Needed for isolated nodes / x, y; else taken from the edges
+    x: Optional[List[float]] = None
+    y: Optional[List[float]] = None
+    directed: bool = False
+
 class AlgorithmRunRequest(BaseModel):
     algorithm: str
     start_node: int
     end_node: int
-    graph: Dict[str, Any] # Full graph structure passed back (stateless API preference)
+    graph: Optional[Dict[str, Any]] = None # Full graph structure passed back (stateless API preference)
     # Alternatively, we could store graph in memory/ID, but passing it is stateless.
     # For large graphs, ID is better. For < 100 nodes, passing JSON is fine.
+    columns: Optional[ColumnarGraph] = None # Same graph as parallel arrays
+    max_steps: Optional[int] = None # Cap on returned steps (the final step is always exact); may be lowered by admission control
+    sampling: Literal["uniform", "events"] = "uniform" # "events" favours settles / round ends
+    timings: bool = False # Also put the phase timings (ms) in the body; they're always in Server-Timing
+    timeout_ms: Optional[int] = Field(None, ge=1) # Stop the run here and answer with the partial trace (capped by RUN_TIMEOUT_S)
+    k: int = Field(5, ge=1, le=50) # Paths to find (K-Shortest Paths only)
+    
+class ShortestPathRequest(BaseModel):
+    algorithm: str = "Dijkstra"
+    start_node: int
+    end_node: int
+    graph: Optional[Dict[str, Any]] = None
+    graph_id: Optional[str] = None # Stored graph (see /api/graphs), preferred over graph
+    columns: Optional[ColumnarGraph] = None # Large uploads: solved on the compiled array graph
+    timings: bool = False # Also put the phase timings (ms) in the body
+    timeout_ms: Optional[int] = Field(None, ge=1) # Stop the engine here; the answer is then flagged partial
+    k: int = Field(5, ge=1, le=50) # Paths to find (K-Shortest Paths only)
     
 class BatchRunRequest(BaseModel):
-    num_graphs: int = 30
-    num_nodes: int = 30
-    density: float = 0.3
+    num_graphs: int = Field(30, ge=1) # Sizes are bounded by admission (ADMISSION_BUDGET_S), not here
+    num_nodes: int = Field(30, ge=2)
+    density: float = Field(0.3, ge=0, le=1)
     directed: bool = False
     algorithms: Optional[List[str]] = None
+
+class DistanceTableRequest(BaseModel):
+    sources: List[int]
+    targets: List[int]
+    graph: Dict[str, Any]
+    workers: Optional[int] = Field(None, ge=1) # None = pick automatically, 1 = in-process; capped at the CPU count
+
+class NearestFacilityRequest(BaseModel):
+    sources: List[int] # Facilities / depots
+    graph: Dict[str, Any]
+    unweighted: bool = False # BFS instead of Dijkstra
+
+class StoreGraphRequest(BaseModel):
+    graph: Dict[str, Any] # Same shape as /api/generate-graph output
+
+class SSSPRequest(BaseModel):
+    source: int
+
+class AllPairsRequest(BaseModel):
+    matrix: bool = False # Also return the distance matrix (small graphs only)
+
+class PathQueryRequest(BaseModel):
+    source: int
+    target: int
+
+class EdgeUpdate(BaseModel):
+    op: Literal["add", "remove", "reweight"]
+    source: int
+    target: int
+    weight: Optional[float] = None # Required for add / reweight
+
+class EdgeUpdateRequest(BaseModel):
+    updates: List[EdgeUpdate]
+
+class ViewportRequest(BaseModel):
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    max_nodes: int = 500 # Above this many visible nodes, cells are returned as super-nodes
@@ -0,0 +1,165 @@
+"""
+The "auto" algorithm: pick the fastest engine that is exact on the given graph.
+
+Graph properties (weight range, equal weights, acyclicity, coordinates, density)
+are computed once per graph and cached: on the StoredGraph for stored graphs
+(reset by edge updates), else in a small LRU keyed by the request's graph
+fingerprint, so re-posting the same graph skips the scan. Then, first match wins:
+
+    equal weights w >= 0              -> BFS                O(n + m), no heap
+    directed and acyclic              -> DAG Shortest Path  O(n + m), negative weights too
+    a negative weight                 -> Bellman-Ford       the only exact engine left
+    weights >= straight-line lengths  -> A*                 Euclidean heuristic is admissible
+    otherwise                         -> Dijkstra
+
+On compiled arrays (columns, shared stored graphs) SciPy is faster than any Python
+engine, so only Dijkstra vs Bellman-Ford is decided there.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+from lazy_import import lazy_import
+from app.algorithms import ALGORITHMS, SPECIALIZED_ALGORITHMS
+
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
+
+AUTO = "auto"
+CACHE_SIZE = 256 # request graphs remembered by fingerprint
+
+class GraphProperties:
+    """What the planner needs to know about a graph; m counts arcs (an undirected edge twice)."""
+
+    def __init__(self, n, m, directed, min_weight, max_weight, acyclic, has_coordinates, metric_weights):
+        self.n = n
+        self.m = m
+        self.directed = directed
+        self.min_weight = min_weight # None without edges
+        self.max_weight = max_weight
+        self.acyclic = acyclic # directed graphs only; an undirected edge is a 2-cycle
+        self.has_coordinates = has_coordinates # distinct x, y on the nodes
+        self.metric_weights = metric_weights # no edge shorter than the straight line between its ends
+
+    @property
+    def unit_weights(self):
+        """Every edge weighs the same (not necessarily 1)."""
+        return self.min_weight == self.max_weight
+
+    @property
+    def density(self):
+        return self.m / (self.n * (self.n - 1)) if self.n > 1 else 0.0
+
+    @classmethod
+    def from_networkx(cls, G):
+        directed = G.is_directed()
+        positions = {node: (data.get('x'), data.get('y')) for node, data in G.nodes(data=True)}
+        has_coordinates = (None, None) not in positions.values() and len(set(positions.values())) > 1
+
+        min_weight = max_weight = None
+        metric = has_coordinates
+        for u, v, w in G.edges(data='weight', default=1):
+            if min_weight is None or w < min_weight:
+                min_weight = w
+            if max_weight is None or w > max_weight:
+                max_weight = w
+            if metric:
+                (ux, uy), (vx, vy) = positions[u], positions[v]
+                metric = w >= math.hypot(ux - vx, uy - vy) * (1 - 1e-9)
+
+        acyclic = directed and nx.is_directed_acyclic_graph(G)
+        m = G.number_of_edges() * (1 if directed else 2)
+        return cls(G.number_of_nodes(), m, directed, min_weight, max_weight, acyclic, has_coordinates, metric)
+
+    @classmethod
+    def from_compiled(cls, graph):
+        """Same scan on a CompiledGraph, in NumPy / SciPy."""
+        weights = graph.weights
+        empty = len(weights) == 0
+        min_weight = None if empty else float(weights.min())
+        max_weight = None if empty else float(weights.max())
+        rows = np.repeat(np.arange(graph.n), np.diff(graph.indptr))
+
+        has_coordinates = graph.x is not None and graph.y is not None and graph.n > 1 and bool(
+            np.ptp(graph.x) > 0 or np.ptp(graph.y) > 0)
+        metric = has_coordinates and bool(np.all(
+            weights >= np.hypot(graph.x[rows] - graph.x[graph.indices], graph.y[rows] - graph.y[graph.indices]) * (1 - 1e-9)))
+
+        acyclic = False
+        if graph.directed and not np.any(rows == graph.indices):
+            from scipy.sparse.csgraph import connected_components
+            # Acyclic <=> every strongly connected component is a single node (no self-loops)
+            acyclic = connected_components(graph.matrix(), directed=True, connection='strong')[0] == graph.n
+        return cls(graph.n, graph.m, graph.directed, min_weight, max_weight, bool(acyclic), has_coordinates, metric)
+
+    def to_dict(self):
+        return {
+            "nodes": self.n,
+            "arcs": self.m,
+            "directed": self.directed,
+            "min_weight": self.min_weight,
+            "max_weight": self.max_weight,
+            "unit_weights": self.unit_weights,
+            "acyclic": self.acyclic,
+            "has_coordinates": self.has_coordinates,
+            "metric_weights": self.metric_weights,
+            "density": round(self.density, 6),
+        }
+
+class Plan:
+    def __init__(self, algorithm, reason, properties):
+        self.algorithm = algorithm
+        self.reason = reason
+        self.properties = properties
+
+    def to_dict(self):
+        return {"algorithm": self.algorithm, "reason": self.reason, "properties": self.properties.to_dict()}
+
+def plan(props, compiled=False):
+    """The engine "auto" runs on a graph with these properties, and why."""
+    negative = props.min_weight is not None and props.min_weight < 0
+    if compiled:
+        if negative:
+            return Plan("Bellman-Ford", "negative weights: SciPy Bellman-Ford on the compiled arrays", props)
+        return Plan("Dijkstra", "non-negative weights: SciPy Dijkstra on the compiled arrays", props)
+
+    if props.unit_weights and not negative:
+        weight = props.min_weight if props.min_weight is not None else 1
+        return Plan("BFS", f"every edge weighs {weight:g}: BFS levels are shortest paths, O(n + m) without a heap", props)
+    if props.acyclic:
+        return Plan("DAG Shortest Path", "directed and acyclic: one relaxation per edge in topological order, O(n + m)"
+                    + (", negative weights included" if negative else ""), props)
+    if negative:
+        return Plan("Bellman-Ford", "negative weights on a graph with cycles: only Bellman-Ford is exact (and reports negative cycles)", props)
+    if props.metric_weights:
+        return Plan("A*", "no edge is shorter than the straight line between its ends: the Euclidean heuristic is admissible, so A* expands fewer nodes", props)
+    reason = "non-negative weights"
+    if props.has_coordinates:
+        reason += " (some edges are shorter than the straight line, so A*'s heuristic would not be admissible)"
+    return Plan("Dijkstra", reason, props)
+
+def engine(name):
+    """Generator for a planned engine (regular or specialized)."""
+    return ALGORITHMS[name] if name in ALGORITHMS else SPECIALIZED_ALGORITHMS[name]
+
+_cache = OrderedDict() # graph fingerprint -> GraphProperties, least recently used first
+_lock = threading.Lock()
+
+def cached(key):
+    """Properties already computed for the graph with this fingerprint, else None."""
+    with _lock:
+        props = _cache.get(key)
+        if props is not None:
+            _cache.move_to_end(key)
+        return props
+
+def properties(G, key):
+    """GraphProperties of networkx graph G, cached under key (its request fingerprint)."""
+    props = cached(key)
+    if props is None:
+        props = GraphProperties.from_networkx(G)
+        with _lock:
+            _cache[key] = props
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return props
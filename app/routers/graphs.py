@@ -0,0 +1,215 @@
+import contextlib
+
+from fastapi import APIRouter, HTTPException
+from app.models import StoreGraphRequest, SSSPRequest, EdgeUpdateRequest, ViewportRequest, AllPairsRequest, PathQueryRequest
+from app.graph_logic import GraphGenerator
+from app.graph_store import store
+from app.json_utils import sanitize_floats
+from app import admission
+from starlette.concurrency import run_in_threadpool
+import time
+
+router = APIRouter(prefix="/api/graphs", tags=["graphs"])
+
+# n^2 float64 distances + int16 next hops: about 90 MB per cached graph at this size
+ALL_PAIRS_MAX_NODES = 3000
+# Returning the whole distance matrix as JSON
+MATRIX_MAX_NODES = 500
+
+def get_entry(graph_id: str):
+    entry = store.get(graph_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Graph not found")
+    return entry
+
+# Handlers that read a graph run in the threadpool under its read lock (edit batches
+# take the write side), so neither queries nor edits ever block the event loop
+@contextlib.contextmanager
+def reading(graph_id: str):
+    with store.reading(graph_id) as entry:
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Graph not found")
+        yield entry
+
+@router.post("")
+async def store_graph(request: StoreGraphRequest):
+    G = GraphGenerator.from_json(request.graph)
+    graph_id = store.add(G)
+    return {"graph_id": graph_id, "nodes": G.number_of_nodes(), "edges": G.number_of_edges()}
+
+@router.get("/{graph_id}")
+async def get_graph(graph_id: str):
+    return await run_in_threadpool(read_graph, graph_id)
+
+def read_graph(graph_id: str):
+    with reading(graph_id) as entry:
+        return {"graph_id": graph_id, **GraphGenerator.to_json(entry.G), "cached_sources": list(entry.sssp.keys())}
+
+@router.delete("/{graph_id}")
+async def delete_graph(graph_id: str):
+    get_entry(graph_id)
+    store.remove(graph_id)
+    return {"deleted": graph_id}
+
+@router.post("/{graph_id}/viewport")
+async def viewport(graph_id: str, request: ViewportRequest):
+    """
+    Nodes and edges inside a rectangle of the graph's x/y space. When more than
+    max_nodes would be visible, grid cells are returned as super-nodes ("count" =
+    nodes merged) with aggregated edges, so zoomed-out views stay bounded. Edges
+    leaving the view are included, with their off-screen endpoint in nodes marked
+    "outside": true.
+    """
+    if request.max_nodes < 1:
+        raise HTTPException(status_code=400, detail="max_nodes must be at least 1")
+    return await run_in_threadpool(query_viewport, graph_id, request)
+
+def query_viewport(graph_id: str, request: ViewportRequest):
+    with reading(graph_id):
+        start_time = time.perf_counter()
+        result = store.spatial(graph_id).query(request.x0, request.y0, request.x1, request.y1, request.max_nodes)
+        result["time"] = (time.perf_counter() - start_time) * 1000 # ms
+        return result
+
+@router.post("/{graph_id}/sssp")
+async def compute_sssp(graph_id: str, request: SSSPRequest):
+    return await run_in_threadpool(read_sssp, graph_id, request)
+
+def read_sssp(graph_id: str, request: SSSPRequest):
+    with reading(graph_id) as entry:
+        if request.source not in entry.G:
+            raise HTTPException(status_code=400, detail=f"Unknown node: {request.source}")
+        if any(w < 0 for _, _, w in entry.G.edges(data='weight', default=1)):
+            raise HTTPException(status_code=400, detail="Cached shortest paths require non-negative edge weights")
+
+        sssp = store.sssp(graph_id, request.source)
+        return sanitize_floats({
+            "source": request.source,
+            "distances": {n: sssp.distances.get(n, float('inf')) for n in entry.G.nodes()},
+            "parents": {n: sssp.parents.get(n) for n in entry.G.nodes()}
+        })
+
+def get_all_pairs(graph_id: str, entry):
+    """The graph's all-pairs matrices, computing them (size + cost checked) on first use."""
+    if entry.all_pairs is None:
+        n, m = entry.size()
+        if n > ALL_PAIRS_MAX_NODES:
+            raise HTTPException(status_code=413, detail=f"All-pairs matrices are limited to {ALL_PAIRS_MAX_NODES} nodes (graph has {n})")
+        admission.admit("/api/graphs/{graph_id}/all-pairs", admission.all_pairs_estimate(n, m), f"All-pairs on {n} nodes / {m} arcs")
+    try:
+        return store.all_pairs(graph_id)
+    except Exception as e: # scipy NegativeCycleError (not imported here: SciPy loads lazily)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{graph_id}/all-pairs")
+async def compute_all_pairs(graph_id: str, request: AllPairsRequest):
+    """
+    Computes every shortest distance once, with a next-hop matrix for the paths, and
+    caches both with the graph (until its next edge update). /path then answers any
+    pair by lookup.
+    """
+    return await run_in_threadpool(read_all_pairs, graph_id, request)
+
+def read_all_pairs(graph_id: str, request: AllPairsRequest):
+    with reading(graph_id) as entry:
+        cached = entry.all_pairs is not None
+        start_time = time.perf_counter()
+        all_pairs = get_all_pairs(graph_id, entry)
+    result = {
+        "graph_id": graph_id,
+        "nodes": all_pairs.graph.n,
+        "bytes": all_pairs.nbytes,
+        "next_hop_dtype": str(all_pairs.next_hop.dtype),
+        "cached": cached,
+        "time": (time.perf_counter() - start_time) * 1000 # ms
+    }
+    if request.matrix:
+        if all_pairs.graph.n > MATRIX_MAX_NODES:
+            raise HTTPException(status_code=400, detail=f"matrix output is limited to {MATRIX_MAX_NODES} nodes; query pairs with /path")
+        result["node_ids"] = all_pairs.graph.node_ids.tolist()
+        result["distances"] = all_pairs.dist.tolist()
+    return sanitize_floats(result)
+
+@router.post("/{graph_id}/path")
+async def query_path(graph_id: str, request: PathQueryRequest):
+    """Distance and shortest path for one pair from the cached all-pairs matrices (built on first use)."""
+    return await run_in_threadpool(read_path, graph_id, request)
+
+def read_path(graph_id: str, request: PathQueryRequest):
+    with reading(graph_id) as entry:
+        cached = entry.all_pairs is not None
+        start_time = time.perf_counter()
+        all_pairs = get_all_pairs(graph_id, entry)
+    try:
+        cost = all_pairs.distance(request.source, request.target)
+        path = all_pairs.path(request.source, request.target)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown node: {e.args[0]}")
+    return sanitize_floats({
+        "source": request.source,
+        "target": request.target,
+        "cost": cost,
+        "path": path,
+        "cached": cached,
+        "time": (time.perf_counter() - start_time) * 1000 # ms
+    })
+
+def validate_updates(G, updates):
+    """Checks a whole edit batch in order (earlier updates count) without applying any of it."""
+    def key(u, v):
+        return (u, v) if G.is_directed() else frozenset((u, v))
+
+    present = {} # edges added / removed earlier in the batch
+    for update in updates:
+        u, v = update.source, update.target
+        exists = present.get(key(u, v), G.has_edge(u, v))
+        if update.op == "remove":
+            if not exists:
+                raise HTTPException(status_code=404, detail=f"Edge {u}->{v} not found")
+            present[key(u, v)] = False
+            continue
+
+        if update.weight is None or update.weight < 0:
+            raise HTTPException(status_code=400, detail=f"{update.op} needs a non-negative weight")
+        if update.op == "reweight" and not exists:
+            raise HTTPException(status_code=404, detail=f"Edge {u}->{v} not found")
+        if u not in G or v not in G:
+            raise HTTPException(status_code=400, detail=f"Unknown node in edge {u}->{v}")
+        present[key(u, v)] = True
+
+@router.post("/{graph_id}/edges")
+async def update_edges(graph_id: str, request: EdgeUpdateRequest):
+    """
+    Applies edge updates in order and repairs the cached distances of every source
+    computed via /sssp. Each step in the response holds the one node it repaired.
+    The batch is validated first and applied all or nothing.
+    """
+    get_entry(graph_id)
+    return await run_in_threadpool(apply_updates, graph_id, request)
+
+def apply_updates(graph_id: str, request: EdgeUpdateRequest):
+    results = []
+    start_time = time.perf_counter()
+    # One edit batch under the graph's write lock: with a shared store this also locks
+    # the graph across workers (a blocking flock) and publishes the new version once
+    with store.editing(graph_id) as entry:
+        if entry is None: # deleted since get_entry
+            raise HTTPException(status_code=404, detail="Graph not found")
+        # All or nothing: reject the batch before touching the graph or its caches
+        validate_updates(entry.G, request.updates)
+        for update in request.updates:
+            u, v = update.source, update.target
+            weight = None if update.op == "remove" else update.weight
+            repairs = store.update_edge(graph_id, u, v, weight)
+            results.append({
+                "op": update.op,
+                "source": u,
+                "target": v,
+                "repairs": [
+                    {"from": source, "repaired": len(steps), "steps": steps}
+                    for source, steps in repairs.items()
+                ]
+            })
+
+    duration = (time.perf_counter() - start_time) * 1000 # ms
+    return sanitize_floats({"graph_id": graph_id, "updates": results, "time": duration})
@@ -0,0 +1,347 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.models import DistanceTableRequest, NearestFacilityRequest, ShortestPathRequest
+from app.graph_logic import GraphGenerator
+from app.algorithms import ALGORITHMS, distance_table, nearest_sources, reconstruct_path, result_only
+from app.graph_store import store
+from app.json_utils import sanitize_floats
+from app.telemetry import observe_run, PhaseTimer
+from app.singleflight import ClientDisconnected, fingerprint, wait_unless_disconnected
+from app import admission, planner
+from starlette.concurrency import run_in_threadpool
+import time
+
+router = APIRouter(prefix="/api", tags=["queries"])
+
+# Engines whose result equals a cached single-source Dijkstra from /api/graphs/{id}/sssp
+SSSP_CACHE_ALGORITHMS = {"Dijkstra", "Uniform Cost Search"}
+# Engines whose result the SciPy solver on a CompiledGraph reproduces
+COMPILED_ALGORITHMS = SSSP_CACHE_ALGORITHMS | {"Bellman-Ford"}
+# Engines a stored graph's all-pairs matrices (/api/graphs/{id}/all-pairs) answer exactly
+ALL_PAIRS_ALGORITHMS = COMPILED_ALGORITHMS | {"A*", "Floyd-Warshall", "BFS", "DAG Shortest Path"}
+
+@router.post("/shortest-path")
+async def shortest_path(request: ShortestPathRequest, http_request: Request):
+    """
+    Result-only query: cost, path, nodes expanded and time. No animation steps are
+    built (the engine runs with tracing disabled), so this is the endpoint for services.
+    """
+    timer = PhaseTimer("/api/shortest-path", http_request)
+    if request.algorithm not in ALGORITHMS and request.algorithm != planner.AUTO:
+        raise HTTPException(status_code=400, detail="Algorithm not found")
+
+    entry = None
+    if request.graph_id is not None:
+        entry = store.get(request.graph_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Graph not found")
+
+    # "auto": stored graphs (and JSON graphs scanned before) are planned up front, so
+    # the run is priced and routed as the picked engine; the rest once they're built
+    plan = None
+    if request.algorithm == planner.AUTO:
+        if entry is not None:
+            with timer.phase("plan"):
+                plan = await run_in_threadpool(plan_stored, request.graph_id)
+        elif request.columns is None and request.graph is not None:
+            props = planner.cached(await run_in_threadpool(fingerprint, request.graph))
+            if props is not None:
+                plan = planner.plan(props)
+        if plan is not None:
+            request = request.model_copy(update={"algorithm": plan.algorithm})
+
+    # Price the run first; cached answers are free, the SciPy path is cheaper than the engines
+    if entry is not None and (entry.all_pairs is not None and request.algorithm in ALL_PAIRS_ALGORITHMS
+                              or request.start_node in entry.sssp and request.algorithm in SSSP_CACHE_ALGORITHMS):
+        estimate = 0.0
+    else:
+        if entry is not None:
+            n, m = entry.size()
+        elif request.columns is not None:
+            n, m = await run_in_threadpool(admission.columns_graph_size, request.columns)
+        else:
+            n, m = admission.json_graph_size(request.graph or {})
+        if entry is not None:
+            compiled = request.algorithm in COMPILED_ALGORITHMS and entry.compiled is not None and not entry.dirty
+        else: # columns are solved by SciPy, "auto" included
+            compiled = request.columns is not None and (request.algorithm in COMPILED_ALGORITHMS or request.algorithm == planner.AUTO)
+        estimate = admission.admit("/api/shortest-path", admission.estimate(request.algorithm, n, m, "result", compiled=compiled, k=request.k),
+                                   f"{request.algorithm} on {n} nodes / {m} arcs")
+
+    token = admission.cancel_token(request.timeout_ms)
+    async with admission.slot("/api/shortest-path", estimate):
+        # Run in the threadpool and stop if the client leaves; stored graphs are read
+        # under their read lock, so an edit batch never changes them mid-run
+        if entry is not None:
+            task = asyncio.ensure_future(run_in_threadpool(answer_stored, request, timer, token, plan))
+        else:
+            task = asyncio.ensure_future(run_in_threadpool(answer_shortest_path, request, timer, None, token, plan))
+        try:
+            response = await wait_unless_disconnected(task, http_request.is_disconnected)
+        except ClientDisconnected:
+            token.cancel("disconnected")
+            return Response(status_code=499)
+    return admission.cost_headers(response, estimate)
+
+def plan_stored(graph_id):
+    """The "auto" plan for a stored graph (properties cached with it), read under its lock."""
+    with store.reading(graph_id) as entry:
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Graph not found")
+        return planner.plan(store.properties(graph_id), compiled=entry.compiled is not None and not entry.dirty)
+
+def answer_stored(request: ShortestPathRequest, timer: PhaseTimer, token=None, plan=None):
+    """answer_shortest_path on the stored graph request.graph_id, under its read lock."""
+    with store.reading(request.graph_id) as entry:
+        if entry is None: # deleted since the request was priced
+            raise HTTPException(status_code=404, detail="Graph not found")
+        return answer_shortest_path(request, timer, entry, token, plan)
+
+def answer_shortest_path(request: ShortestPathRequest, timer: PhaseTimer, entry=None, token=None, plan=None):
+    """plan: what "auto" resolved to, when already known (request.algorithm is then the pick)."""
+    if request.columns is not None and entry is None:
+        return solve_compiled(request, timer, token=token)
+
+    if entry is not None and entry.all_pairs is not None and request.algorithm in ALL_PAIRS_ALGORITHMS:
+        return lookup_all_pairs(request, timer, entry.all_pairs, plan)
+
+    # Shared store: answer from the memory-mapped arrays, no networkx copy in this worker
+    if (entry is not None and entry.compiled is not None and not entry.dirty
+            and request.algorithm in COMPILED_ALGORITHMS and request.start_node not in entry.sssp):
+        return solve_compiled(request, timer, entry.compiled, token, plan)
+
+    with timer.phase("build_graph"):
+        if entry is not None:
+            G = entry.G
+        elif request.graph is not None:
+            G = GraphGenerator.from_json(request.graph)
+        else:
+            raise HTTPException(status_code=400, detail="Provide graph, graph_id or columns")
+
+    if request.start_node not in G or request.end_node not in G:
+        raise HTTPException(status_code=400, detail="Unknown start or end node")
+
+    if request.algorithm == planner.AUTO:
+        with timer.phase("plan"):
+            plan = planner.plan(planner.properties(G, fingerprint(request.graph)))
+        request = request.model_copy(update={"algorithm": plan.algorithm})
+
+    start_time = time.perf_counter()
+
+    sssp = entry.sssp.get(request.start_node) if entry is not None else None
+    tracer = result_only(cancel=token)
+    if sssp is not None and request.algorithm in SSSP_CACHE_ALGORITHMS:
+        cost = sssp.distances.get(request.end_node, float('inf'))
+        parents = sssp.parents
+        nodes_expanded = 0
+        cached = True
+    else:
+        final_step = None
+        try:
+            with timer.phase("run"):
+                for step in planner.engine(request.algorithm)(G, request.start_node, request.end_node, tracer=tracer,
+                                                              **engine_options(request)):
+                    final_step = step
+                    if tracer.stopped is not None:
+                        break # cost / path are the best found so far
+        except ValueError as e: # e.g. negative weights for K-Shortest Paths
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        cost = final_step['distances'].get(request.end_node, float('inf'))
+        parents = final_step['parents']
+        nodes_expanded = len(final_step['visited'])
+        cached = False
+
+    path = reconstruct_path(parents, request.start_node, request.end_node) if cost != float('inf') else []
+    duration = (time.perf_counter() - start_time) * 1000 # ms
+    if not cached:
+        observe_run("/api/shortest-path", request.algorithm, G.number_of_nodes(), duration / 1000)
+
+    return timed_response(timer, request, G.number_of_nodes(), {
+        "algorithm": request.algorithm,
+        "cost": cost,
+        "path": path,
+        "nodes_expanded": nodes_expanded,
+        "cached": cached,
+        "time": duration
+    }, tracer.stopped, plan)
+
+def engine_options(request: ShortestPathRequest):
+    """Extra engine arguments taken from the request."""
+    return {"k": request.k} if request.algorithm == "K-Shortest Paths" else {}
+
+def lookup_all_pairs(request: ShortestPathRequest, timer: PhaseTimer, all_pairs, plan=None):
+    """Answer from a stored graph's all-pairs matrices: a lookup plus a next-hop walk."""
+    start_time = time.perf_counter()
+    try:
+        with timer.phase("run"):
+            cost = all_pairs.distance(request.start_node, request.end_node)
+            path = all_pairs.path(request.start_node, request.end_node)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Unknown start or end node")
+    return timed_response(timer, request, all_pairs.graph.n, {
+        "algorithm": request.algorithm,
+        "cost": cost,
+        "path": path,
+        "nodes_expanded": 0,
+        "cached": True,
+        "time": (time.perf_counter() - start_time) * 1000 # ms
+    }, plan=plan)
+
+def timed_response(timer, request, num_nodes, result, partial=None, plan=None):
+    """
+    sanitize + encode phases, then the Server-Timing header (timings in the body on request).
+    partial: why the engine stopped early; flagged in the body and X-Partial-Result.
+    plan: the planner's pick for "auto", reported in the body and X-Planned-Algorithm.
+    """
+    if partial is not None:
+        result["partial"] = partial
+    if plan is not None:
+        result["plan"] = plan.to_dict()
+    with timer.phase("sanitize"):
+        result = sanitize_floats(result)
+    if request.timings:
+        result["timings"] = timer.as_ms()
+    with timer.phase("encode"):
+        response = JSONResponse(jsonable_encoder(result))
+    if partial is not None:
+        response.headers["X-Partial-Result"] = partial
+    if plan is not None:
+        response.headers["X-Planned-Algorithm"] = plan.algorithm
+    return timer.finish(response, num_nodes)
+
+def solve_compiled(request: ShortestPathRequest, timer: PhaseTimer, graph=None, token=None, plan=None):
+    """
+    /shortest-path on a columnar upload (or a stored graph's shared arrays): the arrays
+    go straight into a CompiledGraph and are solved with SciPy (Dijkstra, or Bellman-Ford
+    when a weight is negative), so no per-edge Python objects are built. K-Shortest
+    Paths still needs the engine (the only part here the token can stop; SciPy runs
+    to completion).
+    """
+    if graph is None:
+        try:
+            with timer.phase("build_graph"):
+                graph = GraphGenerator.from_columns(request.columns)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if request.start_node not in graph or request.end_node not in graph:
+        raise HTTPException(status_code=400, detail="Unknown start or end node")
+
+    if request.algorithm == planner.AUTO:
+        with timer.phase("plan"):
+            plan = planner.plan(planner.GraphProperties.from_compiled(graph), compiled=True)
+        request = request.model_copy(update={"algorithm": plan.algorithm})
+
+    start_time = time.perf_counter()
+    tracer = result_only(cancel=token)
+    if request.algorithm == "K-Shortest Paths":
+        if graph.has_negative_weights():
+            raise HTTPException(status_code=400, detail="K-Shortest Paths needs non-negative edge weights")
+        final_step = None
+        with timer.phase("run"):
+            for step in ALGORITHMS[request.algorithm](graph.to_networkx(), request.start_node, request.end_node,
+                                                      tracer=tracer, k=request.k):
+                final_step = step
+                if tracer.stopped is not None:
+                    break # the paths found before the deadline
+        cost = final_step['distances'].get(request.end_node, float('inf'))
+        path = reconstruct_path(final_step['parents'], request.start_node, request.end_node) if cost != float('inf') else []
+        nodes_expanded = len(final_step['visited'])
+    else:
+        try:
+            with timer.phase("run"):
+                cost, path, nodes_expanded = graph.shortest_path(request.start_node, request.end_node)
+        except Exception as e: # e.g. NegativeCycleError
+            raise HTTPException(status_code=400, detail=str(e))
+    duration = (time.perf_counter() - start_time) * 1000 # ms
+    observe_run("/api/shortest-path", request.algorithm, graph.n, duration / 1000)
+
+    return timed_response(timer, request, graph.n, {
+        "algorithm": request.algorithm,
+        "cost": cost,
+        "path": path,
+        "nodes_expanded": nodes_expanded,
+        "cached": False,
+        "time": duration
+    }, tracer.stopped, plan)
+
+@router.post("/distance-table")
+async def get_distance_table(request: DistanceTableRequest):
+    if not request.sources or not request.targets:
+        raise HTTPException(status_code=400, detail="sources and targets must not be empty")
+
+    # One bounded Dijkstra per distinct source, priced before the graph is even built
+    n, m = admission.json_graph_size(request.graph)
+    searches = len(set(request.sources))
+    estimate = admission.admit("/api/distance-table", searches * admission.estimate("Dijkstra", n, m, "result"),
+                               f"{searches} searches on {n} nodes / {m} arcs", "use fewer sources or a smaller graph")
+    async with admission.slot("/api/distance-table", estimate):
+        return await run_in_threadpool(compute_distance_table, request)
+
+def compute_distance_table(request: DistanceTableRequest):
+    G = GraphGenerator.from_json(request.graph)
+
+    missing = [n for n in request.sources + request.targets if n not in G]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown nodes: {sorted(set(missing))}")
+
+    # Bounded Dijkstra is only correct for non-negative weights
+    if any(w < 0 for _, _, w in G.edges(data='weight', default=1)):
+        raise HTTPException(status_code=400, detail="Distance tables require non-negative edge weights")
+
+    start_time = time.perf_counter()
+    table = distance_table(G, request.sources, request.targets, workers=request.workers)
+    duration = (time.perf_counter() - start_time) * 1000 # ms
+
+    sources = list(table.keys())
+    targets = list(dict.fromkeys(request.targets))
+    return sanitize_floats({
+        "sources": sources,
+        "targets": targets,
+        "distances": [[table[s][t] for t in targets] for s in sources],
+        "time": duration
+    })
+
+@router.post("/nearest-facility")
+async def nearest_facility(request: NearestFacilityRequest):
+    """Nearest source (and distance to it) for every node: a graph Voronoi partition."""
+    if not request.sources:
+        raise HTTPException(status_code=400, detail="sources must not be empty")
+
+    # All sources share one search
+    n, m = admission.json_graph_size(request.graph)
+    estimate = admission.admit("/api/nearest-facility", admission.estimate("Dijkstra", n, m, "result"),
+                               f"Multi-source search on {n} nodes / {m} arcs", "use a smaller graph")
+    async with admission.slot("/api/nearest-facility", estimate):
+        return await run_in_threadpool(compute_nearest_facility, request)
+
+def compute_nearest_facility(request: NearestFacilityRequest):
+    G = GraphGenerator.from_json(request.graph)
+
+    missing = [n for n in request.sources if n not in G]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown nodes: {sorted(set(missing))}")
+
+    if not request.unweighted and any(w < 0 for _, _, w in G.edges(data='weight', default=1)):
+        raise HTTPException(status_code=400, detail="Multi-source Dijkstra requires non-negative edge weights")
+
+    start_time = time.perf_counter()
+    distances, owner = nearest_sources(G, request.sources, unweighted=request.unweighted)
+    duration = (time.perf_counter() - start_time) * 1000 # ms
+
+    cells = {s: [] for s in dict.fromkeys(request.sources)}
+    for node, src in owner.items():
+        cells[src].append(node)
+
+    return sanitize_floats({
+        "distances": {n: distances.get(n, float('inf')) for n in G.nodes()},
+        "owner": {n: owner.get(n) for n in G.nodes()},
+        "cells": cells,
+        "time": duration
+    })
@@ -1,19 +1,37 @@
 from fastapi import APIRouter, HTTPException
 from app.models import BatchRunRequest
 from app.graph_logic import GraphGenerator
-from app.algorithms import ALGORITHMS
+from app.algorithms import ALGORITHMS, EventCounter
+from app.algorithms.tracing import SETTLE, RELAX
+from app.telemetry import observe_run
+from app import admission
+from starlette.concurrency import run_in_threadpool
 import time
-import networkx as nx
 import statistics as stats
+from lazy_import import lazy_import
+
+nx = lazy_import("networkx")
 
 router = APIRouter(prefix="/api", tags=["statistics"])
 
 @router.post("/batch-run")
 async def batch_run(request: BatchRunRequest):
+    # Steps are only counted here, never encoded, so the engines' work is what costs
+    n, m = admission.generated_graph_size(request.num_nodes, request.density, False)
+    per_graph = admission.generation_estimate(request.num_nodes, request.density, False) + sum(
+        admission.estimate(name, n, m, "result") for name in ALGORITHMS)
+    estimate = admission.admit("/api/batch-run", request.num_graphs * per_graph,
+                               f"{request.num_graphs} graphs x {len(ALGORITHMS)} algorithms", "use fewer or smaller graphs")
+    async with admission.slot("/api/batch-run", estimate):
+        return await run_in_threadpool(run_batch, request)
+
+def run_batch(request: BatchRunRequest):
     results = {algo_name: {
         "success_count": 0,
         "total_cost": 0,
         "total_nodes_expanded": 0,
+        "total_settled": 0,
+        "total_relaxations": 0,
         "execution_times": [],
         "costs": []
     } for algo_name in ALGORITHMS.keys()}
@@ -44,8 +62,9 @@ async def batch_run(request: BatchRunRequest):
         for algo_name, algo_fn in ALGORITHMS.items():
             start_time = time.perf_counter()
             
-            # Run algorithm (consume generator)
-            gen = algo_fn(G, start_node, end_node)
+            # Run algorithm (consume generator); the counter tallies settles / relaxations
+            counter = EventCounter(enabled=True)
+            gen = algo_fn(G, start_node, end_node, tracer=counter)
             final_step = None
             nodes_expanded = 0
             
@@ -57,14 +76,17 @@ async def batch_run(request: BatchRunRequest):
                 pass
                 
             end_time = time.perf_counter()
+            observe_run("/api/batch-run", algo_name, request.num_nodes, end_time - start_time, nodes_expanded)
             
             # Analyze result
-            if final_step and final_step['current_node'] == end_node:
+            if final_step and final_step['current_node'] == end_node and final_step['distances'].get(end_node) != float('inf'):
                 cost = final_step['distances'][end_node]
                 results[algo_name]["success_count"] += 1
                 results[algo_name]["total_cost"] += cost
                 results[algo_name]["costs"].append(cost)
                 results[algo_name]["total_nodes_expanded"] += nodes_expanded
+                results[algo_name]["total_settled"] += counter.counts[SETTLE]
+                results[algo_name]["total_relaxations"] += counter.counts[RELAX]
                 results[algo_name]["execution_times"].append(end_time - start_time)
             else:
                  # Didn't finish??
@@ -83,6 +105,8 @@ async def batch_run(request: BatchRunRequest):
                 "success_rate": 0,
                 "avg_cost": 0,
                 "avg_nodes": 0,
+                "avg_settled": 0,
+                "avg_relaxations": 0,
                 "avg_time": 0
             })
              continue
@@ -92,6 +116,8 @@ async def batch_run(request: BatchRunRequest):
             "success_rate": count / request.num_graphs,
             "avg_cost": data["total_cost"] / count,
             "avg_nodes": data["total_nodes_expanded"] / count,
+            "avg_settled": data["total_settled"] / count,
+            "avg_relaxations": data["total_relaxations"] / count,
             "avg_time": sum(data["execution_times"]) / count
         })
         
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from app.models import GraphGenerateRequest, AlgorithmRunRequest, BatchRunRequest
 from app.graph_logic import GraphGenerator
-from app.algorithms import ALGORITHMS
-import networkx as nx
-import math
+from app.algorithms import ALGORITHMS, StepSampler, EventCounter, Tracer, result_only
+from app.algorithms.tracing import SETTLE, RELAX, ROUND
+from app.json_utils import sanitize_floats
+from app.wire import BINARY_MEDIA_TYPE, wants_binary, binary_response, encode_graph, encode_steps
+from app.telemetry import observe_run, PhaseTimer
+from app.singleflight import SingleFlight, ClientDisconnected, fingerprint, body_fingerprint
+from app import admission, planner
 import time
 import random
 
 router = APIRouter(prefix="/api", tags=["visualization"])
 
+run_flights = SingleFlight("/api/run-algorithm")
+
 @router.post("/generate-graph")
-async def generate_graph(request: GraphGenerateRequest):
+async def generate_graph(request: GraphGenerateRequest, http_request: Request):
+    admission.admit("/api/generate-graph", admission.generation_estimate(request.num_nodes, request.density, request.directed),
+                    f"Generating {request.num_nodes} nodes at density {request.density:g}", "use fewer nodes")
     G = GraphGenerator.generate_graph(
         request.num_nodes, 
         request.density, 
@@ -18,52 +29,166 @@ async def generate_graph(request: GraphGenerateRequest):
         (request.weight_min, request.weight_max),
         request.allow_disconnected
     )
+    if wants_binary(http_request):
+        return binary_response(encode_graph(G))
     return GraphGenerator.to_json(G)
 
 @router.post("/run-algorithm")
-async def run_algorithm(request: AlgorithmRunRequest):
-    if request.algorithm not in ALGORITHMS:
+async def run_algorithm(request: AlgorithmRunRequest, http_request: Request):
+    timer = PhaseTimer("/api/run-algorithm", http_request)
+    if request.algorithm not in ALGORITHMS and request.algorithm != planner.AUTO:
         raise HTTPException(status_code=400, detail="Algorithm not found")
-        
-    # Reconstruct graph from JSON
-    if request.graph['directed']:
-        G = nx.DiGraph()
+    if request.max_steps is not None and request.max_steps < 2:
+        raise HTTPException(status_code=400, detail="max_steps must be at least 2")
+
+    # Price the run before building anything; an over-budget full trace becomes a sampled one
+    binary = wants_binary(http_request)
+    if request.columns is not None:
+        n, m = await run_in_threadpool(admission.columns_graph_size, request.columns)
     else:
-        G = nx.Graph()
-        
-    for node in request.graph['nodes']:
-        G.add_node(node['id'], x=node['x'], y=node['y'])
-        
-    for edge in request.graph['edges']:
-        G.add_edge(edge['source'], edge['target'], weight=edge['weight'])
+        n, m = admission.json_graph_size(request.graph or {})
+    priced = request.algorithm
+    graph_key = None
+    if request.algorithm == planner.AUTO:
+        # A graph seen before is priced as the engine the planner will pick; hashing a
+        # big graph is a JSON dump, so it happens off the event loop
+        graph_key = await run_in_threadpool(graph_fingerprint, request)
+        props = planner.cached(graph_key)
+        if props is not None:
+            priced = planner.plan(props).algorithm
+    estimate, max_steps = admission.admit_trace("/api/run-algorithm", priced, n, m, request.max_steps, binary, request.k)
+    downgraded = max_steps != request.max_steps
+    if downgraded:
+        request = request.model_copy(update={"max_steps": max_steps})
+
+    # Identical concurrent requests (a classroom pressing Run on the same graph) share one run;
+    # max_steps may have been lowered above, and the encoding depends on the Accept header
+    key = await body_fingerprint(http_request, request.max_steps, binary)
+    # Stops the engine at the deadline, or once every client waiting on it has disconnected
+    token = admission.cancel_token(request.timeout_ms)
+    try:
+        with timer.phase("coalesced"):
+            result, shared = await run_flights.run(key, compute_run, request, binary, timer, token, graph_key,
+                                                   gate=admission.slot("/api/run-algorithm", estimate),
+                                                   cancel=token, disconnected=http_request.is_disconnected)
+    except ClientDisconnected:
+        return Response(status_code=499) # nobody reads it; recorded as "client closed request"
+
+    response = Response(content=result.body, media_type=result.media_type)
+    if not shared:
+        del timer.phases["coalesced"] # the leader's wait is just its own phases
+    else:
+        # Only this request's own time: parse + waiting on the leader
+        timer.phases = {name: timer.phases[name] for name in ("parse", "coalesced") if name in timer.phases}
+    admission.cost_headers(response, estimate, max_steps if downgraded else None)
+    if result.partial is not None:
+        response.headers["X-Partial-Result"] = result.partial
+    if result.plan is not None:
+        response.headers["X-Planned-Algorithm"] = result.plan.algorithm
+    return timer.finish(response, result.num_nodes)
+
+def graph_fingerprint(request: AlgorithmRunRequest):
+    """Planner cache key of the request's graph (JSON or columns), as sent."""
+    return fingerprint(request.graph if request.columns is None else request.columns.model_dump())
+
+class EncodedResult:
+    """What coalesced /run-algorithm requests share: the encoded body, not the steps."""
+
+    def __init__(self, body, media_type, num_nodes, partial=None, plan=None):
+        self.body = body
+        self.media_type = media_type
+        self.num_nodes = num_nodes
+        self.partial = partial # why the run stopped early ("deadline", "disconnected"), else None
+        self.plan = plan # planner.Plan when the request asked for "auto"
+
+def compute_run(request: AlgorithmRunRequest, binary: bool, timer: PhaseTimer, token=None, graph_key=None):
+    """
+    Build the graph, run the engine, encode. Runs in the threadpool via run_flights.
+    graph_key: fingerprint of the graph as sent, for "auto" (caches its properties).
+    """
+    # Reconstruct graph from JSON (or columns)
+    with timer.phase("build_graph"):
+        if request.columns is not None:
+            try:
+                G = GraphGenerator.from_columns(request.columns).to_networkx()
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        elif request.graph is not None:
+            G = GraphGenerator.from_json(request.graph)
+        else:
+            raise HTTPException(status_code=400, detail="Provide graph or columns")
         
-    algorithm_fn = ALGORITHMS[request.algorithm]
-    
+    plan = None
+    algorithm = request.algorithm
+    if algorithm == planner.AUTO:
+        with timer.phase("plan"):
+            plan = planner.plan(planner.properties(G, graph_key))
+        algorithm = plan.algorithm
+    algorithm_fn = planner.engine(algorithm)
+    options = {"k": request.k} if algorithm == "K-Shortest Paths" else {}
+
     steps = []
     try:
-        gen = algorithm_fn(G, request.start_node, request.end_node)
-        for step in gen:
-            steps.append(step)
+        with timer.phase("run"):
+            if request.max_steps is None:
+                tracer = Tracer(cancel=token)
+                gen = algorithm_fn(G, request.start_node, request.end_node, tracer=tracer, **options)
+                for step in gen:
+                    steps.append(step)
+                    if tracer.stopped is not None:
+                        break # this step is the engine's state when the token fired
+            else:
+                # Engine only builds the steps the sampler keeps
+                tracer = StepSampler(request.max_steps, request.sampling, cancel=token)
+                for step in algorithm_fn(G, request.start_node, request.end_node, tracer=tracer, **options):
+                    tracer.add(step)
+                    if tracer.stopped is not None:
+                        break
+                steps = tracer.steps()
+    except ValueError as e: # input the engine can't handle, e.g. negative weights for K-Shortest Paths
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    observe_run("/api/run-algorithm", algorithm, G.number_of_nodes(), timer.phases["run"], len(steps))
+
+    # Both encodings carry the same answer: the steps plus these
+    meta = {}
+    if tracer.stopped is not None:
+        meta["partial"] = tracer.stopped
+    if plan is not None:
+        meta["plan"] = plan.to_dict()
+
+    # Accept: application/x-shortest-path-binary -> delta-encoded typed arrays
+    if binary:
+        if request.timings:
+            meta["timings"] = timer.as_ms() # encode can't time itself; it's in the header
+        with timer.phase("encode"):
+            body = encode_steps(steps, G.nodes(), meta)
+        return EncodedResult(body, BINARY_MEDIA_TYPE, G.number_of_nodes(), tracer.stopped, plan)
     
     # Sanitize inputs for JSON (handle infinity)
-    def sanitize_floats(obj):
-        if isinstance(obj, float):
-             if math.isinf(obj) or math.isnan(obj):
-                 return "Infinity"
-             return obj
-        if isinstance(obj, dict):
-            return {k: sanitize_floats(v) for k, v in obj.items()}
-        if isinstance(obj, (list, tuple)):
-            return [sanitize_floats(i) for i in obj]
-        return obj
-
-    cleaned_steps = sanitize_floats(steps)
-    return {"steps": cleaned_steps}
+    with timer.phase("sanitize"):
+        cleaned_steps = sanitize_floats(steps)
+    body = {"steps": cleaned_steps, **meta}
+    if request.timings:
+        body["timings"] = timer.as_ms() # encode can't time itself; it's in the header
+    # Rendered here (same encoder FastAPI would use) so the encode phase is measurable
+    with timer.phase("encode"):
+        rendered = JSONResponse(jsonable_encoder(body))
+    return EncodedResult(rendered.body, rendered.media_type, G.number_of_nodes(), tracer.stopped, plan)
 
 @router.post("/batch-run")
 async def batch_run_analysis(request: BatchRunRequest):
+    algo_names = [name for name in ALGORITHMS if not request.algorithms or name in request.algorithms]
+    n, m = admission.generated_graph_size(request.num_nodes, 0.2, request.directed)
+    per_graph = admission.generation_estimate(request.num_nodes, 0.2, request.directed) + sum(
+        admission.estimate(name, n, m, "result") for name in algo_names)
+    estimate = admission.admit("/api/batch-run", request.num_graphs * per_graph,
+                               f"{request.num_graphs} graphs x {len(algo_names)} algorithms", "use fewer or smaller graphs, or fewer algorithms")
+    async with admission.slot("/api/batch-run", estimate):
+        return await run_in_threadpool(run_batch, request)
+
+def run_batch(request: BatchRunRequest):
     results = []
     
     for _ in range(request.num_graphs):
@@ -94,8 +219,10 @@ async def batch_run_analysis(request: BatchRunRequest):
         for algo_name, algo_fn in algos_to_run:
             start_time = time.perf_counter()
             try:
-                # We need to exhaust the generator to get the final state
-                gen = algo_fn(G, start, end)
+                # Only the final state matters here, so skip building animation steps;
+                # the counter still sees every settle / relaxation the engine does
+                counter = EventCounter()
+                gen = algo_fn(G, start, end, tracer=counter)
                 last_step = None
                 step_count = 0
                 for step in gen:
@@ -103,6 +230,7 @@ async def batch_run_analysis(request: BatchRunRequest):
                     step_count += 1
                 
                 duration = (time.perf_counter() - start_time) * 1000 # ms
+                observe_run("/api/batch-run", algo_name, len(nodes), duration / 1000, step_count)
                 
                 cost = float('inf')
                 visited = 0
@@ -120,6 +248,9 @@ async def batch_run_analysis(request: BatchRunRequest):
                     "success": cost != float('inf'),
                     "cost": cost,
                     "visited": visited,
+                    "settled": counter.counts[SETTLE],
+                    "relaxations": counter.counts[RELAX],
+                    "rounds": counter.counts[ROUND],
                     "time": duration
                 }
                 
@@ -135,17 +266,6 @@ async def batch_run_analysis(request: BatchRunRequest):
         results.append(graph_res)
 
     # Sanitize inputs for JSON (handle infinity)
-    def sanitize_floats(obj):
-        if isinstance(obj, float):
-             if math.isinf(obj) or math.isnan(obj):
-                 return "Infinity"
-             return obj
-        if isinstance(obj, dict):
-            return {k: sanitize_floats(v) for k, v in obj.items()}
-        if isinstance(obj, (list, tuple)):
-            return [sanitize_floats(i) for i in obj]
-        return obj
-
     return sanitize_floats(results)
 
 import os
@@ -158,7 +278,8 @@ async def get_algorithm_code(algorithm_name: str):
         "A*": "a_star.py",
         "Bellman-Ford": "bellman_ford.py",
         "Uniform Cost Search": "uniform_cost_search.py",
-        "Floyd-Warshall": "floyd_warshall.py"
+        "Floyd-Warshall": "floyd_warshall.py",
+        "K-Shortest Paths": "k_shortest_paths.py"
     }
     
     if algorithm_name not in FILENAME_MAP:
@@ -0,0 +1,130 @@
+"""
+Single-flight request coalescing: identical concurrent requests share one computation.
+
+The first request for a key starts the work in the threadpool; requests with the same
+key arriving while it runs await the same task and get the same encoded response.
+Nothing is cached afterwards, so a later request recomputes (no staleness questions).
+"""
+import asyncio
+import hashlib
+import json
+
+from starlette.concurrency import run_in_threadpool
+
+from app.telemetry import COALESCED_REQUESTS
+
+# How often a waiting request checks whether its client is still there
+DISCONNECT_POLL_S = 0.2
+# Bodies up to this size are hashed on the event loop; a thread hop costs more
+INLINE_HASH_BYTES = 1 << 16
+
+def fingerprint(*parts):
+    """Stable hash of JSON-able request parts (dict key order doesn't matter)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, separators=(",", ":"), default=str).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _body_fingerprint(body, parts):
+    h = hashlib.blake2b(body, digest_size=16)
+    h.update(b"\0")
+    h.update(fingerprint(*parts).encode())
+    return h.hexdigest()
+
+async def body_fingerprint(http_request, *parts):
+    """
+    Key for a request by its raw body bytes (FastAPI has already read them) plus a few
+    small parts, so the parsed graph is never re-serialized. Large bodies are hashed in
+    the threadpool. Only byte-identical bodies match, which is what repeated clicks send.
+    """
+    body = await http_request.body()
+    if len(body) <= INLINE_HASH_BYTES:
+        return _body_fingerprint(body, parts)
+    return await run_in_threadpool(_body_fingerprint, body, parts)
+
+class ClientDisconnected(Exception):
+    """The caller's client went away while it was waiting for the result."""
+
+class _Flight:
+    __slots__ = ("task", "cancel", "waiters")
+
+    def __init__(self, task, cancel):
+        self.task = task
+        self.cancel = cancel # CancelToken of the run, or None
+        self.waiters = 0
+
+async def _wait_for_disconnect(disconnected):
+    while not await disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+async def wait_unless_disconnected(task, disconnected):
+    """
+    Awaits task without cancelling it; raises ClientDisconnected instead if
+    disconnected() (Request.is_disconnected) turns True first.
+    """
+    watcher = asyncio.ensure_future(_wait_for_disconnect(disconnected))
+    try:
+        done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+    if task not in done:
+        raise ClientDisconnected()
+    return task.result()
+
+class SingleFlight:
+    def __init__(self, route):
+        self.route = route
+        self._inflight = {} # key -> _Flight; only touched from the event loop
+
+    async def run(self, key, fn, *args, gate=None, cancel=None, disconnected=None):
+        """
+        Runs fn(*args) in the threadpool unless an identical call is already running.
+        Returns (result, shared): shared is True when this call joined another one.
+        Exceptions (HTTPException included) reach every caller. gate is an async
+        context manager entered around the work (an admission slot), so only the
+        call that really computes waits for one.
+
+        cancel is the CancelToken fn was given (pass it in args too). disconnected is
+        an async callable (Request.is_disconnected) polled while waiting: when this
+        caller's client leaves it gets ClientDisconnected, and once every caller of
+        the flight has left the token is cancelled so the engine stops early.
+        """
+        flight = self._inflight.get(key)
+        shared = flight is not None
+        if shared:
+            COALESCED_REQUESTS.inc(self.route)
+        else:
+            flight = _Flight(asyncio.ensure_future(self._call(gate, fn, args)), cancel)
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda t: self._done(key, t))
+
+        flight.waiters += 1
+        try:
+            # shield: one caller going away doesn't cancel the work the others wait for
+            if disconnected is None:
+                return await asyncio.shield(flight.task), shared
+            return await wait_unless_disconnected(flight.task, disconnected), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and flight.cancel is not None and not flight.task.done():
+                # Nobody left to answer: stop the engine (or the wait for a slot), and
+                # let a new identical request start afresh instead of joining this one
+                flight.cancel.cancel("disconnected")
+                flight.task.cancel()
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+    @staticmethod
+    async def _call(gate, fn, args):
+        if gate is None:
+            return await run_in_threadpool(fn, *args)
+        async with gate:
+            return await run_in_threadpool(fn, *args)
+
+    def _done(self, key, task):
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception() # retrieved, even if every caller went away
@@ -0,0 +1,208 @@
+import math
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+class GridPyramid:
+    """
+    Spatial index over node x/y for viewport queries.
+
+    Coordinates are normalized to the bounding box and bucketed into a 2^F x 2^F grid
+    (about 4 nodes per finest cell). Every coarser level l (2^l x 2^l cells) keeps
+    per-cell node counts / centroids and the aggregated edges between cells, so a
+    zoomed-out query is answered from a level with at most max_nodes cells in view:
+    its cost depends on max_nodes, not on the size of the graph.
+    """
+
+    MAX_LEVEL = 10
+
+    def __init__(self, G):
+        self.nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        self.x = np.array([G.nodes[v].get('x', 0) for v in self.nodes], dtype=np.float64)
+        self.y = np.array([G.nodes[v].get('y', 0) for v in self.nodes], dtype=np.float64)
+
+        edges = list(G.edges(data='weight', default=1))
+        self.src = np.array([index[u] for u, _, _ in edges], dtype=np.int64)
+        self.dst = np.array([index[v] for _, v, _ in edges], dtype=np.int64)
+        self.weight = np.array([w for _, _, w in edges], dtype=np.float64)
+        self.directed = G.is_directed()
+
+        self.x0, self.x1 = (float(self.x.min()), float(self.x.max())) if n else (0.0, 1.0)
+        self.y0, self.y1 = (float(self.y.min()), float(self.y.max())) if n else (0.0, 1.0)
+        self.finest = min(self.MAX_LEVEL, max(0, math.ceil(math.log(max(n, 1) / 4, 4)))) if n > 4 else 0
+
+        size = 1 << self.finest
+        self.cx = self._cell(self.x, self.x0, self.x1, size)
+        self.cy = self._cell(self.y, self.y0, self.y1, size)
+
+        # Finest level: nodes sorted by cell so a cell's nodes are one slice
+        fine_key = self.cx * size + self.cy
+        self.order = np.argsort(fine_key, kind='stable')
+        self.fine_keys = fine_key[self.order]
+
+        # Edge ids grouped by source and by target, so a detail query only touches
+        # the edges of visible nodes
+        self.out_order, self.out_offsets = self._group(self.src, n)
+        self.in_order, self.in_offsets = self._group(self.dst, n)
+
+        self.levels = [self._build_level(level) for level in range(self.finest + 1)]
+
+    @staticmethod
+    def _group(endpoints, n):
+        order = np.argsort(endpoints, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(endpoints, minlength=n), out=offsets[1:])
+        return order, offsets
+
+    @staticmethod
+    def _cell(values, lo, hi, size):
+        span = (hi - lo) or 1.0
+        return np.clip(((values - lo) / span * size).astype(np.int64), 0, size - 1)
+
+    def _build_level(self, level):
+        shift = self.finest - level
+        size = 1 << level
+        key = (self.cx >> shift) * size + (self.cy >> shift)
+
+        keys, inverse = np.unique(key, return_inverse=True)
+        counts = np.bincount(inverse)
+        cells = {
+            "keys": keys,
+            "count": counts,
+            "x": np.bincount(inverse, weights=self.x) / counts,
+            "y": np.bincount(inverse, weights=self.y) / counts,
+        }
+
+        # Aggregate edges between different cells: (count, lightest weight) per cell pair
+        a, b = key[self.src], key[self.dst]
+        if not self.directed:
+            a, b = np.minimum(a, b), np.maximum(a, b)
+        cross = a != b
+        pair = a[cross] * (size * size) + b[cross]
+        weights = self.weight[cross]
+        if len(pair):
+            order = np.argsort(pair, kind='stable')
+            pair, weights = pair[order], weights[order]
+            pairs, starts = np.unique(pair, return_index=True)
+            cells["edge_a"] = pairs // (size * size)
+            cells["edge_b"] = pairs % (size * size)
+            cells["edge_count"] = np.diff(np.append(starts, len(pair)))
+            cells["edge_weight"] = np.minimum.reduceat(weights, starts)
+        else:
+            empty = np.array([], dtype=np.int64)
+            cells.update(edge_a=empty, edge_b=empty, edge_count=empty, edge_weight=np.array([]))
+        return cells
+
+    def _cell_range(self, lo, hi, axis_lo, axis_hi, size):
+        span = (axis_hi - axis_lo) or 1.0
+        i0 = int(np.clip(math.floor((lo - axis_lo) / span * size), 0, size - 1))
+        i1 = int(np.clip(math.floor((hi - axis_lo) / span * size), 0, size - 1))
+        return i0, i1
+
+    def query(self, x0, y0, x1, y1, max_nodes=500):
+        """
+        Nodes and edges inside the rectangle. Returns real nodes when few enough are
+        visible, otherwise super-nodes (cells) of the finest level that fits max_nodes.
+
+        In both modes every edge with at least one endpoint in view is returned, so
+        lines leaving the view still show, and its other endpoint is listed in nodes
+        with "outside": true, so every edge refers to nodes in the response.
+        max_nodes bounds the nodes in view; outside ones come on top.
+        """
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+
+        # Viewport entirely outside the graph's bounding box
+        if x1 < self.x0 or x0 > self.x1 or y1 < self.y0 or y0 > self.y1 or not self.nodes:
+            return {"level": None, "clustered": False, "nodes": [], "edges": []}
+
+        # Deepest level whose visible cell count fits the budget
+        level = 0
+        for l in range(self.finest + 1):
+            size = 1 << l
+            ix0, ix1 = self._cell_range(x0, x1, self.x0, self.x1, size)
+            iy0, iy1 = self._cell_range(y0, y1, self.y0, self.y1, size)
+            if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > max_nodes:
+                break
+            level = l
+
+        if level == self.finest:
+            detail = self._detail(x0, y0, x1, y1, max_nodes)
+            if detail is not None:
+                return detail
+        return self._clusters(level, x0, y0, x1, y1)
+
+    def _detail(self, x0, y0, x1, y1, max_nodes):
+        size = 1 << self.finest
+        ix0, ix1 = self._cell_range(x0, x1, self.x0, self.x1, size)
+        iy0, iy1 = self._cell_range(y0, y1, self.y0, self.y1, size)
+
+        picked = []
+        total = 0
+        for ix in range(ix0, ix1 + 1):
+            lo = np.searchsorted(self.fine_keys, ix * size + iy0, side='left')
+            hi = np.searchsorted(self.fine_keys, ix * size + iy1, side='right')
+            candidates = self.order[lo:hi]
+            inside = candidates[(self.x[candidates] >= x0) & (self.x[candidates] <= x1) &
+                                (self.y[candidates] >= y0) & (self.y[candidates] <= y1)]
+            total += len(inside)
+            if total > max_nodes:
+                return None
+            picked.append(inside)
+
+        visible = np.concatenate(picked) if picked else np.array([], dtype=np.int64)
+        # Edges with at least one visible endpoint, so lines leaving the view still show
+        edge_ids = [self.out_order[self.out_offsets[i]:self.out_offsets[i + 1]] for i in visible.tolist()]
+        edge_ids += [self.in_order[self.in_offsets[i]:self.in_offsets[i + 1]] for i in visible.tolist()]
+        edge_ids = np.unique(np.concatenate(edge_ids)) if edge_ids else np.array([], dtype=np.int64)
+        outside = np.setdiff1d(np.concatenate((self.src[edge_ids], self.dst[edge_ids])), visible)
+
+        return {
+            "level": self.finest,
+            "clustered": False,
+            "nodes": [
+                {"id": self.nodes[i], "x": float(self.x[i]), "y": float(self.y[i])}
+                for i in visible.tolist()
+            ] + [
+                {"id": self.nodes[i], "x": float(self.x[i]), "y": float(self.y[i]), "outside": True}
+                for i in outside.tolist()
+            ],
+            "edges": [
+                {"source": self.nodes[a], "target": self.nodes[b], "weight": w}
+                for a, b, w in zip(self.src[edge_ids].tolist(), self.dst[edge_ids].tolist(), self.weight[edge_ids].tolist())
+            ],
+        }
+
+    def _clusters(self, level, x0, y0, x1, y1):
+        cells = self.levels[level]
+        size = 1 << level
+        ix0, ix1 = self._cell_range(x0, x1, self.x0, self.x1, size)
+        iy0, iy1 = self._cell_range(y0, y1, self.y0, self.y1, size)
+
+        cx, cy = cells["keys"] // size, cells["keys"] % size
+        in_view = (cx >= ix0) & (cx <= ix1) & (cy >= iy0) & (cy <= iy1)
+
+        def cell_nodes(picked, **extra):
+            return [
+                {"id": f"cell:{level}:{k}", "x": float(x), "y": float(y), "count": int(c), **extra}
+                for k, x, y, c in zip(cells["keys"][picked].tolist(), cells["x"][picked].tolist(),
+                                      cells["y"][picked].tolist(), cells["count"][picked].tolist())
+            ]
+
+        visible_keys = cells["keys"][in_view]
+        edge_mask = np.isin(cells["edge_a"], visible_keys) | np.isin(cells["edge_b"], visible_keys)
+        outside_keys = np.setdiff1d(np.concatenate((cells["edge_a"][edge_mask], cells["edge_b"][edge_mask])), visible_keys)
+        # keys are sorted (np.unique), so the outside cells are found by binary search
+        nodes = cell_nodes(in_view) + cell_nodes(np.searchsorted(cells["keys"], outside_keys), outside=True)
+        edges = [
+            {"source": f"cell:{level}:{a}", "target": f"cell:{level}:{b}", "weight": w, "count": c}
+            for a, b, c, w in zip(cells["edge_a"][edge_mask].tolist(), cells["edge_b"][edge_mask].tolist(),
+                                  cells["edge_count"][edge_mask].tolist(), cells["edge_weight"][edge_mask].tolist())
+        ]
+
+        return {"level": level, "clustered": True, "nodes": nodes, "edges": edges}
@@ -9,6 +9,13 @@ let endNode = null;
 let animationSteps = [];
 let isAnimating = false;
 let animationSpeed = 100;
+const MAX_ANIMATION_STEPS = 2000;
+const LABEL_NODE_LIMIT = 150; // Above this many visible nodes, ids / weights / d= tags are skipped
+
+// Zoom / pan: node canvasX/Y stay in unzoomed canvas space, drawing goes through this transform
+const view = { scale: 1, x: 0, y: 0 };
+const MIN_SCALE = 0.2, MAX_SCALE = 20;
+let lastStepState = null; // redrawn when the view changes
 
 // Config
 const NODE_RADIUS = 15;
@@ -29,6 +36,47 @@ const COLORS = {
 resizeCanvas();
 window.addEventListener('resize', resizeCanvas);
 
+// Wheel zooms around the cursor, drag pans, double click resets
+canvas.addEventListener('wheel', (e) => {
+    e.preventDefault();
+    const factor = e.deltaY < 0 ? 1.15 : 1 / 1.15;
+    const scale = Math.min(MAX_SCALE, Math.max(MIN_SCALE, view.scale * factor));
+    const rect = canvas.getBoundingClientRect();
+    const mx = e.clientX - rect.left, my = e.clientY - rect.top;
+    view.x = mx - (mx - view.x) * (scale / view.scale);
+    view.y = my - (my - view.y) * (scale / view.scale);
+    view.scale = scale;
+    drawGraph(lastStepState);
+}, { passive: false });
+
+let dragFrom = null;
+canvas.addEventListener('mousedown', (e) => { dragFrom = { x: e.clientX - view.x, y: e.clientY - view.y }; });
+window.addEventListener('mouseup', () => { dragFrom = null; });
+canvas.addEventListener('mousemove', (e) => {
+    if (!dragFrom) return;
+    view.x = e.clientX - dragFrom.x;
+    view.y = e.clientY - dragFrom.y;
+    drawGraph(lastStepState);
+});
+canvas.addEventListener('dblclick', () => { resetView(); drawGraph(lastStepState); });
+
+function resetView() {
+    view.scale = 1;
+    view.x = 0;
+    view.y = 0;
+}
+
+// Visible part of the unzoomed canvas space, padded so half-visible nodes and labels still draw
+function visibleRect() {
+    const pad = NODE_RADIUS * 1.2 + 20;
+    return {
+        x0: -view.x / view.scale - pad,
+        y0: -view.y / view.scale - pad,
+        x1: (canvas.width - view.x) / view.scale + pad,
+        y1: (canvas.height - view.y) / view.scale + pad
+    };
+}
+
 // Interaction listeners for sliders
 document.getElementById('numNodes').addEventListener('input', (e) => {
     document.getElementById('nodesValue').innerText = e.target.value;
@@ -54,7 +102,7 @@ function log(msg) {
     console.log(`[SHORTEST-PATH]: ${msg}`);
 }
 
-const ALL_ALGOS = ["Dijkstra", "Bellman-Ford", "Floyd-Warshall", "Uniform Cost Search", "A*"];
+const ALL_ALGOS = ["Dijkstra", "Bellman-Ford", "Floyd-Warshall", "Uniform Cost Search", "A*", "K-Shortest Paths"];
 
 // Sidebar Event Listeners
 document.getElementById('btnGenerate').addEventListener('click', generateGraph);
@@ -114,6 +162,8 @@ async function generateGraph(nodesOrEvent = null, densityParam = null, directedP
 
     // Clear graph before generating
     resizeCanvas();
+    resetView();
+    lastStepState = null;
     graph = null;
     ctx.clearRect(0, 0, canvas.width, canvas.height);
 
@@ -122,7 +172,7 @@ async function generateGraph(nodesOrEvent = null, densityParam = null, directedP
     try {
         const res = await fetch('/api/generate-graph', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Accept': BINARY_ACCEPT },
             body: JSON.stringify({
                 num_nodes: parseInt(numNodes),
                 density: parseFloat(density),
@@ -130,7 +180,7 @@ async function generateGraph(nodesOrEvent = null, densityParam = null, directedP
             })
         });
 
-        graph = await res.json();
+        graph = await readGraph(res);
         normalizeGraphCoords();
 
         // 1. Source to 1 Destination (0 -> Last)
@@ -214,18 +264,52 @@ function normalizeGraphCoords() {
     });
 }
 
+function pathEdgeKeys(parents) {
+    // "u->v" keys of the path edges, backtracking from endNode
+    const keys = new Set();
+    if (!parents) return keys;
+    let curr = endNode;
+    while (curr !== startNode && curr !== null && parents[curr] !== undefined) {
+        const p = parents[curr];
+        if (p === null || keys.size > graph.nodes.length) break; // Safety break
+        keys.add(`${p}->${curr}`);
+        curr = p;
+    }
+    return keys;
+}
+
 function drawGraph(stepState = null) {
+    lastStepState = stepState;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
     ctx.fillStyle = COLORS.bg;
     ctx.fillRect(0, 0, canvas.width, canvas.height);
 
     if (!graph) return;
 
+    // Per-frame lookups, so drawing stays O(V + E) instead of O(V * E)
+    const nodeById = new Map(graph.nodes.map(n => [n.id, n]));
+    const pathEdges = stepState ? pathEdgeKeys(stepState.parents) : new Set();
+    const frontier = stepState ? new Set(stepState.frontier) : null;
+    const visited = stepState ? new Set(stepState.visited) : null;
+
+    // Viewport culling: only nodes inside the visible rectangle, and edges whose
+    // bounding box touches it, are drawn
+    const r = visibleRect();
+    const visibleNodes = graph.nodes.filter(n =>
+        n.canvasX >= r.x0 && n.canvasX <= r.x1 && n.canvasY >= r.y0 && n.canvasY <= r.y1);
+    // Level of detail: weight boxes and d= tags are unreadable with many nodes on screen
+    const showLabels = visibleNodes.length <= LABEL_NODE_LIMIT;
+
+    ctx.setTransform(view.scale, 0, 0, view.scale, view.x, view.y);
+
     // Draw Edges
     graph.edges.forEach(edge => {
-        const u = graph.nodes.find(n => n.id === edge.source);
-        const v = graph.nodes.find(n => n.id === edge.target);
+        const u = nodeById.get(edge.source);
+        const v = nodeById.get(edge.target);
 
         if (!u || !v) return;
+        if (Math.max(u.canvasX, v.canvasX) < r.x0 || Math.min(u.canvasX, v.canvasX) > r.x1 ||
+            Math.max(u.canvasY, v.canvasY) < r.y0 || Math.min(u.canvasY, v.canvasY) > r.y1) return;
 
         ctx.beginPath();
         ctx.moveTo(u.canvasX, u.canvasY);
@@ -238,43 +322,9 @@ function drawGraph(stepState = null) {
         ctx.strokeStyle = COLORS.edge;
         ctx.lineWidth = 1;
 
-        // Highlight edges in the shortest path
-        // Highlight edges in the shortest path
-        let isInPath = false;
-        if (stepState && stepState.parents) {
-            // Strict Path Highlighting: Backtrack from EndNode to StartNode
-            // Only highlight if this edge matches the parent relationship
-
-            // Check if endNode is reached or we are visualizing a path
-            // For general stepState, we might want to show the tree.
-            // But user requested "wrong path" fixed.
-            // So we usually want to highlight the path found SO FAR to current_node or to end_node if done.
-
-            // Let's assume we want to highlight path to endNode if it has a parent,
-            // or maybe path to current_node? 
-            // Typically in these viz, we want final path yellow.
-            // Let's backtrack from endNode.
-
-            let curr = endNode;
-            while (curr !== startNode && curr !== null && stepState.parents[curr] !== undefined) {
-                const p = stepState.parents[curr];
-                if (p === null) break;
-
-                // Check if this edge is (p -> curr)
-                if (edge.source === p && edge.target === curr) {
-                    isInPath = true;
-                }
-                // Undirected check
-                if (!graph.directed && edge.source === curr && edge.target === p) {
-                    isInPath = true;
-                }
-
-                curr = p;
-
-                // Safety break
-                if (curr === startNode) break;
-            }
-        }
+        // Highlight edges in the shortest path (backtracked from endNode once per frame)
+        const isInPath = pathEdges.has(`${edge.source}->${edge.target}`) ||
+            (!graph.directed && pathEdges.has(`${edge.target}->${edge.source}`));
 
         if (isInPath) {
             ctx.strokeStyle = '#FFFF00'; // Yellow for path
@@ -283,25 +333,27 @@ function drawGraph(stepState = null) {
 
         ctx.stroke();
 
-        // Draw Weight (Enhanced Readability)
-        const midX = (u.canvasX + v.canvasX) / 2;
-        const midY = (u.canvasY + v.canvasY) / 2;
+        if (showLabels) {
+            // Draw Weight (Enhanced Readability)
+            const midX = (u.canvasX + v.canvasX) / 2;
+            const midY = (u.canvasY + v.canvasY) / 2;
 
-        ctx.fillStyle = '#000'; // Black background
-        ctx.fillRect(midX - 6, midY - 6, 12, 12); // Square Box
+            ctx.fillStyle = '#000'; // Black background
+            ctx.fillRect(midX - 6, midY - 6, 12, 12); // Square Box
 
-        ctx.strokeStyle = '#333';
-        ctx.strokeRect(midX - 6, midY - 6, 12, 12); // Border
+            ctx.strokeStyle = '#333';
+            ctx.strokeRect(midX - 6, midY - 6, 12, 12); // Border
 
-        ctx.fillStyle = '#00FFFF'; // Paccyan text
-        ctx.font = 'bold 10px Roboto Mono';
-        ctx.textAlign = 'center';
-        ctx.textBaseline = 'middle';
-        ctx.fillText(edge.weight, midX, midY);
+            ctx.fillStyle = '#00FFFF'; // Paccyan text
+            ctx.font = 'bold 10px Roboto Mono';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'middle';
+            ctx.fillText(edge.weight, midX, midY);
+        }
     });
 
     // Draw Nodes
-    graph.nodes.forEach(node => {
+    visibleNodes.forEach(node => {
         let color = COLORS.nodeFill;
         let borderColor = COLORS.node;
         let textColor = '#fff'; // Default white text
@@ -312,9 +364,9 @@ function drawGraph(stepState = null) {
                 borderColor = '#FFFFFF';
                 color = '#FFFF00'; // Active
                 textColor = '#000';
-            } else if (stepState.frontier.includes(node.id)) {
+            } else if (frontier.has(node.id)) {
                 borderColor = '#FFFFFF'; // Blink?
-            } else if (stepState.visited.includes(node.id)) {
+            } else if (visited.has(node.id)) {
                 color = COLORS.visited;
             }
         }
@@ -343,6 +395,7 @@ function drawGraph(stepState = null) {
         ctx.stroke();
 
         if (isStart || isEnd) textColor = '#000';
+        if (!showLabels) return;
 
         // ID
         ctx.fillStyle = textColor;
@@ -369,6 +422,7 @@ function drawGraph(stepState = null) {
         ctx.font = '9px Roboto Mono';
         ctx.fillText(distText, node.canvasX, node.canvasY - 18);
     });
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
 
     if (stepState) {
         document.getElementById('visitedCount').innerText = stepState.visited.length;
@@ -447,6 +501,12 @@ function drawGhost(x, y) {
     }
 }
 
+// Paths for K-Shortest Paths, kept within the API's 1..50
+function selectedK() {
+    const k = parseInt(document.getElementById('kInput').value, 10);
+    return Number.isFinite(k) ? Math.min(50, Math.max(1, k)) : 5;
+}
+
 async function runAlgorithm() {
     if (!graph) {
         log("No graph generated!");
@@ -461,17 +521,20 @@ async function runAlgorithm() {
         algorithm: algo,
         start_node: startNode,
         end_node: endNode,
-        graph: graph
+        graph: graph,
+        max_steps: MAX_ANIMATION_STEPS, // server samples long runs down to this
+        sampling: "events",
+        k: selectedK()
     };
 
     try {
         const res = await fetch('/api/run-algorithm', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Accept': BINARY_ACCEPT },
             body: JSON.stringify(payload)
         });
 
-        const data = await res.json();
+        const data = await readSteps(res);
 
         if (data.steps) {
             animationSteps = data.steps;
@@ -508,11 +571,13 @@ async function runAllAlgorithms() {
                 algorithm: algo,
                 start_node: startNode,
                 end_node: endNode,
-                graph: graph
+                graph: graph,
+                k: selectedK()
             };
 
+            // Result-only endpoint: no animation steps to download
             const start = performance.now();
-            const res = await fetch('/api/run-algorithm', {
+            const res = await fetch('/api/shortest-path', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(payload)
@@ -520,11 +585,9 @@ async function runAllAlgorithms() {
             const data = await res.json();
             const end = performance.now();
 
-            if (data.steps) {
-                // Find last step
-                const lastStep = data.steps[data.steps.length - 1];
-                const cost = lastStep.distances[endNode];
-                const expanded = lastStep.visited.length;
+            if (res.ok) {
+                const cost = data.cost;
+                const expanded = data.nodes_expanded;
                 const time = (end - start).toFixed(0);
 
                 const finalCost = (cost === "Infinity" || cost === Infinity) ? "∞" : Number(cost).toFixed(1);
@@ -553,6 +616,11 @@ async function runAllAlgorithms() {
     loading.classList.add('hidden');
 }
 
+function stepAt(i) {
+    // Binary responses decode steps on demand (see StepStream)
+    return animationSteps.get ? animationSteps.get(i) : animationSteps[i];
+}
+
 function startAnimation() {
     isAnimating = true;
     let index = 0;
@@ -563,7 +631,7 @@ function startAnimation() {
 
             // Show final state with path highlighted
             if (animationSteps.length > 0) {
-                const finalStep = animationSteps[animationSteps.length - 1];
+                const finalStep = stepAt(animationSteps.length - 1);
                 drawGraph(finalStep);
                 document.getElementById('statusText').innerText = "COMPLETE";
 
@@ -582,7 +650,7 @@ function startAnimation() {
             return;
         }
 
-        const step = animationSteps[index];
+        const step = stepAt(index);
         drawGraph(step);
         log(step.description);
 
@@ -0,0 +1,129 @@
+// Decoders for the binary responses described in app/wire.py.
+// All sections are little-endian and 8-byte aligned, so they are viewed in place.
+
+const BINARY_MEDIA_TYPE = 'application/x-shortest-path-binary';
+const BINARY_ACCEPT = `${BINARY_MEDIA_TYPE}, application/json`;
+
+function isBinary(res) {
+    return (res.headers.get('Content-Type') || '').startsWith(BINARY_MEDIA_TYPE);
+}
+
+class SectionReader {
+    constructor(buffer, offset) {
+        this.buffer = buffer;
+        this.offset = offset;
+    }
+
+    take(ArrayType, length) {
+        const arr = new ArrayType(this.buffer, this.offset, length);
+        this.offset += Math.ceil(arr.byteLength / 8) * 8;
+        return arr;
+    }
+}
+
+function checkMagic(view, magic) {
+    const got = String.fromCharCode(view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3));
+    if (got !== magic) throw new Error(`Unexpected binary payload ${got}`);
+}
+
+function decodeGraph(buffer) {
+    const view = new DataView(buffer);
+    checkMagic(view, 'SPG1');
+    const directed = view.getUint32(4, true) === 1;
+    const n = view.getUint32(8, true);
+    const m = view.getUint32(12, true);
+
+    const r = new SectionReader(buffer, 16);
+    const x = r.take(Float64Array, n);
+    const y = r.take(Float64Array, n);
+    const weight = r.take(Float64Array, m);
+    const ids = r.take(Int32Array, n);
+    const source = r.take(Int32Array, m);
+    const target = r.take(Int32Array, m);
+
+    const nodes = new Array(n);
+    for (let i = 0; i < n; i++) nodes[i] = { id: ids[i], x: x[i], y: y[i] };
+    const edges = new Array(m);
+    for (let e = 0; e < m; e++) edges[e] = { source: ids[source[e]], target: ids[target[e]], weight: weight[e] };
+    return { nodes, edges, directed };
+}
+
+class StepStream {
+    // Delta-encoded steps; get(i) replays changes, forward from the last step when possible
+    constructor(buffer) {
+        const view = new DataView(buffer);
+        checkMagic(view, 'SPS1');
+        const h = i => view.getUint32(4 + i * 4, true);
+        const n = h(0), count = h(1), nDist = h(2), nPar = h(3), nVis = h(4), nFront = h(5), textLen = h(6);
+
+        const r = new SectionReader(buffer, 32);
+        this.ids = r.take(Int32Array, n);
+        this.distStart = r.take(Uint32Array, count + 1);
+        this.parStart = r.take(Uint32Array, count + 1);
+        this.visStart = r.take(Uint32Array, count + 1);
+        this.frontStart = r.take(Uint32Array, count + 1);
+        this.current = r.take(Int32Array, count);
+        this.distValue = r.take(Float64Array, nDist);
+        this.distIndex = r.take(Uint32Array, nDist);
+        this.parValue = r.take(Int32Array, nPar);
+        this.parIndex = r.take(Uint32Array, nPar);
+        this.visToggle = r.take(Uint32Array, nVis);
+        this.frontToggle = r.take(Uint32Array, nFront);
+        const text = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, r.offset, textLen)));
+        this.descriptions = text.descriptions;
+        this.extras = text.extras;
+        // The rest of the JSON body (partial, plan, timings), when the server set it
+        this.meta = {};
+        for (const key of ['partial', 'plan', 'timings']) {
+            if (key in text) this.meta[key] = text[key];
+        }
+
+        this.length = count;
+        this.n = n;
+        this.reset();
+    }
+
+    reset() {
+        this.cursor = -1;
+        this.dist = new Float64Array(this.n).fill(Infinity);
+        this.parents = new Int32Array(this.n).fill(-1);
+        this.visited = new Uint8Array(this.n);
+        this.frontier = new Uint8Array(this.n);
+    }
+
+    apply(s) {
+        for (let k = this.distStart[s]; k < this.distStart[s + 1]; k++) this.dist[this.distIndex[k]] = this.distValue[k];
+        for (let k = this.parStart[s]; k < this.parStart[s + 1]; k++) this.parents[this.parIndex[k]] = this.parValue[k];
+        for (let k = this.visStart[s]; k < this.visStart[s + 1]; k++) this.visited[this.visToggle[k]] ^= 1;
+        for (let k = this.frontStart[s]; k < this.frontStart[s + 1]; k++) this.frontier[this.frontToggle[k]] ^= 1;
+    }
+
+    get(i) {
+        if (i < this.cursor) this.reset();
+        while (this.cursor < i) this.apply(++this.cursor);
+
+        const ids = this.ids;
+        const step = { visited: [], frontier: [], distances: {}, parents: {} };
+        for (let k = 0; k < this.n; k++) {
+            const id = ids[k];
+            step.distances[id] = this.dist[k];
+            step.parents[id] = this.parents[k] >= 0 ? ids[this.parents[k]] : null;
+            if (this.visited[k]) step.visited.push(id);
+            if (this.frontier[k]) step.frontier.push(id);
+        }
+        step.current_node = this.current[i] >= 0 ? ids[this.current[i]] : null;
+        step.description = this.descriptions[i];
+        return Object.assign(step, this.extras[i] || {});
+    }
+}
+
+async function readGraph(res) {
+    return isBinary(res) ? decodeGraph(await res.arrayBuffer()) : res.json();
+}
+
+async function readSteps(res) {
+    // Same shape as the JSON body: { steps, partial?, plan?, timings? }, errors stay JSON
+    if (!isBinary(res)) return res.json();
+    const steps = new StepStream(await res.arrayBuffer());
+    return Object.assign({ steps }, steps.meta);
+}
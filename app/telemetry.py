@@ -0,0 +1,301 @@
+"""
+In-process metrics registry exported in the Prometheus text format at /metrics.
+
+Updates are lock-free: every thread writes to its own shard (a plain dict reached
+through threading.local), and a scrape sums the shards. The event loop thread and
+the threadpool workers therefore never contend; the only lock is taken once per
+thread per metric, when its shard is created.
+"""
+import bisect
+import contextlib
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cached lookups (~0.1 ms) up to Floyd-Warshall on big graphs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STEP_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# Graph sizes are bucketed into a label so latency can be split by size without
+# one time series per node count
+SIZE_CLASSES = (100, 1000, 10000, 100000)
+
+def size_class(num_nodes):
+    for limit in SIZE_CLASSES:
+        if num_nodes <= limit:
+            return f"<={limit}"
+    return f">{SIZE_CLASSES[-1]}"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra=""):
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = {}
+            with self._shards_lock:
+                self._shards.append(values)
+            self._local.values = values
+            return values
+
+    def _check(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        self._check(labels)
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self):
+        totals = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self):
+        lines = self.header()
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class Gauge(Counter):
+    """Up/down value (in-flight requests). Shards of inc() and dec() sum to the current value."""
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        self._check(labels)
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # Per-bucket (non-cumulative) counts, then +Inf, sum and count
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self):
+        totals = {}
+        for shard in list(self._shards):
+            for labels, series in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(series))
+                for i, v in enumerate(series):
+                    total[i] += v
+        return totals
+
+    def render(self):
+        lines = self.header()
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        for labels, series in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "shortest_path_http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+HTTP_LATENCY = registry.histogram(
+    "shortest_path_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_IN_FLIGHT = registry.gauge(
+    "shortest_path_http_requests_in_flight", "HTTP requests being served, by path prefix.", ("prefix",))
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "shortest_path_http_response_size_bytes", "Response body size.", ("route",), SIZE_BUCKETS)
+
+ALGORITHM_RUNS = registry.counter(
+    "shortest_path_algorithm_runs_total", "Algorithm runs by route, algorithm and graph size class.", ("route", "algorithm", "size"))
+ALGORITHM_LATENCY = registry.histogram(
+    "shortest_path_algorithm_duration_seconds", "Time spent running an algorithm.", ("route", "algorithm", "size"))
+ALGORITHM_STEPS = registry.histogram(
+    "shortest_path_algorithm_steps", "Steps an algorithm run produced.", ("route", "algorithm"), STEP_BUCKETS)
+
+PHASE_LATENCY = registry.histogram(
+    "shortest_path_request_phase_seconds", "Time per request phase (parse, build_graph, run, sanitize, encode).", ("route", "phase", "size"))
+
+COALESCED_REQUESTS = registry.counter(
+    "shortest_path_coalesced_requests_total", "Requests that shared an identical in-flight computation.", ("route",))
+ADMISSION_DECISIONS = registry.counter(
+    "shortest_path_admission_decisions_total", "Cost-based admission outcomes (admitted, queued, downgraded, rejected, timed_out).", ("route", "decision"))
+
+def observe_run(route, algorithm, num_nodes, seconds, steps=None):
+    """Records one algorithm run (called by the routers around the engine loop)."""
+    size = size_class(num_nodes)
+    ALGORITHM_RUNS.inc(route, algorithm, size)
+    ALGORITHM_LATENCY.observe(seconds, route, algorithm, size)
+    if steps is not None:
+        ALGORITHM_STEPS.observe(steps, route, algorithm)
+
+class PhaseTimer:
+    """
+    Per-request phase timings, sent back as a Server-Timing header and aggregated
+    into PHASE_LATENCY. "parse" is everything from the request arriving (stamped by
+    TelemetryMiddleware) to the handler starting: body read, JSON decode, validation.
+    """
+
+    def __init__(self, route, request=None):
+        self.route = route
+        self.phases = {}
+        now = time.perf_counter()
+        arrived = request.scope.get(REQUEST_START_KEY) if request is not None else None
+        self.start = arrived if arrived is not None else now
+        if arrived is not None:
+            self.phases["parse"] = now - arrived
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def as_ms(self):
+        return {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+
+    def header(self):
+        parts = [f"{name};dur={ms}" for name, ms in self.as_ms().items()]
+        parts.append(f"total;dur={round((time.perf_counter() - self.start) * 1000, 3)}")
+        return ", ".join(parts)
+
+    def finish(self, response, num_nodes):
+        """Adds the Server-Timing header and records the phases. Returns the response."""
+        response.headers["Server-Timing"] = self.header()
+        size = size_class(num_nodes)
+        for name, seconds in self.phases.items():
+            PHASE_LATENCY.observe(seconds, self.route, name, size)
+        return response
+
+# Scope key where the middleware stamps the arrival time (perf_counter)
+REQUEST_START_KEY = "shortest_path.request_start"
+
+class TelemetryMiddleware:
+    """
+    Plain ASGI middleware (no per-request task or body buffering like BaseHTTPMiddleware).
+    Labels by the matched route template (/api/graphs/{graph_id}, not the raw path) so
+    ids don't blow up the number of series; unknown paths share the label "other".
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._prefixes = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = scope[REQUEST_START_KEY] = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        # The route is only known once the router has matched, so the in-flight gauge
+        # is keyed by path prefix instead (/api/graphs, /static/js, ...)
+        in_flight_key = self._prefix(scope)
+        HTTP_IN_FLIGHT.inc(in_flight_key)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(in_flight_key)
+            route = scope.get("route")
+            # Mounts (/static) and 404s have no route template: fall back to the prefix
+            template = getattr(route, "path", None)
+            if template is None:
+                template = in_flight_key
+            elif in_flight_key == "other":
+                # Routes from include_router() aren't listed on the app; learn them as they match
+                self._prefixes.add(_path_prefix(template))
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method, template, str(status))
+            HTTP_LATENCY.observe(time.perf_counter() - start, method, template)
+            HTTP_RESPONSE_SIZE.observe(size, template)
+
+    def _prefix(self, scope):
+        if self._prefixes is None:
+            # Prefixes of the app's own routes (more are learned from matches); anything else shares "other"
+            routes = getattr(getattr(scope.get("app"), "router", None), "routes", ())
+            self._prefixes = {_path_prefix(r.path) for r in routes if hasattr(r, "path")}
+        prefix = _path_prefix(scope.get("path", ""))
+        if prefix in self._prefixes:
+            return prefix
+        # Mounts (/static) match on their first segment only
+        first = prefix.split("/", 2)[:2]
+        return "/".join(first) if "/".join(first) in self._prefixes else "other"
+
+def _path_prefix(path):
+    """First two path segments: /api/run-algorithm, /api/graphs, /static/js."""
+    return "/" + "/".join(path.strip("/").split("/")[:2])
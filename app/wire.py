@@ -0,0 +1,198 @@
+"""
+Optional binary encoding for API responses, negotiated via the Accept header.
+
+Everything is little-endian and every section starts on an 8-byte boundary, so
+the browser can view sections in place with typed arrays (see StepStream /
+decodeGraph in static/js/wire.js). Infinity is stored as an IEEE float, no
+"Infinity" strings.
+
+Graph ("SPG1"):
+    header   magic, u32 directed, u32 n, u32 m
+    f64 x[n], f64 y[n], f64 weight[m]
+    i32 ids[n], i32 source[m], i32 target[m]   (source/target are node indices)
+
+Steps ("SPS1"): each step is stored as what changed since the previous one.
+    header   magic, u32 n, u32 steps, u32 dist_changes, u32 parent_changes,
+             u32 visited_toggles, u32 frontier_toggles, u32 text_bytes
+    i32 ids[n]
+    u32 dist_start[steps+1], parent_start[steps+1], visited_start[steps+1], frontier_start[steps+1]
+    i32 current[steps]                          (-1 = none)
+    f64 dist_value[dist_changes], u32 dist_index[dist_changes]
+    i32 parent_value[parent_changes], u32 parent_index[parent_changes]   (-1 = none)
+    u32 visited_toggle[visited_toggles]         (indices whose visited bit flips)
+    u32 frontier_toggle[frontier_toggles]       (same, for frontier membership)
+    utf-8 JSON {"descriptions": [...], "extras": [...]}   (extras: other step keys, or null)
+             plus the JSON body's other keys when set: "partial", "plan", "timings"
+"""
+import itertools
+import json
+import struct
+
+from fastapi import Request, Response
+
+from app.json_utils import sanitize_floats
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+BINARY_MEDIA_TYPE = "application/x-shortest-path-binary"
+
+STEP_KEYS = ("visited", "frontier", "current_node", "distances", "parents", "description")
+# Keys of a /api/run-algorithm JSON body besides "steps", carried in the SPS1 text section
+RUN_KEYS = ("partial", "plan", "timings")
+
+def wants_binary(request: Request):
+    return BINARY_MEDIA_TYPE in request.headers.get("accept", "")
+
+def binary_response(payload: bytes):
+    return Response(content=payload, media_type=BINARY_MEDIA_TYPE)
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, data):
+        data = data.tobytes() if isinstance(data, np.ndarray) else bytes(data)
+        self.parts.append(data)
+        self.size += len(data)
+        pad = -self.size % 8
+        if pad:
+            self.parts.append(b"\0" * pad)
+            self.size += pad
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+def encode_graph(G):
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = list(G.edges(data='weight', default=1))
+
+    out = _Writer()
+    out.add(b"SPG1" + struct.pack("<III", int(G.is_directed()), len(nodes), len(edges)))
+    out.add(np.array([G.nodes[v].get('x', 0) for v in nodes], dtype='<f8'))
+    out.add(np.array([G.nodes[v].get('y', 0) for v in nodes], dtype='<f8'))
+    out.add(np.array([w for _, _, w in edges], dtype='<f8'))
+    out.add(np.array(nodes, dtype='<i4'))
+    out.add(np.array([index[u] for u, _, _ in edges], dtype='<i4'))
+    out.add(np.array([index[v] for _, v, _ in edges], dtype='<i4'))
+    return out.getvalue()
+
+def encode_steps(steps, nodes, meta=None):
+    """
+    Delta-encodes the step dicts yielded by app/algorithms/* over the given node order.
+    meta: the rest of the JSON body (RUN_KEYS), so binary clients get the same answer.
+    """
+    nodes = list(nodes)
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    inf = float('inf')
+
+    prev_dist = np.full(n, inf)
+    prev_parents = np.full(n, -1, dtype=np.int64)
+    prev_visited = set()
+    prev_frontier = set()
+
+    dist_idx, dist_val, par_idx, par_val, vis_toggle, frontier = [], [], [], [], [], []
+    dist_start, par_start, vis_start, front_start = [0], [0], [0], [0]
+    current, descriptions, extras = [], [], []
+
+    for step in steps:
+        # map() with C-level dict lookups keeps this loop cheap for full-size states
+        dist = np.fromiter(map(step.get("distances", {}).get, nodes, itertools.repeat(inf)), dtype=np.float64, count=n)
+        parents = np.fromiter(map(index.get, map(step.get("parents", {}).get, nodes), itertools.repeat(-1)), dtype=np.int64, count=n)
+        visited = set(step.get("visited", ()))
+        in_frontier = set(step.get("frontier", ()))
+
+        changed = np.flatnonzero(dist != prev_dist)
+        dist_idx.append(changed)
+        dist_val.append(dist[changed])
+        changed = np.flatnonzero(parents != prev_parents)
+        par_idx.append(changed)
+        par_val.append(parents[changed])
+        vis_toggle.append(np.fromiter(map(index.__getitem__, visited ^ prev_visited), dtype=np.int64))
+        frontier.append(np.fromiter(map(index.__getitem__, in_frontier ^ prev_frontier), dtype=np.int64))
+
+        dist_start.append(dist_start[-1] + len(dist_idx[-1]))
+        par_start.append(par_start[-1] + len(par_idx[-1]))
+        vis_start.append(vis_start[-1] + len(vis_toggle[-1]))
+        front_start.append(front_start[-1] + len(frontier[-1]))
+        current.append(index.get(step.get("current_node"), -1))
+        descriptions.append(step.get("description", ""))
+        extra = {k: v for k, v in step.items() if k not in STEP_KEYS}
+        extras.append(extra or None)
+
+        prev_dist, prev_parents, prev_visited, prev_frontier = dist, parents, visited, in_frontier
+
+    def cat(chunks, dtype):
+        return np.concatenate(chunks).astype(dtype) if chunks else np.array([], dtype=dtype)
+
+    # Extras (e.g. K-Shortest "paths") are rare and small, so plain JSON is fine there
+    text = {"descriptions": descriptions, "extras": sanitize_floats(extras)}
+    text.update((key, value) for key, value in (meta or {}).items() if key in RUN_KEYS)
+    text = json.dumps(text).encode()
+
+    out = _Writer()
+    out.add(b"SPS1" + struct.pack("<7I", n, len(current), dist_start[-1], par_start[-1], vis_start[-1], front_start[-1], len(text)))
+    out.add(np.array(nodes, dtype='<i4'))
+    for starts in (dist_start, par_start, vis_start, front_start):
+        out.add(np.array(starts, dtype='<u4'))
+    out.add(np.array(current, dtype='<i4'))
+    out.add(cat(dist_val, '<f8'))
+    out.add(cat(dist_idx, '<u4'))
+    out.add(cat(par_val, '<i4'))
+    out.add(cat(par_idx, '<u4'))
+    out.add(cat(vis_toggle, '<u4'))
+    out.add(cat(frontier, '<u4'))
+    out.add(text)
+    return out.getvalue()
+
+def decode_steps(payload):
+    """Inverse of encode_steps, rebuilding the step dicts (Python clients / checks)."""
+    return decode_run(payload)["steps"]
+
+def decode_run(payload):
+    """An SPS1 payload as the JSON body it stands for: {"steps": [...]} plus any RUN_KEYS."""
+    n, count, n_dist, n_par, n_vis, n_front, text_len = struct.unpack_from("<7I", payload, 4)
+    offset = 32
+
+    def take(dtype, length):
+        nonlocal offset
+        arr = np.frombuffer(payload, dtype=dtype, count=length, offset=offset)
+        offset += arr.nbytes + (-arr.nbytes % 8)
+        return arr
+
+    ids = take('<i4', n).tolist()
+    dist_start, par_start, vis_start, front_start = (take('<u4', count + 1) for _ in range(4))
+    current = take('<i4', count)
+    dist_val, dist_idx = take('<f8', n_dist), take('<u4', n_dist)
+    par_val, par_idx = take('<i4', n_par), take('<u4', n_par)
+    vis_toggle, frontier = take('<u4', n_vis), take('<u4', n_front)
+    text = json.loads(bytes(payload[offset:offset + text_len]))
+
+    dist = np.full(n, float('inf'))
+    parents = np.full(n, -1, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    in_frontier = np.zeros(n, dtype=bool)
+    steps = []
+    for s in range(count):
+        a, b = dist_start[s], dist_start[s + 1]
+        dist[dist_idx[a:b]] = dist_val[a:b]
+        a, b = par_start[s], par_start[s + 1]
+        parents[par_idx[a:b]] = par_val[a:b]
+        visited[vis_toggle[vis_start[s]:vis_start[s + 1]]] ^= True
+        in_frontier[frontier[front_start[s]:front_start[s + 1]]] ^= True
+
+        step = {
+            "visited": [ids[i] for i in np.flatnonzero(visited).tolist()],
+            "frontier": [ids[i] for i in np.flatnonzero(in_frontier).tolist()],
+            "current_node": ids[current[s]] if current[s] >= 0 else None,
+            "distances": dict(zip(ids, dist.tolist())),
+            "parents": {node: (ids[p] if p >= 0 else None) for node, p in zip(ids, parents.tolist())},
+            "description": text["descriptions"][s],
+        }
+        if text["extras"][s]:
+            step.update(text["extras"][s])
+        steps.append(step)
+    return {"steps": steps, **{key: text[key] for key in RUN_KEYS if key in text}}
@@ -0,0 +1,97 @@
+"""
+Benchmark: cold import time of the API (python -X importtime).
+
+Each run is a fresh interpreter importing --module (default app.main). Reports the
+median total import time, the modules with the largest self time, and which heavy
+packages were really loaded at startup (lazy_import placeholders don't count).
+Exits with status 1 when the median exceeds --budget-ms or a --forbid package was
+imported eagerly, so a stray top-level `import networkx` shows up as a failure.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 7 --budget-ms 900 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("networkx", "numpy", "scipy", "pyvis", "multiprocessing")
+
+# Prints the heavy modules that are really imported (a LazyLoader module that was
+# never touched is still a _LazyModule)
+LOADED_PROBE = """
+import json, sys
+import {module}
+print(json.dumps([m for m in {heavy!r} if m in sys.modules and type(sys.modules[m]).__name__ != '_LazyModule']))
+"""
+
+def parse_importtime(stderr):
+    """[(name, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def run_once(module):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = parse_importtime(proc.stderr)
+    total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+    return total, rows
+
+def loaded_heavy(module, heavy):
+    proc = subprocess.run([sys.executable, "-c", LOADED_PROBE.format(module=module, heavy=tuple(heavy))],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=900, help="fail when the median import time is above this")
+    parser.add_argument("--forbid", nargs="*", default=list(HEAVY_MODULES), help="packages that must not be imported at startup")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules (self time) to list")
+    args = parser.parse_args()
+
+    totals = []
+    slowest = {}
+    for _ in range(args.runs):
+        total, rows = run_once(args.module)
+        totals.append(total)
+        for name, self_us, _, _ in rows:
+            slowest.setdefault(name, []).append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    top = sorted(((statistics.median(v) / 1000, name) for name, v in slowest.items()), reverse=True)[:args.top]
+    eager = loaded_heavy(args.module, args.forbid) if args.forbid else []
+
+    report = {
+        "module": args.module,
+        "python": sys.version.split()[0],
+        "runs_ms": [round(t / 1000, 1) for t in totals],
+        "median_ms": round(median_ms, 1),
+        "budget_ms": args.budget_ms,
+        "slowest_self_ms": [{"module": name, "ms": round(ms, 1)} for ms, name in top],
+        "eager_heavy_modules": eager,
+    }
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.1f} ms over the {args.budget_ms:g} ms budget")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    report["failures"] = failures
+
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
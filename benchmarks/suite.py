@@ -0,0 +1,251 @@
+"""
+Benchmark suite: every graph builder x every engine x sizes x seeds x trace levels.
+
+Engines come from both front-ends: the Streamlit ones in algorithms/ (they always
+build full states, so only the "full" trace level applies) and the API ones in
+app/algorithms/ (traced in full, sampled to --max-steps, or result-only).
+
+Per run it records wall time (best of --repeat, consuming every step), relaxations,
+steps yielded, queue counters (Streamlit engines) and peak traced memory (one extra
+run under tracemalloc). Output is
+JSON; --baseline compares against a previous output and exits with status 1 when
+a run got slower / did more work / used more memory than --tolerance allows.
+
+Usage:
+    python -m benchmarks.suite --sizes 50 200 --seeds 1 2 --output bench.json
+    python -m benchmarks.suite --sizes 50 200 --seeds 1 2 --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import collections
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from builders import (
+    generate_erdos_renyi,
+    generate_random_dag,
+    generate_negative_edge_dag_graph,
+    generate_dense_graph,
+    generate_sparse_chain,
+    generate_equal_weight_graph,
+    generate_grid_graph,
+)
+from algorithms import (run_dijkstra, run_bellman_ford, run_bfs_equal, run_dag_shortest, run_a_star, run_spfa,
+                        run_multi_source_dijkstra, run_multi_source_bfs, run_jps)
+from app.algorithms import ALGORITHMS, SPECIALIZED_ALGORITHMS, Tracer, StepSampler
+from app.algorithms.tracing import RELAX
+
+# size -> graph with ~size nodes (sparse ones at average out-degree ~4)
+BUILDERS = {
+    "erdos_renyi": lambda n, seed: generate_erdos_renyi(n, min(1.0, 4 / n), seed=seed),
+    "random_dag": lambda n, seed: generate_random_dag(n, min(1.0, 8 / n), seed=seed),
+    "negative_edges": lambda n, seed: generate_negative_edge_dag_graph(n, min(1.0, 8 / n), seed=seed),
+    "dense": lambda n, seed: generate_dense_graph(n, seed=seed),
+    "sparse_chain": lambda n, seed: generate_sparse_chain(n, seed=seed),
+    "equal_weight": lambda n, seed: generate_equal_weight_graph(n, min(1.0, 4 / n), seed=seed),
+    "grid": lambda n, seed: generate_grid_graph(max(1, math.isqrt(n)), max(1, math.isqrt(n)), seed=seed),
+    "uniform_grid": lambda n, seed: generate_grid_graph(max(1, math.isqrt(n)), max(1, math.isqrt(n)), weighted=False, seed=seed),
+}
+
+STREAMLIT_ENGINES = {
+    "Dijkstra": run_dijkstra,
+    "Bellman-Ford": run_bellman_ford,
+    "BFS (Unweighted)": run_bfs_equal,
+    "DAG Shortest Path": run_dag_shortest,
+    "A* (A-Star)": run_a_star,
+    "SPFA": run_spfa,
+    # Multi-source engines take a list of sources; the suite runs them from [start]
+    "Multi-Source Dijkstra": lambda G, start, end: run_multi_source_dijkstra(G, [start], end),
+    "Multi-Source BFS": lambda G, start, end: run_multi_source_bfs(G, [start], end),
+    "Jump Point Search": run_jps,
+}
+
+TRACE_LEVELS = ("full", "sampled", "result")
+
+# O(V^3) engines get slow fast; skipped above this many nodes
+NODE_LIMITS = {"app:Floyd-Warshall": 150}
+# Engines that only run on some builders' graphs (elsewhere they stop at their first step)
+ENGINE_BUILDERS = {"streamlit:Jump Point Search": {"uniform_grid"}}
+
+class _CountingMixin:
+    """Counts the events an API engine reports (RELAX = relaxations) whatever it keeps."""
+
+    def wants(self, kind):
+        self.kinds[kind] += 1
+        return super().wants(kind)
+
+class CountingTracer(_CountingMixin, Tracer):
+    def __init__(self, enabled):
+        super().__init__(enabled)
+        self.kinds = collections.Counter()
+
+class CountingSampler(_CountingMixin, StepSampler):
+    def __init__(self, max_steps):
+        super().__init__(max_steps, "events")
+        self.kinds = collections.Counter()
+
+def engines():
+    for name, fn in STREAMLIT_ENGINES.items():
+        yield f"streamlit:{name}", fn, ("full",)
+    for name, fn in ALGORITHMS.items():
+        yield f"app:{name}", fn, TRACE_LEVELS
+    # Only picked by "auto", on graphs they fit; elsewhere BFS still runs (inexactly) and
+    # DAG Shortest Path fails on cycles, which the report shows as an error
+    for name, fn in SPECIALIZED_ALGORITHMS.items():
+        yield f"app:{name}", fn, TRACE_LEVELS
+
+# Queue counters the Streamlit engines keep in their Metrics
+QUEUE_FIELDS = ("queue_pushes", "queue_pops", "stale_pops", "peak_queue", "nodes_settled")
+
+def run_once(engine_id, fn, G, start, end, trace, max_steps):
+    """Runs an engine to completion. Returns (relaxations, steps consumed, extra counters)."""
+    steps = 0
+    if engine_id.startswith("streamlit:"):
+        metrics = None
+        for _, metrics, _ in fn(G, start, end):
+            steps += 1
+        return metrics.relaxations, steps, {name: getattr(metrics, name) for name in QUEUE_FIELDS}
+
+    if trace == "sampled":
+        tracer = CountingSampler(max_steps)
+        for step in fn(G, start, end, tracer=tracer):
+            tracer.add(step)
+        steps = len(tracer.steps())
+    else:
+        tracer = CountingTracer(enabled=(trace == "full"))
+        for _ in fn(G, start, end, tracer=tracer):
+            steps += 1
+    return tracer.kinds[RELAX], steps, {}
+
+def measure(engine_id, fn, G, start, end, trace, repeat, max_steps, memory=True):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        relaxations, steps, extra = run_once(engine_id, fn, G, start, end, trace, max_steps)
+        best = min(best, time.perf_counter() - t0)
+
+    row = {"wall_s": round(best, 6), "relaxations": relaxations, "steps": steps, **extra}
+    if not memory:
+        return row
+
+    # Separate run: tracemalloc slows allocation down a lot, so it never touches the timings
+    tracemalloc.start()
+    try:
+        run_once(engine_id, fn, G, start, end, trace, max_steps)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    row["peak_kb"] = round(peak / 1024, 1)
+    return row
+
+def run_suite(builders, engine_filter, sizes, seeds, traces, repeat, max_steps, memory=True, log=None):
+    results = []
+    for builder in builders:
+        for n in sizes:
+            for seed in seeds:
+                G = BUILDERS[builder](n, seed)
+                nodes = sorted(G.nodes())
+                start, end = nodes[0], nodes[-1]
+
+                for engine_id, fn, levels in engines():
+                    if engine_filter and engine_id not in engine_filter and engine_id.split(":", 1)[1] not in engine_filter:
+                        continue
+                    if builder not in ENGINE_BUILDERS.get(engine_id, (builder,)):
+                        continue
+                    for trace in levels:
+                        if trace not in traces:
+                            continue
+                        row = {"builder": builder, "engine": engine_id, "nodes": G.number_of_nodes(),
+                               "edges": G.number_of_edges(), "size": n, "seed": seed, "trace": trace}
+                        if G.number_of_nodes() > NODE_LIMITS.get(engine_id, float('inf')):
+                            row["skipped"] = f"more than {NODE_LIMITS[engine_id]} nodes"
+                        else:
+                            try:
+                                row.update(measure(engine_id, fn, G, start, end, trace, repeat, max_steps, memory))
+                            except Exception as e: # e.g. DAG-only engine on a cyclic graph
+                                row["error"] = f"{type(e).__name__}: {e}"
+                        results.append(row)
+                        if log:
+                            log(row)
+    return results
+
+def run_key(row):
+    return (row["builder"], row["engine"], row["size"], row["seed"], row["trace"])
+
+def compare(results, baseline, tolerance, min_delta_s):
+    """
+    Regressions against a baseline run: wall time beyond tolerance (and at least
+    min_delta_s, to ignore timer noise), more relaxations, or more peak memory.
+    """
+    base = {run_key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = base.get(run_key(row))
+        if old is None or "wall_s" not in row or "wall_s" not in old:
+            continue
+        checks = (
+            ("wall_s", row["wall_s"] > old["wall_s"] * (1 + tolerance) and row["wall_s"] - old["wall_s"] >= min_delta_s),
+            ("relaxations", row["relaxations"] > old["relaxations"] * (1 + tolerance)),
+            ("peak_kb", "peak_kb" in row and "peak_kb" in old and row["peak_kb"] > old["peak_kb"] * (1 + tolerance)),
+        )
+        for field, regressed in checks:
+            if regressed:
+                regressions.append({
+                    "run": dict(zip(("builder", "engine", "size", "seed", "trace"), run_key(row))),
+                    "metric": field,
+                    "baseline": old[field],
+                    "current": row[field],
+                    "ratio": round(row[field] / old[field], 3) if old[field] else None,
+                })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--builders", nargs="+", default=list(BUILDERS), choices=list(BUILDERS))
+    parser.add_argument("--engines", nargs="+", default=None, help="engine ids (e.g. app:Dijkstra) or plain names; default all")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 200])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1])
+    parser.add_argument("--trace", nargs="+", default=list(TRACE_LEVELS), choices=TRACE_LEVELS)
+    parser.add_argument("--max-steps", type=int, default=200, help="step budget for the 'sampled' trace level")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run (much faster)")
+    parser.add_argument("--output", help="write the JSON report here (use it later as --baseline)")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.002, help="ignore wall time changes below this many seconds")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    def log(row):
+        if not args.quiet:
+            status = row.get("error") or row.get("skipped") or f"{row['wall_s'] * 1000:.2f} ms"
+            print(f"{row['builder']:>15} n={row['nodes']:<5} seed={row['seed']} {row['engine']:<28} {row['trace']:<8} {status}", file=sys.stderr)
+
+    results = run_suite(args.builders, set(args.engines or ()), args.sizes, args.seeds, set(args.trace),
+                        args.repeat, args.max_steps, not args.no_memory, log)
+    report = {
+        "config": vars(args),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import json
+import os
+import shutil
+import tempfile
+from lazy_import import lazy_import
+
+# Loaded on first use (SciPy inside matrix() / single_source()), so importing this
+# module costs nothing until a graph is actually compiled
+np = lazy_import("numpy")
+nx = lazy_import("networkx")
+
+# On-disk layout (a directory): manifest.json + one .npy per array, indexes under indexes/
+FORMAT_NAME = "shortest-path-compiled-graph"
+FORMAT_VERSION = 1
+CORE_ARRAYS = ("indptr", "indices", "weights", "node_ids")
+
+class CompiledGraph:
+    """
+    Array (CSR) form of a weighted graph for result-only queries on large inputs.
+
+    Nodes are numbered 0..n-1 internally; node_ids maps those back to the caller's ids
+    (sorted, so lookups are a binary search). Undirected graphs store both directions.
+    Parallel edges keep the lightest weight. Solved with scipy.sparse.csgraph.
+    """
+
+    def __init__(self, indptr, indices, weights, node_ids, directed, x=None, y=None, indexes=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.node_ids = node_ids
+        self.directed = directed
+        self.x = x
+        self.y = y
+        self.indexes = indexes or {} # name -> array from preprocessing (landmarks etc.), saved alongside
+        self._matrix = None
+
+    @property
+    def n(self):
+        return len(self.node_ids)
+
+    @property
+    def m(self):
+        """Stored arcs (an undirected edge counts twice)."""
+        return len(self.indices)
+
+    @classmethod
+    def from_arrays(cls, source, target, weight=None, directed=False, node_ids=None, x=None, y=None):
+        """
+        Builds the CSR arrays with bulk NumPy operations (no per-edge Python objects).
+        node_ids lists every node (needed for isolated nodes and x/y); by default the
+        nodes are the ids appearing in source/target. Raises ValueError on bad input.
+        """
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+        if source.shape != target.shape or source.ndim != 1:
+            raise ValueError("source and target must be 1-D arrays of the same length")
+
+        if weight is None:
+            weight = np.ones(len(source))
+        else:
+            weight = np.asarray(weight, dtype=np.float64)
+            if weight.shape != source.shape:
+                raise ValueError("weight must have one entry per edge")
+            if not np.all(np.isfinite(weight)):
+                raise ValueError("weights must be finite")
+
+        if node_ids is None:
+            ids = _present_ids(source, target)
+        else:
+            ids = np.asarray(node_ids, dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        if len(ids) > 1 and np.any(ids[1:] == ids[:-1]):
+            raise ValueError("node ids must be unique")
+
+        for name, coords in (("x", x), ("y", y)):
+            if coords is not None and len(coords) != len(ids):
+                raise ValueError(f"{name} must have one entry per node")
+        # Coordinates follow the (now sorted) node order
+        x = np.asarray(x, dtype=np.float64)[order] if x is not None else None
+        y = np.asarray(y, dtype=np.float64)[order] if y is not None else None
+
+        n = len(ids)
+        rows = _lookup(ids, source)
+        cols = _lookup(ids, target)
+
+        if not directed:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+            weight = np.concatenate([weight, weight])
+
+        # Sort arcs by (row, col); parallel arcs collapse to the lightest one
+        key = rows * max(n, 1) + cols
+        order = np.argsort(key)
+        key, weight = key[order], weight[order]
+        if len(key) > 1:
+            starts = np.flatnonzero(np.concatenate([[True], key[1:] != key[:-1]]))
+            if len(starts) < len(key):
+                weight = np.minimum.reduceat(weight, starts)
+                key = key[starts]
+        rows, cols = key // max(n, 1), key % max(n, 1)
+
+        # int32 offsets when they fit, matching what scipy keeps (no copy in matrix())
+        indptr = np.zeros(n + 1, dtype=np.int32 if len(cols) < 2**31 else np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32), weight, ids, directed, x, y)
+
+    @classmethod
+    def from_networkx(cls, G):
+        nodes = list(G.nodes())
+        edges = list(G.edges(data='weight', default=1))
+        return cls.from_arrays(
+            [u for u, _, _ in edges], [v for _, v, _ in edges], [w for _, _, w in edges],
+            directed=G.is_directed(), node_ids=nodes,
+            x=[G.nodes[v].get('x', 0) for v in nodes], y=[G.nodes[v].get('y', 0) for v in nodes],
+        )
+
+    def save(self, path):
+        """
+        Writes the graph as a directory of .npy files plus manifest.json. The directory is
+        written next to path and renamed into place, so readers never see half a graph.
+        """
+        path = os.path.abspath(path)
+        parent = os.path.dirname(path)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+        try:
+            arrays = {name: getattr(self, name) for name in CORE_ARRAYS}
+            if self.x is not None:
+                arrays["x"], arrays["y"] = self.x, self.y
+            for name, arr in arrays.items():
+                np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(arr))
+            if self.indexes:
+                os.mkdir(os.path.join(tmp, "indexes"))
+                for name, arr in self.indexes.items():
+                    np.save(os.path.join(tmp, "indexes", f"{name}.npy"), np.ascontiguousarray(arr))
+
+            manifest = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "directed": self.directed,
+                "n": self.n,
+                "m": self.m,
+                "arrays": {name: {"dtype": str(arr.dtype), "shape": list(arr.shape)} for name, arr in arrays.items()},
+                "indexes": sorted(self.indexes),
+            }
+            with open(os.path.join(tmp, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.rename(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Opens a graph written by save(). With mmap=True the arrays are read-only memory
+        maps: opening is O(1) and every process mapping the same files shares the pages.
+        """
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not a compiled graph")
+        if manifest.get("version", 0) > FORMAT_VERSION:
+            raise ValueError(f"{path} uses format version {manifest['version']}; this code reads up to {FORMAT_VERSION}")
+
+        def read(file):
+            # Empty arrays can't be memory-mapped
+            mode = 'r' if mmap and os.path.getsize(file) > 128 else None
+            return np.load(file, mmap_mode=mode, allow_pickle=False)
+
+        arrays = {name: read(os.path.join(path, f"{name}.npy")) for name in manifest["arrays"]}
+        indexes = {name: read(os.path.join(path, "indexes", f"{name}.npy")) for name in manifest.get("indexes", [])}
+        return cls(arrays["indptr"], arrays["indices"], arrays["weights"], arrays["node_ids"],
+                   manifest["directed"], arrays.get("x"), arrays.get("y"), indexes)
+
+    def to_networkx(self):
+        """NetworkX copy for the step-by-step engines (animation / small graphs)."""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        xs = self.x if self.x is not None else np.zeros(self.n)
+        ys = self.y if self.y is not None else np.zeros(self.n)
+        G.add_nodes_from((int(v), {"x": float(a), "y": float(b)}) for v, a, b in zip(self.node_ids, xs, ys))
+        rows = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        weights = self.weights
+        if len(weights) and np.all(weights == np.round(weights)) and np.abs(weights).max() < 2**53:
+            weights = weights.astype(np.int64) # integral weights come back as ints, like the uploaded JSON
+        G.add_weighted_edges_from(zip(self.node_ids[rows].tolist(), self.node_ids[self.indices].tolist(), weights.tolist()))
+        return G
+
+    def index_of(self, node_id):
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i >= self.n or self.node_ids[i] != node_id:
+            raise KeyError(node_id)
+        return i
+
+    def __contains__(self, node_id):
+        try:
+            self.index_of(node_id)
+            return True
+        except KeyError:
+            return False
+
+    def has_negative_weights(self):
+        return bool(len(self.weights)) and bool(self.weights.min() < 0)
+
+    def matrix(self):
+        if self._matrix is None:
+            import scipy.sparse as sp
+            # Explicit zeros in a CSR matrix are still edges to csgraph
+            self._matrix = sp.csr_matrix((self.weights, self.indices, self.indptr), shape=(self.n, self.n))
+        return self._matrix
+
+    def single_source(self, source):
+        """(distances, predecessors) over internal indices; Bellman-Ford if any weight is negative."""
+        from scipy.sparse.csgraph import dijkstra, bellman_ford
+        solver = bellman_ford if self.has_negative_weights() else dijkstra
+        # The CSR already holds both directions of undirected edges
+        return solver(self.matrix(), directed=True, indices=self.index_of(source), return_predecessors=True)
+
+    def shortest_path(self, source, target):
+        """Returns (cost, path as node ids, nodes reached)."""
+        dist, pred = self.single_source(source)
+        t = self.index_of(target)
+        cost = float(dist[t])
+        path = []
+        if np.isfinite(cost):
+            i = t
+            while i >= 0:
+                path.append(int(self.node_ids[i]))
+                i = pred[i]
+            path.reverse()
+        return cost, path, int(np.isfinite(dist).sum())
+
+class AllPairs:
+    """
+    Every shortest distance of a CompiledGraph plus a next-hop matrix, so any (u, v)
+    distance is one lookup and its path is read off in O(path length).
+
+    next_hop[i, j] is the internal index of the node after i on a shortest i -> j
+    path, -1 when j is unreachable from i (or i == j). int16 when the graph has fewer
+    than 32768 nodes, else int32.
+    """
+
+    def __init__(self, graph, dist, next_hop):
+        self.graph = graph
+        self.dist = dist
+        self.next_hop = next_hop
+
+    @classmethod
+    def compute(cls, graph):
+        """
+        One SciPy search per source (Dijkstra, or Johnson with negative weights; a
+        negative cycle raises NegativeCycleError). It runs on the reversed graph, whose
+        predecessor of i from source j is exactly the next hop from i towards j.
+        """
+        from scipy.sparse.csgraph import shortest_path
+        reverse = graph.matrix().T.tocsr()
+        dist_rev, pred_rev = shortest_path(reverse, method="auto", directed=True, return_predecessors=True)
+        next_hop = np.ascontiguousarray(pred_rev.T).astype(np.int16 if graph.n < 2**15 else np.int32)
+        next_hop[next_hop < 0] = -1 # SciPy marks "none" with -9999
+        # Transposed back: row i = distances / next hops from i
+        return cls(graph, np.ascontiguousarray(dist_rev.T), next_hop)
+
+    @property
+    def nbytes(self):
+        return self.dist.nbytes + self.next_hop.nbytes
+
+    def distance(self, source, target):
+        return float(self.dist[self.graph.index_of(source), self.graph.index_of(target)])
+
+    def path(self, source, target):
+        """Node ids of a shortest source -> target path ([] if unreachable)."""
+        i, j = self.graph.index_of(source), self.graph.index_of(target)
+        if not np.isfinite(self.dist[i, j]):
+            return []
+        path = [i]
+        while i != j:
+            i = int(self.next_hop[i, j])
+            path.append(i)
+        return self.graph.node_ids[path].tolist()
+
+def _present_ids(source, target):
+    """Sorted distinct ids in source/target (a presence table when ids are dense)."""
+    if not len(source):
+        return np.array([], dtype=np.int64)
+    lo = min(source.min(), target.min())
+    hi = max(source.max(), target.max())
+    if hi - lo <= 4 * len(source):
+        present = np.zeros(hi - lo + 1, dtype=bool)
+        present[source - lo] = True
+        present[target - lo] = True
+        return np.flatnonzero(present) + lo
+    ids = np.sort(np.concatenate([source, target]))
+    return ids[np.concatenate([[True], ids[1:] != ids[:-1]])]
+
+def _lookup(ids, values):
+    """Positions of values in the sorted ids array. Raises ValueError for unknown ids."""
+    if not len(values):
+        return np.array([], dtype=np.int64)
+    if not len(ids):
+        raise ValueError("edge endpoints must be listed in node ids")
+    lo, hi = ids[0], ids[-1]
+    if values.min() < lo or values.max() > hi:
+        raise ValueError("edge endpoints must be listed in node ids")
+    if hi - lo <= 4 * (len(ids) + len(values)):
+        # Dense ids (the usual 0..n-1): direct table instead of a binary search
+        table = np.full(hi - lo + 1, -1, dtype=np.int64)
+        table[ids - lo] = np.arange(len(ids))
+        idx = table[values - lo]
+        if np.any(idx < 0):
+            raise ValueError("edge endpoints must be listed in node ids")
+        return idx
+    idx = np.searchsorted(ids, values)
+    if np.any(ids[np.minimum(idx, len(ids) - 1)] != values):
+        raise ValueError("edge endpoints must be listed in node ids")
+    return idx
@@ -1,4 +1,8 @@
+import gzip
+import re
 import networkx as nx
+import numpy as np
+from compiled_graph import CompiledGraph
 
 def parse_edge_list(edge_list_str: str, directed: bool = True) -> nx.DiGraph:
     """
@@ -30,3 +34,134 @@ def reverse_graph(G: nx.DiGraph) -> nx.DiGraph:
     Used for Single-Destination shortest path problems.
     """
     return G.reverse(copy=True)
+
+# --- Streaming bulk import (large benchmark graphs) ---
+
+IMPORT_FORMATS = ("edgelist", "dimacs", "snap")
+COMMENT_PREFIXES = (b"#", b"%", b"c", b"p")
+DATA_LINE = re.compile(rb"^[ \t]*[^#%cp\s][^\n]*", re.MULTILINE)
+COMMENT_LINE = re.compile(rb"^[ \t]*[#%cp][^\n]*\n?", re.MULTILINE)
+
+def _open_maybe_gzip(path):
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    return gzip.open(path, "rb") if magic == b"\x1f\x8b" else open(path, "rb")
+
+def _detect_format(path, head):
+    name = str(path).lower().removesuffix(".gz")
+    if name.endswith(".gr") or head.startswith((b"c ", b"p sp")):
+        return "dimacs"
+    if b"# Directed graph" in head or b"# Undirected graph" in head or b"# Nodes:" in head:
+        return "snap"
+    return "edgelist"
+
+def _read_blocks(f, block_size):
+    """Yields byte blocks that end on a line boundary."""
+    tail = b""
+    while True:
+        data = f.read(block_size)
+        if not data:
+            if tail.strip():
+                yield tail
+            return
+        data = tail + data
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            tail = data
+            continue
+        tail = data[cut + 1:]
+        yield data[:cut + 1]
+
+def _numeric_block(block, fmt):
+    """Whitespace-separated numbers of the data lines in block (comments / headers dropped)."""
+    if block.lstrip()[:1] in COMMENT_PREFIXES or any(b"\n" + p in block for p in COMMENT_PREFIXES):
+        block = COMMENT_LINE.sub(b"", block)
+    if fmt == "dimacs":
+        # Arc lines are "a u v w"; 'a' appears nowhere else
+        block = block.replace(b"a", b" ")
+    return np.fromstring(block, dtype=np.float64, sep=" ")
+
+def _bad_line(block, fmt):
+    """(index, text) of the first data line in block that doesn't parse as numbers."""
+    for i, line in enumerate(block.split(b"\n")):
+        if not DATA_LINE.match(line):
+            continue
+        tokens = line.split()
+        if fmt == "dimacs" and tokens[:1] == [b"a"]:
+            tokens = tokens[1:]
+        try:
+            [float(t) for t in tokens]
+        except ValueError:
+            return i, line.strip().decode(errors="replace")
+    return 0, block[:80].decode(errors="replace")
+
+def load_graph_file(path, fmt: str = "auto", directed: bool = None, block_size: int = 1 << 22) -> CompiledGraph:
+    """
+    Streams a large graph file (optionally gzipped) into a CompiledGraph.
+    Formats:
+      edgelist - "u v" or "u v w" per line; '#' / '%' comments. Directed unless told otherwise.
+      dimacs   - 9th DIMACS challenge .gr: "p sp n m" header, "a u v w" arcs, "c" comments. Directed.
+      snap     - SNAP "u<TAB>v" with '#' header; "# Undirected graph" marks undirected files.
+    Node ids must be integers. The file is read in blocks of block_size bytes and each
+    block is parsed in one NumPy call; only the id / weight columns are kept.
+    """
+    with _open_maybe_gzip(path) as f:
+        head = f.read(1 << 16)
+    if fmt == "auto":
+        fmt = _detect_format(path, head)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {IMPORT_FORMATS}")
+    if directed is None:
+        directed = not (fmt == "snap" and b"# Undirected graph" in head)
+
+    node_ids = None
+    capacity = None
+    if fmt == "dimacs":
+        # "p sp n m" gives the node range (ids 1..n, incl. isolated) and the arc count
+        for line in head.split(b"\n"):
+            if line.startswith(b"p"):
+                _, _, n, m = line.split()[:4]
+                node_ids = np.arange(1, int(n) + 1)
+                capacity = int(m)
+                break
+
+    # Arcs go into preallocated columns when the count is known (DIMACS), otherwise into
+    # columns that grow by doubling, so peak memory stays near the final arrays.
+    capacity = capacity or (1 << 16)
+    source = np.empty(capacity, dtype=np.int64)
+    target = np.empty(capacity, dtype=np.int64)
+    weight = np.empty(capacity, dtype=np.float64)
+    count = 0
+    columns = None
+    line = 1 # file line number of the next block's first line
+
+    with _open_maybe_gzip(path) as f:
+        for block in _read_blocks(f, block_size):
+            first, line = line, line + block.count(b"\n")
+            try:
+                values = _numeric_block(block, fmt)
+            except ValueError:
+                index, text = _bad_line(block, fmt)
+                raise ValueError(f"{path}, line {first + index}: can't parse {text!r} as numbers") from None
+            if not len(values):
+                continue
+            if columns is None:
+                # Column count from the first data line
+                first_line = DATA_LINE.search(block).group(0)
+                columns = len(first_line.split()) - (1 if fmt == "dimacs" else 0)
+                if columns not in (2, 3) and not (fmt == "snap" and columns >= 2):
+                    raise ValueError(f"Expected 2 or 3 columns per edge, got {columns}")
+            if len(values) % columns:
+                raise ValueError("Edge lines have inconsistent column counts")
+            rows = values.reshape(-1, columns)
+
+            k = len(rows)
+            if count + k > len(source):
+                size = max(count + k, 2 * len(source))
+                source, target, weight = (np.resize(a, size) for a in (source, target, weight))
+            source[count:count + k] = rows[:, 0]
+            target[count:count + k] = rows[:, 1]
+            weight[count:count + k] = rows[:, 2] if columns >= 3 and fmt != "snap" else 1.0
+            count += k
+
+    return CompiledGraph.from_arrays(source[:count], target[:count], weight[:count], directed=directed, node_ids=node_ids)
@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+
+def lazy_import(name):
+    """
+    Module object for a top-level package that is only really imported on first
+    attribute access (importlib.util.LazyLoader). Keeps networkx / NumPy off the
+    import path of code that may never touch them, e.g. API worker startup.
+
+    Submodules (scipy.sparse.csgraph) can't be deferred this way, because finding
+    them imports the parent package; import those inside the function using them.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
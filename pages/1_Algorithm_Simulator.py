@@ -23,11 +23,16 @@ from algorithms import (
     run_bfs_equal,
     run_dag_shortest,
     run_a_star,
-    run_spfa
+    run_jps,
+    run_spfa,
+    run_multi_source_dijkstra,
+    run_multi_source_bfs
 )
 
-from visualizer import render_graph_html
+from visualizer import graph_view
 from graph_utils import reverse_graph
+from step_log import StepLog
+from metrics import instrument
 
 st.set_page_config(layout="wide", page_title="Algorithm Simulator")
 
@@ -95,11 +100,13 @@ with st.expander("Graph Generator", expanded=True):
         rows = st.number_input("Rows", 2, 10, 4)
         cols = st.number_input("Cols", 2, 10, 4)
         num_nodes = rows * cols # Override
+        # Jump Point Search only runs on uniform-cost grids
+        uniform_grid = st.checkbox("Uniform weights (Jump Point Search)", value=False)
         
     if st.button("Generate Graph"):
         # Build the graph
         if "Grid" in selected_builder_name:
-            G = generate_grid_graph(rows, cols, seed=seed)
+            G = generate_grid_graph(rows, cols, weighted=not uniform_grid, seed=seed)
         elif "Erdos" in selected_builder_name:
             G = generate_erdos_renyi(num_nodes, prob, seed=seed)
         elif "Random DAG" == selected_builder_name:
@@ -144,33 +151,48 @@ with c1:
         "BFS (Unweighted)": run_bfs_equal,
         "DAG Shortest Path": run_dag_shortest,
         "A* (A-Star)": run_a_star,
-        "SPFA": run_spfa
+        "Jump Point Search (Uniform Grid)": run_jps,
+        "SPFA": run_spfa,
+        "Multi-Source Dijkstra (Voronoi)": run_multi_source_dijkstra,
+        "Multi-Source BFS (Voronoi)": run_multi_source_bfs
     }
+    # These take a list of sources and color each node by its nearest one
+    MULTI_SOURCE_ALGOS = {"Multi-Source Dijkstra (Voronoi)", "Multi-Source BFS (Voronoi)"}
     selected_algo_name = st.selectbox("Algorithm", list(ALGO_MAP.keys()))   
 with c2:
     node_options = list(G.nodes())
-    start_node = st.selectbox("Source", node_options, index=0)
+    if selected_algo_name in MULTI_SOURCE_ALGOS:
+        sources = st.multiselect("Sources", node_options, default=node_options[:min(3, len(node_options))])
+        if not sources:
+            sources = node_options[:1]
+        start_node = sources[0]
+    else:
+        start_node = st.selectbox("Source", node_options, index=0)
+        sources = [start_node]
 with c3:  
     node_options = list(G.nodes())
     end_node = st.selectbox("Dest", node_options, index=min(len(node_options)-1, 10))
 with c4:
     # Run Algorithm Button
     st.caption("Run Algorithm")
+    trace_memory = st.checkbox("Trace memory (slower)", value=False)
     if st.button("Run Algorithm"):
         algo_func = ALGO_MAP[selected_algo_name]
         
         # Run Generator
-        gen = algo_func(G, start_node, end_node)
+        if selected_algo_name in MULTI_SOURCE_ALGOS:
+            gen = algo_func(G, sources, end_node)
+        else:
+            gen = algo_func(G, start_node, end_node)
         
-        steps = []
-        final_metrics = None
-        for state, metrics, log in gen:
-            steps.append((state, metrics, log))
-            final_metrics = metrics
+        # Keyframe + delta log: a few KB per run instead of a dict copy per step
+        steps = StepLog(G.nodes())
+        for state, metrics, log in instrument(gen, memory=trace_memory):
+            steps.append(state, metrics, log)
             
         st.session_state['steps'] = steps
         st.session_state['curr_step'] = 0
-        st.session_state['metrics'] = final_metrics
+        st.session_state['metrics'] = steps.final_metrics
         st.rerun()
 
 # --- Main Visualization Area ---
@@ -192,16 +214,15 @@ if steps and st.session_state['metrics'] and st.session_state['metrics'].path_fo
     while curr is not None:
         path_nodes.add(curr)
         curr = parents.get(curr)
-        if curr == start_node:
-            path_nodes.add(start_node)
+        if curr in sources:
+            path_nodes.add(curr)
             break
 
     # Playback Slider & Buttons
 if not steps:
     st.write("Graph generated. Ready to run algorithm.")
     # Render initial state (steps=0) equivalent
-    html = render_graph_html(G, {}, path_nodes=None, height="500px")
-    st.components.v1.html(html, height=520)
+    graph_view(G, {}, path_nodes=None, height=500, key="simulator_graph")
 else:
     # Controls
     b1, b2, b3, b4, b5 = st.columns([0.1, 0.1, 0.6, 0.1, 0.1])
@@ -229,6 +250,7 @@ else:
             st.badge("Final path", color="green", icon=":material/check_circle:")
             st.badge("In Queue", color="orange", icon=":material/queue:")
             st.badge("Visited", color="red", icon=":material/visibility:")
+            st.badge("Voronoi cell (multi-source)", color="violet", icon=":material/hub:")
             st.badge("Default", color="grey", icon=":material/circle:")
 
     # Current State
@@ -241,13 +263,14 @@ else:
     # User requested: "Green: Final shortest path" -> implies only at end.
     show_path = path_nodes if (st.session_state['curr_step'] == len(steps) - 1) else None
         
-    html = render_graph_html(G, current_state, path_nodes=show_path, height="500px")
-    st.components.v1.html(html, height=520)
+    # Same component key every step: only the step diff reaches the browser
+    graph_view(G, current_state, path_nodes=show_path, height=500, key="simulator_graph")
         
     st.info(f"Step {st.session_state['curr_step'] + 1}/{len(steps)}: {current_log}")
 
 if steps:
-    state, metric_obj, _ = steps[st.session_state['curr_step']]
+    # Already decoded above for the graph view
+    state, metric_obj = current_state, current_metrics
 
     c1, c2,  c3 = st.columns([1, 1, 1])
     with c1:
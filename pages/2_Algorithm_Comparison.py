@@ -12,10 +12,12 @@ from algorithms import (
     run_bfs_equal,
     run_dag_shortest,
     run_a_star,
+    run_jps,
     run_spfa
 )
 from visualizer import render_graph_html
 from graph_utils import reverse_graph
+from metrics import instrument
 
 st.set_page_config(layout="wide", page_title="Algorithm Comparison")
 
@@ -33,6 +35,7 @@ ALGO_MAP = {
     "BFS (Unweighted)": run_bfs_equal,
     "DAG Shortest Path": run_dag_shortest,
     "A* (A-Star)": run_a_star,
+    "Jump Point Search (Uniform Grid)": run_jps,
     "SPFA": run_spfa
 }
 
@@ -53,6 +56,8 @@ with c3:
     node_options = list(G.nodes())
     end_node = st.selectbox("Destination", node_options, index=min(len(node_options)-1, 10))
 
+trace_memory = st.checkbox("Trace peak memory (slower)", value=False)
+
 if st.button("Compare"):
     results = []
     
@@ -71,7 +76,7 @@ if st.button("Compare"):
         # Exhaust generator to get final state
         final_state = None
         final_metrics = None
-        for s, m, l in gen:
+        for s, m, l in instrument(gen, memory=trace_memory):
             final_state = s
             final_metrics = m
             
@@ -108,7 +113,10 @@ if st.button("Compare"):
     st.subheader("Comparison Table")
     df = pd.DataFrame(results)
     # Reorder columns
-    cols_order = ['Algorithm', 'Final Cost', 'Time (s)', 'Relaxations', 'Comparisons', 'Path Found']
+    cols_order = ['Algorithm', 'Final Cost', 'Time (s)', 'Algorithm Time (s)', 'Relaxations', 'Comparisons',
+                  'Queue Pushes', 'Queue Pops', 'Stale Pops', 'Peak Queue', 'Nodes Settled', 'Peak Memory (KB)', 'Path Found']
+    # Queue / memory columns only exist for engines that report them
+    cols_order = [c for c in cols_order if c in df.columns]
     st.dataframe(df[cols_order], use_container_width=True, hide_index=True)
 
 
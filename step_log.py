@@ -0,0 +1,195 @@
+from array import array
+from metrics import Metrics
+
+# Metrics fields captured per step (the engines mutate one shared Metrics object)
+SNAPSHOT_FIELDS = ("relaxations", "comparisons", "end_time", "final_cost", "path_found",
+                   "queue_pushes", "queue_pops", "stale_pops", "peak_queue", "nodes_settled",
+                   "peak_memory", "algorithm_time", "suspended_time")
+INT_FIELDS = ("relaxations", "comparisons", "queue_pushes", "queue_pops", "stale_pops",
+              "peak_queue", "nodes_settled", "peak_memory")
+
+class StepLog:
+    """
+    Compact storage for the (state, metrics, log) steps yielded by algorithms/*.
+
+    Every keyframe_interval-th step stores a full snapshot; the others store only
+    what changed since the previous step, packed into typed arrays of node indices.
+    Random access replays at most keyframe_interval deltas, and per-step metric
+    counters are stored so each step shows its own values, not the final ones.
+
+    Behaves like the list it replaces: len(), log[i], log[-1], iteration.
+    """
+
+    def __init__(self, nodes, keyframe_interval=32):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.keyframe_interval = keyframe_interval
+        self.final_metrics = None
+
+        self._keyframes = {}  # step -> full snapshot
+        self._deltas = []     # step -> delta (None for keyframe steps)
+        self._logs = []
+        self._counters = {name: array('d') for name in SNAPSHOT_FIELDS}
+        self._start_time = 0.0
+        self._integral = True # all distances so far are ints -> restore them as ints
+        self._prev = None     # unpacked arrays of the last appended step
+        self._cursor = None   # (step, unpacked arrays) of the last restored step
+
+    def __len__(self):
+        return len(self._logs)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # --- Packing ---
+
+    def _pack(self, state):
+        """Unpacked array form of a state dict: [dist, parents, visited, owner, processing, q, empty]."""
+        n = len(self.nodes)
+        inf = float('inf')
+        idx = self.index
+
+        dist = array('d', [inf]) * n
+        for node, d in state.get('distances', {}).items():
+            dist[idx[node]] = d
+            if self._integral and d != inf and not isinstance(d, int):
+                self._integral = False
+
+        parents = array('i', [-1]) * n
+        for node, p in state.get('parents', {}).items():
+            if p is not None:
+                parents[idx[node]] = idx[p]
+
+        visited = bytearray(n)
+        for node in state.get('visited', ()):
+            visited[idx[node]] = 1
+
+        owner = None
+        if 'owner' in state:
+            owner = array('i', [-1]) * n
+            for node, o in state['owner'].items():
+                if o is not None:
+                    owner[idx[node]] = idx[o]
+
+        processing = array('i', (idx[node] for node in state.get('processing', ())))
+        q_nodes = array('i', (idx[node] for node in state.get('q_nodes', ())))
+        return [dist, parents, visited, owner, processing, q_nodes, not state]
+
+    @staticmethod
+    def _diff(old, new):
+        changed = array('i', (i for i in range(len(new)) if old[i] != new[i]))
+        return changed if changed else None
+
+    def append(self, state, metrics, log):
+        step = len(self._logs)
+        packed = self._pack(state)
+
+        if step % self.keyframe_interval == 0:
+            self._keyframes[step] = packed
+            self._deltas.append(None)
+        else:
+            prev = self._prev
+            dist_idx = self._diff(prev[0], packed[0])
+            par_idx = self._diff(prev[1], packed[1])
+            vis_idx = self._diff(prev[2], packed[2])
+            owner_delta = None
+            if packed[3] is not None:
+                base = prev[3] if prev[3] is not None else array('i', [-1]) * len(self.nodes)
+                owner_idx = self._diff(base, packed[3])
+                if owner_idx is not None:
+                    owner_delta = (owner_idx, array('i', (packed[3][i] for i in owner_idx)))
+            self._deltas.append((
+                (dist_idx, array('d', (packed[0][i] for i in dist_idx))) if dist_idx else None,
+                (par_idx, array('i', (packed[1][i] for i in par_idx))) if par_idx else None,
+                vis_idx, # visited bits flip, so indices are enough
+                owner_delta,
+                packed[3] is not None,
+                packed[4] or None,
+                packed[5] or None,
+                packed[6],
+            ))
+
+        self._prev = packed
+        self._logs.append(log)
+        self._start_time = metrics.start_time
+        for name in SNAPSHOT_FIELDS:
+            self._counters[name].append(float(getattr(metrics, name)))
+        self.final_metrics = metrics
+
+    # --- Random access ---
+
+    @staticmethod
+    def _copy(unpacked):
+        dist, parents, visited, owner, processing, q_nodes, empty = unpacked
+        return [dist[:], parents[:], bytearray(visited), owner[:] if owner is not None else None, processing, q_nodes, empty]
+
+    def _unpacked(self, step):
+        start = step - step % self.keyframe_interval
+        # Stepping forward (Next / slider drag) continues from the last restored step
+        if self._cursor is not None and start <= self._cursor[0] <= step:
+            start, base = self._cursor[0], self._copy(self._cursor[1])
+        else:
+            base = self._copy(self._keyframes[start])
+
+        for s in range(start + 1, step + 1):
+            dist_delta, par_delta, vis_idx, owner_delta, has_owner, processing, q_nodes, empty = self._deltas[s]
+            if dist_delta:
+                for i, v in zip(*dist_delta):
+                    base[0][i] = v
+            if par_delta:
+                for i, v in zip(*par_delta):
+                    base[1][i] = v
+            if vis_idx:
+                for i in vis_idx:
+                    base[2][i] ^= 1
+            if has_owner and base[3] is None:
+                base[3] = array('i', [-1]) * len(self.nodes)
+            if owner_delta:
+                for i, v in zip(*owner_delta):
+                    base[3][i] = v
+            if not has_owner:
+                base[3] = None
+            base[4] = processing or array('i')
+            base[5] = q_nodes or array('i')
+            base[6] = empty
+
+        self._cursor = (step, base)
+        return base
+
+    def _metrics_at(self, step):
+        values = {name: self._counters[name][step] for name in SNAPSHOT_FIELDS}
+        for name in INT_FIELDS:
+            values[name] = int(values[name])
+        if self._integral and values["final_cost"] != float('inf'):
+            values["final_cost"] = int(values["final_cost"])
+        values["path_found"] = bool(values["path_found"])
+        return Metrics(start_time=self._start_time, **values)
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("step out of range")
+
+        dist, parents, visited, owner, processing, q_nodes, empty = self._unpacked(step)
+        if empty:
+            return {}, self._metrics_at(step), self._logs[step]
+
+        nodes = self.nodes
+        inf = float('inf')
+        if self._integral:
+            distances = {node: (int(d) if d != inf else d) for node, d in zip(nodes, dist)}
+        else:
+            distances = dict(zip(nodes, dist))
+
+        state = {
+            "visited": {nodes[i] for i, bit in enumerate(visited) if bit},
+            "processing": {nodes[i] for i in processing},
+            "distances": distances,
+            "parents": {node: (nodes[p] if p >= 0 else None) for node, p in zip(nodes, parents)},
+            "q_nodes": [nodes[i] for i in q_nodes],
+        }
+        if owner is not None:
+            state["owner"] = {node: (nodes[o] if o >= 0 else None) for node, o in zip(nodes, owner)}
+        return state, self._metrics_at(step), self._logs[step]
@@ -0,0 +1,11 @@
+import random
+
+import networkx as nx
+
+def weighted_graph(n=60, p=0.08, directed=True, seed=1, low=1, high=20):
+    """Seeded G(n, p) random graph with integer weights in [low, high]."""
+    G = nx.gnp_random_graph(n, p, seed=seed, directed=directed)
+    rng = random.Random(seed)
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.randint(low, high)
+    return G
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import admission
+from app.graph_logic import GraphGenerator
+from app.main import app
+from app.models import ColumnarGraph
+from app.routers import visualization
+from tests.helpers import weighted_graph
+
+@pytest.fixture(scope="module")
+def run_body():
+    graph = GraphGenerator.to_json(weighted_graph(n=300, p=0.02, seed=19))
+    return {"graph": graph, "algorithm": "Dijkstra", "start_node": 0, "end_node": 299}
+
+def trace_estimates(body):
+    n, m = admission.json_graph_size(body["graph"])
+    full = admission.estimate("Dijkstra", n, m, "full")
+    sampled = admission.estimate("Dijkstra", n, m, "sampled", admission.DOWNGRADE_MAX_STEPS)
+    assert sampled < full
+    return full, sampled
+
+def test_over_budget_full_trace_is_downgraded(monkeypatch, run_body):
+    full, sampled = trace_estimates(run_body)
+    monkeypatch.setattr(admission, "BUDGET_S", (full + sampled) / 2)
+
+    response = TestClient(app).post("/api/run-algorithm", json=run_body)
+    assert response.status_code == 200
+    assert response.headers["X-Admission"] == f"downgraded; max_steps={admission.DOWNGRADE_MAX_STEPS}"
+    assert len(response.json()["steps"]) <= admission.DOWNGRADE_MAX_STEPS
+
+def test_run_over_budget_even_when_sampled_is_rejected(monkeypatch, run_body):
+    full, sampled = trace_estimates(run_body)
+    monkeypatch.setattr(admission, "BUDGET_S", sampled / 2)
+
+    response = TestClient(app).post("/api/run-algorithm", json=run_body)
+    assert response.status_code == 413
+    assert response.json()["detail"]["estimate_s"] == round(full, 3)
+
+def test_within_budget_runs_as_asked(run_body):
+    response = TestClient(app).post("/api/run-algorithm", json=run_body)
+    assert response.status_code == 200
+    assert "X-Admission" not in response.headers
+    assert float(response.headers["X-Cost-Estimate"]) == pytest.approx(trace_estimates(run_body)[0], abs=1e-3)
+
+def test_generation_and_batches_are_priced_not_capped(monkeypatch):
+    client = TestClient(app)
+    assert client.post("/api/generate-graph", json={"num_nodes": 10**6}).status_code == 413
+    assert client.post("/api/batch-run", json={"num_graphs": 10**6, "num_nodes": 50}).status_code == 413
+    assert client.post("/api/batch-run", json={"num_graphs": 300, "num_nodes": 5}).status_code == 200
+
+    monkeypatch.setattr(admission, "BUDGET_S", 1e-9)
+    assert client.post("/api/generate-graph", json={"num_nodes": 10}).status_code == 413
+
+def test_busy_slots_queue_then_answer_503(monkeypatch):
+    monkeypatch.setattr(admission, "SLOTS", 1)
+    monkeypatch.setattr(admission, "QUEUE_TIMEOUT_S", 0.05)
+    monkeypatch.setattr(admission, "_slots", None)
+    expensive = admission.QUEUE_THRESHOLD_S * 2
+
+    async def scenario():
+        async with admission.slot("/test", expensive):
+            # Cheap runs never wait for a slot
+            async with admission.slot("/test", 0.0):
+                pass
+            with pytest.raises(HTTPException) as rejected:
+                async with admission.slot("/test", expensive):
+                    pass
+        # Released: the next expensive run gets the slot
+        async with admission.slot("/test", expensive):
+            pass
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+
+def test_columns_size_counts_distinct_endpoints():
+    columns = ColumnarGraph(source=[5, 5, 7, 100], target=[7, 9, 5, 5])
+    assert admission.columns_graph_size(columns) == (4, 8)
+    assert admission.columns_graph_size(columns.model_copy(update={"nodes": [5, 7, 9, 100, 200], "directed": True})) == (5, 4)
+
+def test_batch_runs_do_not_block_the_event_loop(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    def blocking_batch(request):
+        started.set()
+        release.wait(5)
+        return {"results": []}
+    monkeypatch.setattr(visualization, "run_batch", blocking_batch)
+
+    with TestClient(app) as client: # one event loop for every request
+        batch = threading.Thread(target=lambda: client.post("/api/batch-run", json={"num_graphs": 1, "num_nodes": 5}))
+        batch.start()
+        try:
+            assert started.wait(5)
+            served = []
+            other = threading.Thread(target=lambda: served.append(client.get("/metrics").status_code))
+            other.start()
+            other.join(2)
+            assert served == [200] # answered while the batch still runs
+        finally:
+            release.set()
+            batch.join(5)
@@ -0,0 +1,61 @@
+import networkx as nx
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.algorithms import ALGORITHMS, reconstruct_path
+from app.graph_logic import GraphGenerator
+from app.main import app
+from compiled_graph import AllPairs, CompiledGraph
+from tests.helpers import weighted_graph
+
+def check_against_networkx(G):
+    all_pairs = AllPairs.compute(CompiledGraph.from_networkx(G))
+    expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+    for u in G:
+        for v in G:
+            cost = expected[u].get(v, float('inf'))
+            assert all_pairs.distance(u, v) == cost
+            path = all_pairs.path(u, v)
+            if cost == float('inf'):
+                assert path == []
+            else:
+                assert path[0] == u and path[-1] == v
+                assert nx.path_weight(G, path, 'weight') == cost
+
+def test_next_hops_rebuild_shortest_paths():
+    check_against_networkx(weighted_graph(n=40, p=0.08, seed=13))
+
+def test_undirected_graph():
+    check_against_networkx(weighted_graph(n=30, p=0.1, directed=False, seed=14))
+
+def test_negative_weights_without_cycles():
+    G = nx.gn_graph(30, seed=15).reverse() # a DAG, so negative weights can't form a cycle
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]['weight'] = (i % 7) - 3
+    check_against_networkx(G)
+
+def test_next_hop_matrix_is_int16_below_32768_nodes():
+    all_pairs = AllPairs.compute(CompiledGraph.from_networkx(weighted_graph(n=20, seed=16)))
+    assert all_pairs.next_hop.dtype == np.int16
+
+def test_floyd_warshall_final_step_has_a_drawable_path():
+    G = weighted_graph(n=25, p=0.15, seed=17)
+    final = list(ALGORITHMS["Floyd-Warshall"](G, 0, 24))[-1]
+    path = reconstruct_path(final["parents"], 0, 24)
+    assert nx.path_weight(G, path, 'weight') == nx.dijkstra_path_length(G, 0, 24)
+
+def test_path_endpoint_is_invalidated_by_edge_updates():
+    client = TestClient(app)
+    G = weighted_graph(n=15, p=0.25, seed=18)
+    graph_id = client.post("/api/graphs", json={"graph": GraphGenerator.to_json(G)}).json()["graph_id"]
+
+    first = client.post(f"/api/graphs/{graph_id}/path", json={"source": 0, "target": 14}).json()
+    assert first["cost"] == nx.dijkstra_path_length(G, 0, 14)
+
+    u, v = first["path"][0], first["path"][1]
+    update = {"op": "reweight", "source": u, "target": v, "weight": 1000}
+    assert client.post(f"/api/graphs/{graph_id}/edges", json={"updates": [update]}).status_code == 200
+    G[u][v]['weight'] = 1000
+    second = client.post(f"/api/graphs/{graph_id}/path", json={"source": 0, "target": 14}).json()
+    assert second["cached"] is False
+    assert second["cost"] == nx.dijkstra_path_length(G, 0, 14)
@@ -0,0 +1,54 @@
+import copy
+
+import algorithms
+from app.algorithms import ALGORITHMS, SPECIALIZED_ALGORITHMS
+from benchmarks.suite import STREAMLIT_ENGINES, compare, engines, run_suite
+
+def small_suite():
+    return run_suite(["erdos_renyi", "grid"], ["Dijkstra", "app:Bellman-Ford"], [30], [1],
+                     ("full", "sampled", "result"), repeat=1, max_steps=20, memory=False)
+
+def test_runs_every_engine_and_trace_level():
+    results = small_suite()
+    runs = {(r["builder"], r["engine"], r["trace"]) for r in results}
+    assert ("grid", "streamlit:Dijkstra", "full") in runs
+    assert ("grid", "app:Dijkstra", "result") in runs
+    assert ("erdos_renyi", "app:Bellman-Ford", "sampled") in runs
+    assert ("erdos_renyi", "streamlit:Dijkstra", "sampled") not in runs # Streamlit engines always trace in full
+
+    by_trace = {r["trace"]: r for r in results if r["builder"] == "grid" and r["engine"] == "app:Dijkstra"}
+    assert by_trace["sampled"]["steps"] <= 20 < by_trace["full"]["steps"]
+    # Trace level changes what is recorded, not the work done
+    assert by_trace["full"]["relaxations"] == by_trace["sampled"]["relaxations"] == by_trace["result"]["relaxations"]
+
+def test_compare_flags_only_real_regressions():
+    results = small_suite()
+    baseline = {"results": copy.deepcopy(results)}
+    assert compare(results, baseline, tolerance=0.25, min_delta_s=0.002) == []
+
+    worse = copy.deepcopy(results)
+    worse[0]["relaxations"] = worse[0]["relaxations"] * 2 + 1
+    worse[1]["wall_s"] += 0.001 # within timer noise
+    regressions = compare(worse, baseline, tolerance=0.25, min_delta_s=0.002)
+    assert [(r["run"]["engine"], r["metric"]) for r in regressions] == [(results[0]["engine"], "relaxations")]
+
+def test_covers_every_engine():
+    # Every run_* engine of algorithms/ (some through a wrapper) and every API engine
+    assert len(STREAMLIT_ENGINES) == len([name for name in dir(algorithms) if name.startswith("run_")])
+    ids = {engine_id for engine_id, _, _ in engines()}
+    assert {f"app:{name}" for name in [*ALGORITHMS, *SPECIALIZED_ALGORITHMS]} <= ids
+
+def test_multi_source_engines_run_from_the_start_node():
+    results = run_suite(["grid"], ["Multi-Source Dijkstra", "Multi-Source BFS"], [25], [1], ("full",),
+                        repeat=1, max_steps=20, memory=False)
+    assert len(results) == 2
+    for row in results:
+        assert "error" not in row and row["nodes_settled"] == row["nodes"]
+
+def test_jps_runs_on_uniform_grids_only():
+    results = run_suite(["grid", "uniform_grid"], ["Jump Point Search", "A* (A-Star)"], [100], [1], ("full",),
+                        repeat=1, max_steps=20, memory=False)
+    runs = {(r["builder"], r["engine"]): r for r in results}
+    assert ("grid", "streamlit:Jump Point Search") not in runs
+    jps, a_star = runs["uniform_grid", "streamlit:Jump Point Search"], runs["uniform_grid", "streamlit:A* (A-Star)"]
+    assert 0 < jps["nodes_settled"] <= a_star["nodes_settled"]
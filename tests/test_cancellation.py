@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.algorithms import ALGORITHMS, CancelToken, Tracer
+from app.graph_logic import GraphGenerator
+from app.main import app
+from tests.helpers import weighted_graph
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_cancelled_token_stops_every_engine(algorithm):
+    G = weighted_graph(n=60, p=0.1, seed=26)
+    full = sum(1 for _ in ALGORITHMS[algorithm](G, 0, 59))
+
+    token = CancelToken()
+    token.cancel("test")
+    tracer = Tracer(cancel=token)
+    steps = 0
+    for _ in ALGORITHMS[algorithm](G, 0, 59, tracer=tracer):
+        steps += 1
+        if tracer.stopped is not None:
+            break
+    assert tracer.stopped == "test"
+    assert steps <= full
+
+def test_deadline_answers_with_a_partial_trace():
+    graph = GraphGenerator.to_json(weighted_graph(n=250, p=0.05, seed=27))
+    body = {"graph": graph, "algorithm": "Floyd-Warshall", "start_node": 0, "end_node": 249,
+            "max_steps": 50, "timeout_ms": 50}
+
+    started = time.perf_counter()
+    response = TestClient(app).post("/api/run-algorithm", json=body)
+    assert time.perf_counter() - started < 1 # the full run takes about 3 s
+    assert response.status_code == 200
+    assert response.headers["X-Partial-Result"] == "deadline"
+    assert response.json()["partial"] == "deadline"
+
+def test_deadline_is_capped_by_the_server_limit(monkeypatch):
+    from app import admission
+    monkeypatch.setattr(admission, "RUN_TIMEOUT_S", 0.01)
+    token = admission.cancel_token(timeout_ms=60_000)
+    time.sleep(0.02)
+    assert token.reason() == "deadline"
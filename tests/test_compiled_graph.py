@@ -0,0 +1,80 @@
+
+import json
+
+import networkx as nx
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from compiled_graph import CompiledGraph
+from tests.helpers import weighted_graph
+
+def columns(G):
+    edges = list(G.edges(data='weight'))
+    return {"source": [u for u, _, _ in edges], "target": [v for _, v, _ in edges],
+            "weight": [w for _, _, w in edges], "nodes": list(G.nodes()), "directed": G.is_directed()}
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_shortest_paths_match_networkx(directed):
+    G = weighted_graph(n=80, p=0.05, directed=directed, seed=34)
+    graph = CompiledGraph.from_networkx(G)
+    expected = nx.single_source_dijkstra_path_length(G, 0)
+    for target in G:
+        cost, path, _ = graph.shortest_path(0, target)
+        assert cost == expected.get(target, float('inf'))
+        if path:
+            assert nx.path_weight(G, path, 'weight') == cost
+
+def test_parallel_edges_keep_the_lightest_weight():
+    graph = CompiledGraph.from_arrays([0, 0, 1], [1, 1, 2], [5, 2, 1], directed=True)
+    assert graph.shortest_path(0, 2)[0] == 3
+
+def test_bad_columns_are_rejected():
+    with pytest.raises(ValueError):
+        CompiledGraph.from_arrays([0, 1], [1], directed=True)
+    with pytest.raises(ValueError):
+        CompiledGraph.from_arrays([0, 1], [1, 7], node_ids=[0, 1, 2])
+
+def test_save_and_load_round_trip(tmp_path):
+    G = weighted_graph(n=50, p=0.1, seed=36)
+    for node in G:
+        G.nodes[node]['x'], G.nodes[node]['y'] = float(node), -float(node)
+    graph = CompiledGraph.from_networkx(G)
+    graph.indexes["landmarks"] = np.arange(5)
+    graph.save(tmp_path / "g")
+
+    for mmap in (True, False):
+        loaded = CompiledGraph.load(tmp_path / "g", mmap=mmap)
+        for name in ("indptr", "indices", "weights", "node_ids", "x", "y"):
+            assert np.array_equal(getattr(loaded, name), getattr(graph, name))
+        assert loaded.directed == graph.directed
+        assert np.array_equal(loaded.indexes["landmarks"], np.arange(5))
+        assert loaded.shortest_path(0, 49)[0] == graph.shortest_path(0, 49)[0]
+    assert isinstance(CompiledGraph.load(tmp_path / "g").indices, np.memmap)
+
+def test_save_replaces_an_existing_graph(tmp_path):
+    CompiledGraph.from_arrays([0], [1], [4.0]).save(tmp_path / "g")
+    CompiledGraph.from_arrays([0], [1], [2.0]).save(tmp_path / "g")
+    assert CompiledGraph.load(tmp_path / "g").shortest_path(0, 1)[0] == 2.0
+    assert [p.name for p in tmp_path.iterdir()] == ["g"] # no temporary directory left behind
+
+def test_newer_format_versions_are_refused(tmp_path):
+    CompiledGraph.from_arrays([0], [1]).save(tmp_path / "g")
+    manifest_path = tmp_path / "g" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["version"] += 1
+    manifest_path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        CompiledGraph.load(tmp_path / "g")
+
+def test_columnar_upload_matches_the_json_graph():
+    client = TestClient(app)
+    G = weighted_graph(n=60, p=0.08, seed=35)
+    body = {"algorithm": "Dijkstra", "start_node": 0, "end_node": 59}
+    by_columns = client.post("/api/shortest-path", json={**body, "columns": columns(G)}).json()
+    assert by_columns["cost"] == nx.dijkstra_path_length(G, 0, 59)
+    assert nx.path_weight(G, by_columns["path"], 'weight') == by_columns["cost"]
+
+    response = client.post("/api/shortest-path", json={**body, "columns": {**columns(G), "target": [0]}})
+    assert response.status_code == 400
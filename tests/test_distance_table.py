@@ -0,0 +1,36 @@
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.algorithms import distance_table
+from app.graph_logic import GraphGenerator
+from app.main import app
+from tests.helpers import weighted_graph
+
+@pytest.mark.parametrize("workers", [None, 1, 4, 1000])
+def test_matches_networkx(workers):
+    G = weighted_graph()
+    sources, targets = [0, 5, 17, 33], [1, 2, 40, 59]
+    table = distance_table(G, sources, targets, workers=workers)
+
+    assert list(table) == sources
+    for s in sources:
+        expected = nx.single_source_dijkstra_path_length(G, s)
+        for t in targets:
+            assert table[s][t] == expected.get(t, float('inf'))
+
+def test_duplicate_sources_and_targets_are_answered_once():
+    table = distance_table(weighted_graph(), [3, 3, 4], [7, 7])
+    assert list(table) == [3, 4]
+    assert list(table[3]) == [7]
+
+def test_endpoint_rejects_zero_workers_and_answers_by_graph_json():
+    client = TestClient(app)
+    graph = GraphGenerator.to_json(weighted_graph(n=20, p=0.2))
+    body = {"sources": [0, 1], "targets": [2, 3], "graph": graph}
+
+    assert client.post("/api/distance-table", json={**body, "workers": 0}).status_code == 422
+    response = client.post("/api/distance-table", json=body)
+    assert response.status_code == 200
+    G = GraphGenerator.from_json(graph)
+    assert response.json()["distances"] == [[nx.dijkstra_path_length(G, s, t) for t in (2, 3)] for s in (0, 1)]
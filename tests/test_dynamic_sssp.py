@@ -0,0 +1,66 @@
+import random
+
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.algorithms.dynamic_sssp import DynamicSSSP
+from app.graph_logic import GraphGenerator
+from app.main import app
+from tests.helpers import weighted_graph
+
+def assert_matches_dijkstra(sssp, G):
+    expected = nx.single_source_dijkstra_path_length(G, sssp.source)
+    assert sssp.distances == expected
+    for node, parent in sssp.parents.items():
+        if parent is not None:
+            assert sssp.distances[parent] + G[parent][node]['weight'] == sssp.distances[node]
+
+def apply(G, sssp, u, v, weight):
+    """Changes u->v the way GraphStore.update_edge does and returns the repair steps."""
+    old = G[u][v]['weight'] if G.has_edge(u, v) else None
+    if weight is None:
+        G.remove_edge(u, v)
+    else:
+        G.add_edge(u, v, weight=weight)
+    directions = [(u, v)] if G.is_directed() else [(u, v), (v, u)]
+    return [step for a, b in directions for step in sssp.repair(a, b, old, weight)]
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_random_edits_match_a_fresh_dijkstra(directed):
+    G = weighted_graph(n=50, p=0.08, directed=directed, seed=6)
+    sssp = DynamicSSSP(G, 0)
+    rng = random.Random(6)
+
+    for _ in range(300):
+        u, v = rng.sample(range(50), 2)
+        if G.has_edge(u, v) and rng.random() < 0.4:
+            steps = apply(G, sssp, u, v, None)
+        else:
+            steps = apply(G, sssp, u, v, rng.randint(1, 20))
+        for step in steps:
+            assert step["visited"] == [step["current_node"]]
+            assert list(step["distances"]) == [step["current_node"]]
+        assert_matches_dijkstra(sssp, G)
+
+def test_edge_batch_is_all_or_nothing():
+    client = TestClient(app)
+    G = weighted_graph(n=12, p=0.3, seed=7)
+    graph_id = client.post("/api/graphs", json={"graph": GraphGenerator.to_json(G)}).json()["graph_id"]
+    before = client.post(f"/api/graphs/{graph_id}/sssp", json={"source": 0}).json()
+
+    u, v = next(iter(G.edges()))
+    bad = [{"op": "reweight", "source": u, "target": v, "weight": 99},
+           {"op": "remove", "source": u, "target": v},
+           {"op": "remove", "source": u, "target": v}] # already gone
+    assert client.post(f"/api/graphs/{graph_id}/edges", json={"updates": bad}).status_code == 404
+    assert client.post(f"/api/graphs/{graph_id}/sssp", json={"source": 0}).json() == before
+    edges = client.get(f"/api/graphs/{graph_id}").json()["edges"]
+    assert len(edges) == G.number_of_edges()
+
+    good = bad[:2] + [{"op": "add", "source": u, "target": v, "weight": 1}]
+    assert client.post(f"/api/graphs/{graph_id}/edges", json={"updates": good}).status_code == 200
+    G[u][v]['weight'] = 1
+    after = client.post(f"/api/graphs/{graph_id}/sssp", json={"source": 0}).json()["distances"]
+    expected = nx.single_source_dijkstra_path_length(G, 0)
+    assert {int(n): d for n, d in after.items() if d is not None} == expected
@@ -0,0 +1,86 @@
+import os
+
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.graph_logic import GraphGenerator
+from app.graph_store import GraphStore
+from app.main import app
+from app.routers import graphs
+from tests.helpers import weighted_graph
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two stores on one shared directory, like two uvicorn workers."""
+    return GraphStore(str(tmp_path)), GraphStore(str(tmp_path))
+
+def edge_weights(G):
+    return {(u, v): w for u, v, w in G.edges(data='weight')}
+
+def test_graphs_added_by_one_worker_are_served_by_another(workers):
+    a, b = workers
+    G = weighted_graph(n=25, p=0.15, seed=9)
+    graph_id = a.add(G)
+
+    entry = b.get(graph_id)
+    assert entry.version == 1 and entry.size() == (G.number_of_nodes(), G.number_of_edges())
+    assert edge_weights(entry.G) == edge_weights(G)
+    assert b.get("doesnotexist") is None and b.get("../escape") is None
+
+def test_edits_are_published_as_a_new_version(workers, tmp_path):
+    a, b = workers
+    G = weighted_graph(n=25, p=0.15, seed=9)
+    graph_id = a.add(G)
+    b.get(graph_id)
+    u, v = next(iter(G.edges()))
+
+    for weight in (100, 200, 300):
+        with a.editing(graph_id):
+            a.update_edge(graph_id, u, v, weight)
+
+    entry = b.get(graph_id)
+    assert entry.version == 4 and not entry.dirty
+    assert entry.G[u][v]['weight'] == 300
+    # b's cached sources start from the edited graph
+    assert b.sssp(graph_id, u).distances[v] == nx.dijkstra_path_length(entry.G, u, v)
+    # The live version and the one before it are kept, older ones pruned
+    assert sorted(name for name in os.listdir(tmp_path / graph_id) if name.startswith("v")) == ["v3", "v4"]
+
+def test_a_failed_batch_publishes_nothing(workers):
+    a, b = workers
+    G = weighted_graph(n=25, p=0.15, seed=9)
+    graph_id = a.add(G)
+    u, v = next(iter(G.edges()))
+    weight = G[u][v]['weight']
+
+    with pytest.raises(RuntimeError):
+        with a.editing(graph_id):
+            a.update_edge(graph_id, u, v, 100)
+            raise RuntimeError("bad batch")
+
+    assert b.get(graph_id).version == 1
+    assert a.get(graph_id).G[u][v]['weight'] == weight # half-edited copy dropped
+
+def test_removal_is_seen_by_every_worker(workers):
+    a, b = workers
+    graph_id = a.add(weighted_graph(n=10, p=0.3))
+    assert b.get(graph_id) is not None
+    assert b.remove(graph_id)
+    assert a.get(graph_id) is None and not a.remove(graph_id)
+    with a.editing(graph_id) as entry:
+        assert entry is None
+
+def test_edit_batch_on_a_graph_deleted_meanwhile_is_a_404(monkeypatch):
+    client = TestClient(app)
+    graph_id = client.post("/api/graphs", json={"graph": GraphGenerator.to_json(weighted_graph(n=10, p=0.3))}).json()["graph_id"]
+    # Deleted between the handler's lookup and the edit batch
+    def get_then_delete(graph_id):
+        entry = graphs.store.get(graph_id)
+        graphs.store.remove(graph_id)
+        return entry
+    monkeypatch.setattr(graphs, "get_entry", get_then_delete)
+
+    response = client.post(f"/api/graphs/{graph_id}/edges", json={"updates": [
+        {"op": "add", "source": 0, "target": 1, "weight": 1}]})
+    assert response.status_code == 404
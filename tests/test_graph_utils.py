@@ -0,0 +1,54 @@
+import gzip
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_utils import load_graph_file
+from tests.helpers import weighted_graph
+
+def write_edge_list(path, G, header="# test graph\n"):
+    lines = [f"{u} {v} {w}\n" for u, v, w in G.edges(data='weight')]
+    path.write_text(header + "".join(lines))
+
+def arcs(graph):
+    rows = np.repeat(np.arange(graph.n), np.diff(graph.indptr))
+    ids = graph.node_ids
+    return {(int(ids[u]), int(ids[v])): float(w) for u, v, w in zip(rows, graph.indices, graph.weights)}
+
+@pytest.mark.parametrize("block_size", [64, 1 << 22]) # blocks split mid-file / whole file
+def test_edge_list_matches_the_source_graph(tmp_path, block_size):
+    G = weighted_graph(n=40, p=0.1, seed=37)
+    write_edge_list(tmp_path / "g.txt", G)
+    graph = load_graph_file(tmp_path / "g.txt", block_size=block_size)
+    assert graph.directed
+    assert arcs(graph) == {(u, v): float(w) for u, v, w in G.edges(data='weight')}
+
+def test_gzipped_dimacs(tmp_path):
+    G = weighted_graph(n=30, p=0.1, seed=38)
+    G = nx.relabel_nodes(G, {v: v + 1 for v in G}) # DIMACS ids start at 1
+    body = "c comment\np sp 31 %d\n" % G.number_of_edges() + "".join(f"a {u} {v} {w}\n" for u, v, w in G.edges(data='weight'))
+    with gzip.open(tmp_path / "g.gr.gz", "wt") as f:
+        f.write(body)
+
+    graph = load_graph_file(tmp_path / "g.gr.gz")
+    assert graph.n == 31 # the isolated node 31 from the header is kept
+    assert arcs(graph) == {(u, v): float(w) for u, v, w in G.edges(data='weight')}
+
+def test_undirected_snap(tmp_path):
+    (tmp_path / "g.txt").write_text("# Undirected graph\n# Nodes: 3 Edges: 2\n1\t2\n2\t3\n")
+    graph = load_graph_file(tmp_path / "g.txt")
+    assert not graph.directed
+    assert graph.shortest_path(1, 3)[0] == 2
+
+@pytest.mark.parametrize("block_size", [16, 1 << 22])
+def test_unparseable_line_is_reported_with_its_number(tmp_path, block_size):
+    path = tmp_path / "g.txt"
+    path.write_text("# header\n1 2 3\n" + "2 3 4\n" * 50 + "4 x 1\n5 6 1\n")
+    with pytest.raises(ValueError, match=r"g\.txt, line 53: can't parse '4 x 1'"):
+        load_graph_file(path, block_size=block_size)
+
+def test_inconsistent_columns_are_rejected(tmp_path):
+    (tmp_path / "g.txt").write_text("1 2 3\n2 3\n")
+    with pytest.raises(ValueError):
+        load_graph_file(tmp_path / "g.txt")
@@ -0,0 +1,65 @@
+import random
+
+import networkx as nx
+import pytest
+
+from algorithms.a_star import run_a_star
+from algorithms.jps import run_jps, grid_layout
+from builders import generate_grid_graph
+
+def grid_with_walls(rows, cols, wall_rate, rng, weight=1):
+    G = generate_grid_graph(rows, cols, weighted=False)
+    if weight != 1:
+        nx.set_edge_attributes(G, weight, 'weight')
+    for node in list(G.nodes()):
+        if rng.random() < wall_rate:
+            G.remove_node(node)
+    return G
+
+def final(run):
+    *_, (state, metrics, log) = run
+    return state, metrics, log
+
+@pytest.mark.parametrize("wall_rate", [0, 0.1, 0.25, 0.4])
+def test_costs_and_paths_match_a_star(wall_rate):
+    rng = random.Random(32)
+    for _ in range(40):
+        G = grid_with_walls(rng.randint(2, 14), rng.randint(2, 14), wall_rate, rng, weight=rng.choice([1, 3]))
+        if G.number_of_nodes() < 2:
+            continue
+        s, t = rng.sample(list(G.nodes()), 2)
+        state, metrics, _ = final(run_jps(G, s, t))
+        _, reference, _ = final(run_a_star(G, s, t))
+
+        assert metrics.path_found == reference.path_found
+        if not metrics.path_found:
+            continue
+        assert metrics.final_cost == reference.final_cost
+        assert metrics.nodes_settled <= reference.nodes_settled
+        # The filled-in parents form a real path of that cost
+        path = [t]
+        while path[-1] != s:
+            path.append(state["parents"][path[-1]])
+        path.reverse()
+        assert nx.path_weight(G, path, 'weight') == metrics.final_cost
+        assert state["distances"][t] == metrics.final_cost
+
+def test_open_grid_expands_far_fewer_nodes_than_a_star():
+    G = generate_grid_graph(40, 40, weighted=False)
+    _, jps, _ = final(run_jps(G, 0, 40 * 40 - 1))
+    _, a_star, _ = final(run_a_star(G, 0, 40 * 40 - 1))
+    assert jps.final_cost == a_star.final_cost == 78
+    assert jps.nodes_settled * 10 < a_star.nodes_settled
+
+def test_non_grids_are_rejected():
+    weighted = generate_grid_graph(5, 5, weighted=False)
+    weighted[0][1]['weight'] = 2
+    with pytest.raises(ValueError):
+        grid_layout(weighted)
+    state, metrics, log = final(run_jps(weighted, 0, 24))
+    assert state == {} and log.startswith("Error")
+
+    missing = generate_grid_graph(3, 3, weighted=False)
+    missing.remove_edge(0, 1)
+    with pytest.raises(ValueError):
+        grid_layout(missing)
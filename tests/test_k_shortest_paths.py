@@ -0,0 +1,48 @@
+from itertools import islice
+
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.algorithms.k_shortest_paths import k_shortest_paths
+from app.graph_logic import GraphGenerator
+from app.main import app
+from tests.helpers import weighted_graph
+
+def reference_costs(G, source, target, k):
+    paths = islice(nx.shortest_simple_paths(G, source, target, weight='weight'), k)
+    return [nx.path_weight(G, path, 'weight') for path in paths]
+
+@pytest.mark.parametrize("k", [1, 12, 50])
+def test_costs_match_networkx(k):
+    G = weighted_graph(n=40, p=0.12, seed=3)
+    paths = k_shortest_paths(G, 0, 39, k)
+
+    assert [cost for cost, _ in paths] == reference_costs(G, 0, 39, k)
+    assert len({tuple(path) for _, path in paths}) == len(paths)
+    for cost, path in paths:
+        assert path[0] == 0 and path[-1] == 39
+        assert len(set(path)) == len(path) # loopless
+        assert nx.path_weight(G, path, 'weight') == cost
+
+def test_stop_returns_the_paths_so_far():
+    G = weighted_graph(n=40, p=0.12, seed=3)
+    assert len(k_shortest_paths(G, 0, 39, 20, stop=lambda: True)) < 20
+
+def test_negative_weight_is_rejected():
+    G = weighted_graph(n=10, p=0.5, seed=4)
+    u, v = next(iter(G.edges()))
+    G[u][v]['weight'] = -1
+    with pytest.raises(ValueError):
+        k_shortest_paths(G, 0, 9, 3)
+
+def test_run_algorithm_bounds_k():
+    client = TestClient(app)
+    graph = GraphGenerator.to_json(weighted_graph(n=15, p=0.3, seed=5))
+    body = {"graph": graph, "algorithm": "K-Shortest Paths", "start_node": 0, "end_node": 14}
+
+    assert client.post("/api/run-algorithm", json={**body, "k": 51}).status_code == 422
+    assert client.post("/api/run-algorithm", json={**body, "k": 0}).status_code == 422
+    response = client.post("/api/run-algorithm", json={**body, "k": 3})
+    assert response.status_code == 200
+    assert len(response.json()["steps"][-1]["paths"]) == 3
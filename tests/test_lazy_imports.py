@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+from app.algorithms import ALGORITHMS, LazyRegistry, SPECIALIZED_ALGORITHMS
+from benchmarks.import_time import HEAVY_MODULES, ROOT, loaded_heavy
+
+ENGINE_MODULES = ("dijkstra", "bellman_ford", "a_star", "uniform_cost_search", "floyd_warshall",
+                  "k_shortest_paths", "bfs", "dag_shortest")
+
+# Runs in a fresh interpreter: this test process has imported everything already
+PROBE = """
+import sys
+from app.algorithms import ALGORITHMS
+names = list(ALGORITHMS) + ["Dijkstra" in ALGORITHMS, len(ALGORITHMS)]
+print(sorted(m.rsplit(".", 1)[1] for m in sys.modules if m.startswith("app.algorithms.") and m.rsplit(".", 1)[1] in {engines!r}))
+ALGORITHMS["Dijkstra"]
+print(sorted(m.rsplit(".", 1)[1] for m in sys.modules if m.startswith("app.algorithms.") and m.rsplit(".", 1)[1] in {engines!r}))
+"""
+
+def test_listing_engines_imports_none_of_them():
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(engines=ENGINE_MODULES)],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    listed, after_lookup = proc.stdout.strip().splitlines()
+    assert listed == "[]"
+    assert after_lookup == "['dijkstra']"
+
+def test_api_startup_loads_no_heavy_package():
+    assert loaded_heavy("app.main", HEAVY_MODULES) == []
+
+def test_lookup_returns_the_engine_and_unknown_names_raise():
+    from app.algorithms.dijkstra import dijkstra_generator
+    assert ALGORITHMS["Dijkstra"] is dijkstra_generator
+    assert "BFS" in SPECIALIZED_ALGORITHMS and "BFS" not in ALGORITHMS
+    registry = LazyRegistry({"Missing": ".no_such_module:run"})
+    assert list(registry) == ["Missing"] and len(registry) == 1
+    with pytest.raises(KeyError):
+        registry["Other"]
@@ -0,0 +1,59 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from algorithms.dijkstra import run_dijkstra
+from app.algorithms import ALGORITHMS, EventCounter
+from app.algorithms.tracing import INIT, SETTLE, RELAX, FINAL
+from app.main import app
+from metrics import instrument
+from tests.helpers import weighted_graph
+
+def test_queue_counters_add_up():
+    G = weighted_graph(n=200, p=0.04, seed=23)
+    *_, (state, metrics, log) = run_dijkstra(G, 0, 199)
+    assert metrics.queue_pops == metrics.nodes_settled + metrics.stale_pops
+    assert metrics.queue_pushes >= metrics.queue_pops
+    assert 1 <= metrics.peak_queue <= metrics.queue_pushes
+    assert metrics.nodes_settled == len(state["visited"])
+
+def test_instrument_splits_algorithm_and_suspended_time():
+    G = weighted_graph(n=100, p=0.05, seed=24)
+    steps = 0
+    for state, metrics, log in instrument(run_dijkstra(G, 0, 99)):
+        steps += 1
+        time.sleep(0.002)
+    assert metrics.suspended_time >= 0.002 * (steps - 1)
+    assert 0 < metrics.algorithm_time < metrics.suspended_time
+
+def test_instrument_memory_is_the_peak_across_the_run():
+    G = weighted_graph(n=300, p=0.05, seed=25)
+
+    def peak(hoard):
+        kept = []
+        for state, metrics, log in instrument(run_dijkstra(G, 0, 299), memory=True):
+            if hoard:
+                kept.append(bytearray(100_000))
+        return metrics.peak_memory, len(kept)
+
+    (alone, _), (hoarding, kept) = peak(False), peak(True)
+    assert alone > 0
+    # What the consumer keeps while iterating counts too, as in benchmarks/suite.py
+    assert hoarding >= alone + kept * 100_000 // 2
+
+def test_event_counter_sees_skipped_steps():
+    G = weighted_graph(n=60, p=0.08, seed=22)
+    counter = EventCounter()
+    steps = list(ALGORITHMS["Dijkstra"](G, 0, 59, tracer=counter))
+    assert len(steps) == 1
+    full = list(ALGORITHMS["Dijkstra"](G, 0, 59))
+    assert counter.counts[SETTLE] == sum(s["description"].startswith("Processing") for s in full)
+    assert counter.counts[RELAX] == sum(s["description"].startswith("Updated") for s in full)
+    assert counter.counts[INIT] == counter.counts[FINAL] == 1
+
+def test_batch_run_reports_engine_counters():
+    response = TestClient(app).post("/api/batch-run", json={"num_graphs": 2, "num_nodes": 30, "algorithms": ["Dijkstra", "Floyd-Warshall"]})
+    assert response.status_code == 200
+    for run in response.json():
+        assert run["Dijkstra"]["settled"] >= 1 and run["Dijkstra"]["relaxations"] >= 1
+        assert run["Floyd-Warshall"]["rounds"] > 0
@@ -0,0 +1,19 @@
+import networkx as nx
+
+from app.algorithms.multi_source import nearest_sources
+from tests.helpers import weighted_graph
+
+def test_nearest_sources_owns_every_node_by_its_closest_source():
+    G = weighted_graph(directed=False, seed=2)
+    sources = [0, 10, 20]
+    distances, owner = nearest_sources(G, sources)
+
+    expected = nx.multi_source_dijkstra_path_length(G, sources)
+    assert distances == expected
+    for node, source in owner.items():
+        assert nx.dijkstra_path_length(G, source, node) == distances[node]
+
+def test_unweighted_counts_hops():
+    G = weighted_graph(directed=False, seed=2)
+    distances, _ = nearest_sources(G, [0, 1], unweighted=True)
+    assert distances == nx.multi_source_dijkstra_path_length(G, [0, 1], weight=lambda u, v, d: 1)
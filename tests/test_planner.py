@@ -0,0 +1,94 @@
+import math
+
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import planner
+from app.algorithms import result_only
+from app.graph_logic import GraphGenerator
+from app.main import app
+from compiled_graph import CompiledGraph
+from tests.helpers import weighted_graph
+
+def unit_graph():
+    G = weighted_graph(n=40, p=0.1, seed=28)
+    nx.set_edge_attributes(G, 3, 'weight')
+    return G
+
+def dag():
+    G = nx.gn_graph(40, seed=29).reverse()
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]['weight'] = (i % 9) - 2
+    return G
+
+def negative_with_cycles():
+    G = weighted_graph(n=40, p=0.1, seed=30)
+    G.add_edge(0, 1, weight=5)
+    G.add_edge(1, 0, weight=5)
+    G[0][1]['weight'] = -1
+    return G
+
+def metric_graph():
+    G = weighted_graph(n=40, p=0.1, seed=31)
+    for node in G:
+        G.nodes[node]['x'], G.nodes[node]['y'] = node % 7 * 10.0, node // 7 * 10.0
+    for u, v in G.edges():
+        (ux, uy), (vx, vy) = (G.nodes[u]['x'], G.nodes[u]['y']), (G.nodes[v]['x'], G.nodes[v]['y'])
+        G[u][v]['weight'] = math.hypot(ux - vx, uy - vy) + G[u][v]['weight']
+    return G
+
+def short_edges_with_coordinates():
+    G = metric_graph()
+    u, v = next(iter(G.edges()))
+    G[u][v]['weight'] = 0.5
+    return G
+
+CASES = [
+    (unit_graph, "BFS"),
+    (dag, "DAG Shortest Path"),
+    (negative_with_cycles, "Bellman-Ford"),
+    (metric_graph, "A*"),
+    (short_edges_with_coordinates, "Dijkstra"),
+    (weighted_graph, "Dijkstra"),
+]
+
+@pytest.mark.parametrize("build, expected", CASES)
+def test_picks_the_fastest_exact_engine(build, expected):
+    G = build()
+    plan = planner.plan(planner.GraphProperties.from_networkx(G))
+    assert plan.algorithm == expected
+
+    target = max(G.nodes())
+    *_, final = planner.engine(plan.algorithm)(G, 0, target, tracer=result_only())
+    reference = nx.single_source_bellman_ford_path_length(G, 0).get(target, float('inf'))
+    assert final["distances"][target] == pytest.approx(reference)
+
+@pytest.mark.parametrize("build, expected", CASES)
+def test_compiled_properties_match_networkx(build, expected):
+    G = build()
+    for node in G:
+        G.nodes[node].setdefault('x', 0.0)
+        G.nodes[node].setdefault('y', 0.0)
+    from_nx = planner.GraphProperties.from_networkx(G).to_dict()
+    from_compiled = planner.GraphProperties.from_compiled(CompiledGraph.from_networkx(G)).to_dict()
+    assert from_compiled == pytest.approx(from_nx)
+
+def test_compiled_plans_only_choose_the_scipy_solver():
+    negative = planner.GraphProperties.from_networkx(negative_with_cycles())
+    assert planner.plan(negative, compiled=True).algorithm == "Bellman-Ford"
+    assert planner.plan(planner.GraphProperties.from_networkx(unit_graph()), compiled=True).algorithm == "Dijkstra"
+
+def test_auto_requests_report_the_plan():
+    client = TestClient(app)
+    graph = GraphGenerator.to_json(unit_graph())
+    body = {"graph": graph, "algorithm": "auto", "start_node": 0, "end_node": 39}
+
+    for _ in range(2): # the second request is planned from the cache
+        response = client.post("/api/run-algorithm", json=body)
+        assert response.status_code == 200
+        assert response.headers["X-Planned-Algorithm"] == "BFS"
+        assert response.json()["plan"]["algorithm"] == "BFS"
+
+    response = client.post("/api/shortest-path", json=body)
+    assert response.json()["plan"]["algorithm"] == "BFS"
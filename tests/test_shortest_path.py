@@ -0,0 +1,80 @@
+import threading
+
+import networkx as nx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.graph_logic import GraphGenerator
+from app.graph_store import store
+from app.main import app
+from tests.helpers import weighted_graph
+
+client = TestClient(app)
+
+def path_cost(G, path):
+    return sum(G[u][v]['weight'] for u, v in zip(path, path[1:]))
+
+@pytest.mark.parametrize("algorithm", ["Dijkstra", "A*", "Bellman-Ford", "Uniform Cost Search", "Floyd-Warshall", "auto"])
+def test_answers_by_graph_json(algorithm):
+    G = weighted_graph(n=40, p=0.1, seed=7)
+    graph = GraphGenerator.to_json(G)
+    G = GraphGenerator.from_json(graph)
+    expected = nx.single_source_dijkstra_path_length(G, 0)
+    for target in (5, 20, 39):
+        response = client.post("/api/shortest-path", json={
+            "algorithm": algorithm, "start_node": 0, "end_node": target, "graph": graph})
+        assert response.status_code == 200
+        body = response.json()
+        if target not in expected:
+            assert body["path"] == []
+            continue
+        assert body["cost"] == expected[target]
+        assert body["path"][0] == 0 and body["path"][-1] == target
+        assert path_cost(G, body["path"]) == expected[target]
+        assert "steps" not in body # result only
+
+def test_stored_graph_caches_the_source_and_reports_it():
+    G = weighted_graph(n=30, p=0.15, seed=8)
+    graph = GraphGenerator.to_json(G)
+    G = GraphGenerator.from_json(graph)
+    graph_id = client.post("/api/graphs", json={"graph": graph}).json()["graph_id"]
+    expected = nx.single_source_dijkstra_path_length(G, 2)
+
+    first = client.post("/api/shortest-path", json={"start_node": 2, "end_node": 11, "graph_id": graph_id}).json()
+    assert client.post(f"/api/graphs/{graph_id}/sssp", json={"source": 2}).status_code == 200
+    second = client.post("/api/shortest-path", json={"start_node": 2, "end_node": 11, "graph_id": graph_id}).json()
+
+    assert first["cost"] == second["cost"] == expected.get(11, float('inf'))
+    assert not first["cached"] and second["cached"]
+    client.delete(f"/api/graphs/{graph_id}")
+
+def test_stored_graph_queries_wait_for_edits_off_the_event_loop():
+    G = weighted_graph(n=30, p=0.15, seed=8)
+    with TestClient(app) as client: # one event loop for every request
+        graph_id = client.post("/api/graphs", json={"graph": GraphGenerator.to_json(G)}).json()["graph_id"]
+        u, v = next(iter(store.get(graph_id).G.edges()))
+        answers, served = [], []
+        query = threading.Thread(target=lambda: answers.append(client.post("/api/shortest-path", json={
+            "start_node": u, "end_node": v, "graph_id": graph_id}).json()))
+        other = threading.Thread(target=lambda: served.append(client.post("/api/generate-graph", json={"num_nodes": 5}).status_code))
+
+        with store.editing(graph_id):
+            store.update_edge(graph_id, u, v, 0)
+            query.start()
+            query.join(0.3)
+            assert query.is_alive() # waiting for the edit batch...
+            other.start()
+            other.join(2)
+            assert served == [200] # ...without blocking other requests
+        query.join(5)
+        assert answers[0]["cost"] == 0
+        client.delete(f"/api/graphs/{graph_id}")
+
+def test_rejects_unknown_algorithm_graph_and_nodes():
+    graph = GraphGenerator.to_json(weighted_graph(n=5, p=0.5))
+    assert client.post("/api/shortest-path", json={"algorithm": "Nope", "start_node": 0, "end_node": 1,
+                                                   "graph": graph}).status_code == 400
+    assert client.post("/api/shortest-path", json={"start_node": 0, "end_node": 1,
+                                                   "graph_id": "missing"}).status_code == 404
+    assert client.post("/api/shortest-path", json={"start_node": 0, "end_node": 99,
+                                                   "graph": graph}).status_code == 400
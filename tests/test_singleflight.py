@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.algorithms import CancelToken
+from app.singleflight import SingleFlight, ClientDisconnected, body_fingerprint, fingerprint
+
+def engine(token, calls, release):
+    """Stands in for an engine run: polls its token until released or cancelled."""
+    calls.append(threading.get_ident())
+    while not release.is_set():
+        if token.reason() is not None:
+            return token.reason()
+        time.sleep(0.005)
+    return "done"
+
+def client(state):
+    async def disconnected():
+        return state["gone"]
+    return disconnected
+
+def test_identical_calls_share_one_run():
+    async def scenario():
+        flights, calls, release = SingleFlight("/test"), [], threading.Event()
+        token = CancelToken()
+        tasks = [asyncio.ensure_future(flights.run("k", engine, token, calls, release, cancel=token)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks), calls
+
+    results, calls = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {result for result, _ in results} == {"done"}
+
+def test_exceptions_reach_every_caller():
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        flights = SingleFlight("/test")
+        return await asyncio.gather(*(flights.run("k", fail) for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(e, ValueError) for e in asyncio.run(scenario()))
+
+def test_run_is_cancelled_only_when_every_caller_left():
+    async def scenario():
+        flights, calls, release = SingleFlight("/test"), [], threading.Event()
+        token = CancelToken()
+        first, second = {"gone": False}, {"gone": False}
+        a = asyncio.ensure_future(flights.run("k", engine, token, calls, release, cancel=token, disconnected=client(first)))
+        b = asyncio.ensure_future(flights.run("k", engine, token, calls, release, cancel=token, disconnected=client(second)))
+        await asyncio.sleep(0.05)
+
+        first["gone"] = True
+        with pytest.raises(ClientDisconnected):
+            await a
+        assert token.reason() is None # the second caller still waits on the run
+
+        second["gone"] = True
+        with pytest.raises(ClientDisconnected):
+            await b
+        assert token.reason() == "disconnected"
+
+        # The abandoned flight is gone: the same key starts a fresh run
+        fresh_token = CancelToken()
+        release.set()
+        result, shared = await flights.run("k", engine, fresh_token, calls, release, cancel=fresh_token)
+        return result, shared, calls
+
+    result, shared, calls = asyncio.run(scenario())
+    assert (result, shared, len(calls)) == ("done", False, 2)
+
+class FakeRequest:
+    def __init__(self, body):
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+@pytest.mark.parametrize("size", [100, 1 << 20]) # hashed inline / in the threadpool
+def test_body_fingerprint_keys_on_raw_bytes_and_parts(size):
+    body = b"x" * size
+
+    async def key(payload, *parts):
+        return await body_fingerprint(FakeRequest(payload), *parts)
+
+    async def scenario():
+        return (await key(body, 200, False), await key(body, 200, False),
+                await key(body, 200, True), await key(body + b" ", 200, False))
+
+    same, again, other_encoding, other_body = asyncio.run(scenario())
+    assert same == again
+    assert len({same, other_encoding, other_body}) == 3
+
+def test_fingerprint_ignores_dict_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
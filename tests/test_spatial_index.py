@@ -0,0 +1,73 @@
+import random
+
+import networkx as nx
+import pytest
+
+from app.spatial_index import GridPyramid
+
+def positioned_graph(n=2000, seed=10):
+    rng = random.Random(seed)
+    G = nx.gnm_random_graph(n, 3 * n, seed=seed, directed=True)
+    for node in G:
+        G.nodes[node]['x'], G.nodes[node]['y'] = rng.uniform(0, 1000), rng.uniform(-500, 500)
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.randint(1, 9)
+    return G
+
+def inside(G, x0, y0, x1, y1):
+    return {v for v, d in G.nodes(data=True) if x0 <= d['x'] <= x1 and y0 <= d['y'] <= y1}
+
+def rectangles(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        x, y = rng.uniform(-100, 1000), rng.uniform(-600, 500)
+        w, h = rng.uniform(1, 400), rng.uniform(1, 400)
+        yield x, y, x + w, y + h
+
+@pytest.fixture(scope="module")
+def graph():
+    return positioned_graph()
+
+@pytest.fixture(scope="module")
+def index(graph):
+    return GridPyramid(graph)
+
+def test_detail_queries_match_brute_force(graph, index):
+    for rect in rectangles(50, seed=11):
+        result = index.query(*rect, max_nodes=10_000)
+        assert not result["clustered"]
+        expected = inside(graph, *rect)
+        assert {node["id"] for node in result["nodes"] if not node.get("outside")} == expected
+        edges = {(e["source"], e["target"]) for e in result["edges"]}
+        assert edges == {(u, v) for u, v in graph.edges() if u in expected or v in expected}
+        # The other ends of edges leaving the view come along, flagged
+        assert {node["id"] for node in result["nodes"] if node.get("outside")} == {u for e in edges for u in e} - expected
+
+def test_every_edge_refers_to_returned_nodes(graph, index):
+    for max_nodes in (10_000, 40):
+        for rect in rectangles(30, seed=13):
+            result = index.query(*rect, max_nodes=max_nodes)
+            ids = [node["id"] for node in result["nodes"]]
+            assert len(ids) == len(set(ids))
+            assert {u for e in result["edges"] for u in (e["source"], e["target"])} <= set(ids)
+            assert sum(not node.get("outside") for node in result["nodes"]) <= max_nodes
+
+def test_clustered_queries_cover_every_visible_node(graph, index):
+    for rect in rectangles(50, seed=12):
+        result = index.query(*rect, max_nodes=40)
+        expected = inside(graph, *rect)
+        if not result["clustered"]:
+            assert {node["id"] for node in result["nodes"] if not node.get("outside")} == expected
+            continue
+        level = result["level"]
+        size = 1 << level
+        shift = index.finest - level
+        position = {node: i for i, node in enumerate(index.nodes)}
+        cells = {f"cell:{level}:{(index.cx[position[v]] >> shift) * size + (index.cy[position[v]] >> shift)}" for v in expected}
+        assert cells <= {node["id"] for node in result["nodes"]}
+
+def test_reversed_and_outside_rectangles(graph, index):
+    assert index.query(2000, 2000, 3000, 3000)["nodes"] == []
+    forward = index.query(100, -100, 300, 100, max_nodes=10_000)
+    backward = index.query(300, 100, 100, -100, max_nodes=10_000)
+    assert forward["nodes"] == backward["nodes"]
@@ -0,0 +1,45 @@
+import pytest
+
+from algorithms.dijkstra import run_dijkstra
+from algorithms.bellman_ford import run_bellman_ford
+from step_log import StepLog, SNAPSHOT_FIELDS
+from tests.helpers import weighted_graph
+
+def logged(run, log):
+    """Append the engine's steps to log as they come, like the simulator does;
+    returns them with the metrics counters frozen at each step."""
+    steps = []
+    for state, metrics, text in run:
+        log.append(state, metrics, text)
+        steps.append((state, {name: getattr(metrics, name) for name in SNAPSHOT_FIELDS}, text))
+    return steps
+
+@pytest.mark.parametrize("engine", [run_dijkstra, run_bellman_ford])
+@pytest.mark.parametrize("interval", [1, 5, 32])
+def test_every_step_restores_exactly(engine, interval):
+    G = weighted_graph(n=40, p=0.1, seed=3)
+    log = StepLog(G.nodes(), keyframe_interval=interval)
+    steps = logged(engine(G, 0, 39), log)
+
+    assert len(log) == len(steps)
+    # Random order exercises both keyframe restores and forward replays
+    order = list(range(len(steps)))
+    order = order[::3] + order[::-1] + order
+    for i in order:
+        state, metrics, text = log[i]
+        expected_state, expected_counters, expected_text = steps[i]
+        assert text == expected_text
+        for key in ("visited", "processing", "distances", "parents"):
+            assert state[key] == expected_state[key], (i, key)
+        assert list(state["q_nodes"]) == list(expected_state["q_nodes"])
+        for name in ("relaxations", "queue_pushes", "nodes_settled", "final_cost", "path_found"):
+            assert getattr(metrics, name) == expected_counters[name], (i, name)
+
+def test_negative_index_and_bounds():
+    G = weighted_graph(n=10, p=0.3, seed=4)
+    log = StepLog(G.nodes())
+    for step in run_dijkstra(G, 0, 9):
+        log.append(*step)
+    assert log[-1][2] == log[len(log) - 1][2]
+    with pytest.raises(IndexError):
+        log[len(log)]
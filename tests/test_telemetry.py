@@ -0,0 +1,73 @@
+import re
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.graph_logic import GraphGenerator
+from app.main import app
+from app.telemetry import CONTENT_TYPE, Registry
+from tests.helpers import weighted_graph
+
+client = TestClient(app)
+
+def sample(text, name, **labels):
+    """Value of one series in a Prometheus text scrape (0 when absent)."""
+    wanted = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}" if labels else ""
+    for line in text.splitlines():
+        if line.startswith(name + wanted + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_counters_and_histograms_sum_their_thread_shards():
+    registry = Registry()
+    hits = registry.counter("hits_total", "Hits.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+
+    def work():
+        for _ in range(1000):
+            hits.inc("/a")
+            latency.observe(0.5, "/a")
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text and "# TYPE latency_seconds histogram" in text
+    assert sample(text, "hits_total", route="/a") == 4000
+    assert sample(text, "latency_seconds_bucket", route="/a", le="0.1") == 0
+    assert sample(text, "latency_seconds_bucket", route="/a", le="1") == 4000
+    assert sample(text, "latency_seconds_bucket", route="/a", le="+Inf") == 4000
+    assert sample(text, "latency_seconds_count", route="/a") == 4000
+
+def test_metrics_endpoint_counts_requests_by_route_template():
+    before = client.get("/metrics").text
+    graph = GraphGenerator.to_json(weighted_graph(n=10, p=0.3))
+    graph_id = client.post("/api/graphs", json={"graph": graph}).json()["graph_id"]
+    client.get(f"/api/graphs/{graph_id}")
+    client.post("/api/shortest-path", json={"start_node": 0, "end_node": 9, "graph": graph})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    after = response.text
+    route = dict(method="GET", route="/api/graphs/{graph_id}", status="200")
+    assert sample(after, "shortest_path_http_requests_total", **route) == sample(before, "shortest_path_http_requests_total", **route) + 1
+    assert graph_id not in after # ids never become labels
+    runs = dict(route="/api/shortest-path", algorithm="Dijkstra", size="<=100")
+    assert sample(after, "shortest_path_algorithm_runs_total", **runs) == sample(before, "shortest_path_algorithm_runs_total", **runs) + 1
+    assert re.search(r"^shortest_path_http_requests_in_flight\S* [01]", after, re.M)
+
+def test_server_timing_header_lists_the_request_phases():
+    graph = GraphGenerator.to_json(weighted_graph(n=30, p=0.2))
+    response = client.post("/api/shortest-path", json={"start_node": 0, "end_node": 9, "graph": graph, "timings": True})
+    assert response.status_code == 200
+
+    header = dict(part.split(";dur=") for part in response.headers["Server-Timing"].split(", "))
+    phases = {name: float(ms) for name, ms in header.items()}
+    for name in ("parse", "build_graph", "run", "sanitize", "encode", "total"):
+        assert phases[name] >= 0, name
+    assert sum(ms for name, ms in phases.items() if name != "total") <= phases["total"]
+    # timings=True puts the phases up to sanitize in the body (it is encoded afterwards)
+    assert set(response.json()["timings"]) == set(phases) - {"encode", "total"}
@@ -0,0 +1,73 @@
+import networkx as nx
+import pytest
+
+from app.algorithms import ALGORITHMS, CancelToken, StepSampler, result_only
+from app.algorithms.tracing import FINAL, INIT, SETTLE
+from tests.helpers import weighted_graph
+
+def sampled(algorithm, G, max_steps, sampling="uniform"):
+    sampler = StepSampler(max_steps, sampling)
+    for step in ALGORITHMS[algorithm](G, 0, G.number_of_nodes() - 1, tracer=sampler):
+        sampler.add(step)
+    return sampler.steps()
+
+@pytest.mark.parametrize("algorithm", ["Dijkstra", "Bellman-Ford", "Floyd-Warshall", "A*"])
+@pytest.mark.parametrize("max_steps", [2, 3, 17, 200])
+def test_sampled_trace_is_bounded_and_keeps_both_ends(algorithm, max_steps):
+    G = weighted_graph(n=40, p=0.1, seed=20)
+    full = list(ALGORITHMS[algorithm](G, 0, 39))
+    steps = sampled(algorithm, G, max_steps)
+
+    assert len(steps) <= max_steps
+    assert steps[-1] == full[-1]
+    if algorithm != "Floyd-Warshall": # no initial step
+        assert steps[0] == full[0]
+    # Kept steps are a subsequence of the full trace, in order
+    positions = [full.index(step) for step in steps]
+    assert positions == sorted(positions)
+    if len(full) <= max_steps:
+        assert steps == full
+
+@pytest.mark.parametrize("max_steps", [2, 3, 10])
+def test_closing_steps_stay_within_the_budget(max_steps):
+    sampler = StepSampler(max_steps)
+    for i, kind in enumerate([INIT] + [SETTLE] * 50 + [FINAL] * 3):
+        if sampler.wants(kind):
+            sampler.add({"i": i})
+    steps = sampler.steps()
+    assert len(steps) <= max_steps
+    assert steps[0] == {"i": 0} and steps[-1] == {"i": 53} # the latest closing step wins
+
+def test_cancelled_sampled_run_stays_within_the_budget():
+    G = weighted_graph(n=200, p=0.05, seed=21)
+    token = CancelToken()
+    sampler = StepSampler(10, cancel=token)
+    for i, step in enumerate(ALGORITHMS["Dijkstra"](G, 0, 199, tracer=sampler)):
+        sampler.add(step)
+        if i == 3:
+            token.cancel()
+        if sampler.stopped is not None:
+            break
+    assert sampler.stopped == "cancelled"
+    assert len(sampler.steps()) <= 10
+
+def test_sampled_steps_are_evenly_spread():
+    G = weighted_graph(n=200, p=0.05, seed=21)
+    full = list(ALGORITHMS["Dijkstra"](G, 0, 199))
+    steps = sampled("Dijkstra", G, 50)
+    positions = [full.index(step) for step in steps[1:-1]]
+    gaps = [b - a for a, b in zip(positions, positions[1:])]
+    assert max(gaps) <= 2 * min(gaps)
+
+def test_events_sampling_keeps_settles_at_coarse_budgets():
+    G = weighted_graph(n=200, p=0.05, seed=21)
+    uniform = sampled("Dijkstra", G, 30, "uniform")
+    events = sampled("Dijkstra", G, 30, "events")
+    settles = lambda steps: sum(step["description"].startswith("Processing") for step in steps)
+    assert settles(events) > settles(uniform)
+
+def test_result_only_builds_just_the_final_step():
+    G = weighted_graph(n=40, p=0.1, seed=20)
+    for algorithm in ALGORITHMS:
+        full = list(ALGORITHMS[algorithm](G, 0, 39))
+        assert list(ALGORITHMS[algorithm](G, 0, 39, tracer=result_only())) == full[-1:]
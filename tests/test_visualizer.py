@@ -0,0 +1,48 @@
+from algorithms.dijkstra import run_dijkstra
+from visualizer import (DEFAULT_NODE_COLOR, PATH_EDGE_COLOR, edge_id, get_node_color, graph_changed, graph_data,
+                        graph_fingerprint, node_label, step_update)
+from tests.helpers import weighted_graph
+
+def test_step_update_lists_exactly_the_nodes_that_differ_from_neutral():
+    G = weighted_graph(n=30, p=0.15, seed=5)
+    for state, _, _ in run_dijkstra(G, 0, 29):
+        update = step_update(G, state)
+        listed = {node: (color, label) for node, color, label in update["nodes"]}
+        distances = state.get("distances", {})
+        for node in G.nodes():
+            drawn = (get_node_color(node, state), node_label(node, distances))
+            # Nodes left out must be what the neutral document already shows
+            assert listed.get(node, (DEFAULT_NODE_COLOR, node_label(node, {}))) == drawn
+        assert update["edges"] == []
+
+def test_step_update_highlights_the_path_edges():
+    G = weighted_graph(n=30, p=0.15, seed=5, directed=False)
+    *_, (state, metrics, _) = run_dijkstra(G, 0, 29)
+    assert metrics.path_found
+    path, node = [], 29
+    while node is not None:
+        path.append(node)
+        node = state["parents"][node]
+    update = step_update(G, state, set(path))
+    assert sorted(update["edges"]) == sorted([edge_id(G, u, v), PATH_EDGE_COLOR, 3] for v, u in zip(path, path[1:]))
+
+def test_graph_data_is_rebuilt_only_when_the_graph_changes():
+    G = weighted_graph(n=20, p=0.2, seed=6)
+    version, data = graph_data(G)
+    assert graph_data(G)[1] is data
+    assert {e["id"] for e in data["edges"]} == {edge_id(G, u, v) for u, v in G.edges()}
+
+    u, v = next(iter(G.edges()))
+    G[u][v]['weight'] += 1 # same counts, different drawing
+    assert graph_data(G)[1] is data # hashed once per graph object...
+    graph_changed(G) # ...until an in-place edit is announced
+    new_version, new_data = graph_data(G)
+    assert new_version != version and new_data is not data
+
+def test_steps_do_not_rehash_the_graph(monkeypatch):
+    G = weighted_graph(n=20, p=0.2, seed=6)
+    version, data = graph_data(G)
+    monkeypatch.setattr(G, "edges", None) # any re-hash would walk the edges
+    for _ in range(3):
+        assert graph_fingerprint(G) == version
+        assert graph_data(G) == (version, data)
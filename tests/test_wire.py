@@ -0,0 +1,73 @@
+import struct
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.algorithms import ALGORITHMS
+from app.graph_logic import GraphGenerator
+from app.main import app
+from app.wire import BINARY_MEDIA_TYPE, encode_graph, encode_steps, decode_run, decode_steps
+from tests.helpers import weighted_graph
+
+def decode_graph(payload):
+    """Reads an SPG1 payload by the layout in app/wire.py's docstring."""
+    assert payload[:4] == b"SPG1"
+    directed, n, m = struct.unpack_from("<III", payload, 4)
+    offset = 16
+    sections = []
+    for dtype, length in (('<f8', n), ('<f8', n), ('<f8', m), ('<i4', n), ('<i4', m), ('<i4', m)):
+        arr = np.frombuffer(payload, dtype=dtype, count=length, offset=offset)
+        offset += arr.nbytes + (-arr.nbytes % 8)
+        sections.append(arr)
+    x, y, weight, ids, source, target = sections
+    return bool(directed), x, y, weight, ids, source, target
+
+def test_graph_round_trip():
+    G = weighted_graph(n=25, p=0.2, seed=8)
+    for node in G:
+        G.nodes[node]['x'], G.nodes[node]['y'] = node * 1.5, -node / 3
+
+    directed, x, y, weight, ids, source, target = decode_graph(encode_graph(G))
+    assert directed
+    assert ids.tolist() == list(G.nodes())
+    assert x.tolist() == [G.nodes[v]['x'] for v in G] and y.tolist() == [G.nodes[v]['y'] for v in G]
+    decoded = {(int(ids[s]), int(ids[t])): w for s, t, w in zip(source, target, weight.tolist())}
+    assert decoded == {(u, v): w for u, v, w in G.edges(data='weight')}
+
+@pytest.mark.parametrize("algorithm", ["Dijkstra", "Bellman-Ford", "A*", "K-Shortest Paths"])
+def test_steps_round_trip(algorithm):
+    G = weighted_graph(n=20, p=0.2, seed=9)
+    steps = list(ALGORITHMS[algorithm](G, 0, 19))
+
+    decoded = decode_steps(encode_steps(steps, G.nodes()))
+    assert len(decoded) == len(steps)
+    for original, step in zip(steps, decoded):
+        assert sorted(step["visited"]) == sorted(set(original["visited"]))
+        assert sorted(step["frontier"]) == sorted(set(original["frontier"]))
+        assert step["current_node"] == original["current_node"]
+        assert step["description"] == original["description"]
+        for node in G:
+            assert step["distances"][node] == original["distances"].get(node, float('inf'))
+            assert step["parents"][node] == original["parents"].get(node)
+        if "paths" in original:
+            assert step["paths"] == original["paths"]
+
+def test_binary_and_json_bodies_carry_the_same_answer():
+    client = TestClient(app)
+    body = {"graph": GraphGenerator.to_json(weighted_graph(n=20, p=0.2, seed=9)), "algorithm": "auto",
+            "start_node": 0, "end_node": 19, "timings": True}
+    as_json = client.post("/api/run-algorithm", json=body).json()
+    response = client.post("/api/run-algorithm", json=body, headers={"Accept": BINARY_MEDIA_TYPE})
+    assert response.headers["content-type"] == BINARY_MEDIA_TYPE
+    as_binary = decode_run(response.content)
+
+    assert set(as_binary) == set(as_json) == {"steps", "plan", "timings"}
+    assert as_binary["plan"] == as_json["plan"]
+    assert len(as_binary["steps"]) == len(as_json["steps"])
+
+def test_partial_runs_are_flagged_in_the_payload():
+    steps = list(ALGORITHMS["Dijkstra"](weighted_graph(n=10, p=0.3), 0, 9))
+    decoded = decode_run(encode_steps(steps, range(10), {"partial": "deadline", "ignored": 1}))
+    assert decoded["partial"] == "deadline" and "ignored" not in decoded
+    assert set(decode_run(encode_steps(steps, range(10)))) == {"steps"}
@@ -1,98 +1,254 @@
-from pyvis.network import Network
 import networkx as nx
+import hashlib
+import json
+import os
+import weakref
 
-def get_node_color(node, state, path_nodes=None):
+# Voronoi cell colors for multi-source runs (one per source, cycled)
+PARTITION_PALETTE = [
+    '#FF8C42', '#A06CD5', '#2EC4B6', '#FF5C8A', '#8AC926',
+    '#1982C4', '#F4A261', '#6A4C93', '#E76F51', '#52B788',
+]
+
+DEFAULT_NODE_COLOR = '#E0E0E0'
+DEFAULT_EDGE_COLOR = '#888888'
+PATH_EDGE_COLOR = '#00CC00'
+
+# Static PyVis documents / graph_view data, built once per graph (and size) and
+# reused for every step: graph -> {"fingerprint": version, key: (version, value)}
+_static_html_cache = weakref.WeakKeyDictionary()
+
+def graph_fingerprint(G):
+    """
+    Version of what the drawing shows (nodes, positions, edges, weights), hashed once
+    per graph object: the pages never edit a graph after building it, so steps don't
+    pay O(V + E) to re-hash it. Code that edits a drawn graph in place must call
+    graph_changed(G).
+    """
+    per_graph = _static_html_cache.setdefault(G, {})
+    fingerprint = per_graph.get("fingerprint")
+    if fingerprint is None:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((G.is_directed(), list(G.nodes(data='pos')), list(G.edges(data='weight', default=1)))).encode())
+        fingerprint = per_graph["fingerprint"] = h.hexdigest()
+    return fingerprint
+
+def graph_changed(G):
+    """Drops G's cached version and drawings after an in-place edit."""
+    _static_html_cache.pop(G, None)
+
+def _cached(G, key, build):
+    """(fingerprint, build()) for G, built on first use (until graph_changed(G))."""
+    per_graph = _static_html_cache.setdefault(G, {})
+    hit = per_graph.get(key)
+    if hit is None:
+        hit = per_graph[key] = (graph_fingerprint(G), build())
+    return hit
+
+def get_partition_colors(state):
+    """Maps each source in state['owner'] to a palette color."""
+    owners = {o for o in state.get('owner', {}).values() if o is not None}
+    return {src: PARTITION_PALETTE[i % len(PARTITION_PALETTE)] for i, src in enumerate(sorted(owners, key=str))}
+
+def get_state_sets(state):
+    """Set views of the membership fields, so per-node color checks are O(1)."""
+    return {
+        'processing': set(state.get('processing', ())),
+        'q_nodes': set(state.get('q_nodes', ())),
+        'visited': set(state.get('visited', ())),
+    }
+
+def get_node_color(node, state, path_nodes=None, partition_colors=None, state_sets=None):
     """
     Determines the color of a node based on the current state.
     Priority:
     1. Processing (Blue)
     2. Path (Green) - Final path
     3. In Queue (Yellow)
-    4. Visited (Red)
-    5. Default (Grey)
+    4. Voronoi cell (color of its nearest source) - multi-source runs
+    5. Visited (Red)
+    6. Default (Grey)
+    Pass state_sets (from get_state_sets) when coloring many nodes of the same state.
     """
-    if node in state.get('processing', set()):
+    if state_sets is None:
+        state_sets = get_state_sets(state)
+
+    if node in state_sets['processing']:
         return '#4B4BFF' # Blue
-    
+
     if path_nodes and node in path_nodes:
         return '#00CC00' # Green
-        
-    if node in state.get('q_nodes', []):
+
+    if node in state_sets['q_nodes']:
         return '#FFD700' # Yellow
-        
-    if node in state.get('visited', set()):
+
+    if partition_colors:
+        owner = state.get('owner', {}).get(node)
+        if owner is not None:
+            return partition_colors[owner]
+
+    if node in state_sets['visited']:
         return '#FF4B4B' # Red
-        
-    return '#E0E0E0' # Grey
 
-def render_graph_html(G: nx.DiGraph, state: dict, path_nodes: set = None, height="500px", width="100%"):
+    return DEFAULT_NODE_COLOR # Grey
+
+def node_label(node, distances):
+    dist = distances.get(node, float('inf'))
+    dist_str = "∞" if dist == float('inf') else str(dist)
+    return f"{node}\n(d={dist_str})"
+
+def edge_id(G, u, v):
+    # Undirected edges get one id whichever way round they are looked up
+    if not G.is_directed() and str(v) < str(u):
+        u, v = v, u
+    return f"{u}->{v}"
+
+def graph_layout(G: nx.DiGraph):
     """
-    Converts graph and state to a PyVis HTML string.
+    Fixed screen positions: grid graphs carry their own, everything else gets one
+    spring layout up front so no step re-runs a physics simulation.
     """
-    # Create PyVis Network
-    # Create PyVis Network
-    nt = Network(height=height, width=width, directed=True, notebook=False)
-    
-    # Grid Layout Check
     has_pos = any('pos' in G.nodes[n] for n in G.nodes())
-    
-    if not has_pos:
-        nt.force_atlas_2based() # Default layout for non-grid graphs
-    
+    if has_pos:
+        return {n: (G.nodes[n]['pos'][1] * 100, G.nodes[n]['pos'][0] * 100) for n in G.nodes() if 'pos' in G.nodes[n]}
+    scale = 60 * max(1, G.number_of_nodes()) ** 0.5
+    return {n: (x * scale, y * scale) for n, (x, y) in nx.spring_layout(G, seed=42).items()}
+
+def build_static_graph_html(G: nx.DiGraph, height="500px", width="100%"):
+    """
+    PyVis document for G in its neutral state, with a fixed layout (no browser physics).
+    Built once per graph version and size; steps are applied on top by step_update_script.
+    """
+    return _cached(G, ("html", height, width), lambda: _static_graph_html(G, height, width))[1]
+
+def _static_graph_html(G, height, width):
+    # PyVis (and its Jinja templates) costs ~0.5 s to import; only pay it when drawing
+    from pyvis.network import Network
+    nt = Network(height=height, width=width, directed=True, notebook=False)
+    positions = graph_layout(G)
+
     for node in G.nodes():
-        color = get_node_color(node, state, path_nodes)
-        
-        # Label with distance if available
-        dist = state.get('distances', {}).get(node, float('inf'))
-        dist_str = "∞" if dist == float('inf') else str(dist)
-        label = f"{node}\n(d={dist_str})"
-        
-        # Physics setup
-        x, y = None, None
-        if has_pos and 'pos' in G.nodes[node]:
-             # Scale positions for PyVis
-             r, c = G.nodes[node]['pos']
-             x = c * 100 
-             y = r * 100
-             
-        nt.add_node(node, label=label, shape='circle', title=f"Node {node}", color=color, x=x, y=y, physics=not has_pos)
+        x, y = positions.get(node, (None, None))
+        nt.add_node(node, label=node_label(node, {}), shape='circle', title=f"Node {node}",
+                    color=DEFAULT_NODE_COLOR, x=x, y=y, physics=False)
 
     for u, v, data in G.edges(data=True):
-        weight = data.get('weight', 1)
-        
-        # Edge Color
-        # if u, v in path -> Green
-        edge_color = '#888888'
-        width_val = 1
-        if path_nodes and u in path_nodes and v in path_nodes:
-             # Check if this edge is actually part of the path logic
-             # This is a heuristic: if both nodes are in path, frame it green? 
-             # No, could be a cross edge. 
-             # Better check parents: v in path, and parent[v] == u
-             parents = state.get('parents', {})
-             if parents.get(v) == u:
-                 edge_color = '#00CC00'
-                 width_val = 3
-        
-        nt.add_edge(u, v, label=str(weight), color=edge_color, width=width_val)
-    
-    # Options
-    physics_enabled = "false" if has_pos else "true"
-    
-    nt.set_options(f"""
-    var options = {{
-      "physics": {{
-        "enabled": {physics_enabled},
-        "hierarchicalRepulsion": {{
-          "centralGravity": 0,
-          "springLength": 100,
-          "springConstant": 0.01,
-          "nodeDistance": 120,
-          "damping": 0.09
-        }},
-        "solver": "forceAtlas2Based"
-      }}
-    }}
+        nt.add_edge(u, v, id=edge_id(G, u, v), label=str(data.get('weight', 1)), color=DEFAULT_EDGE_COLOR, width=1)
+
+    nt.set_options("""
+    var options = {
+      "physics": {
+        "enabled": false
+      }
+    }
     """)
-        
+
     return nt.generate_html()
+
+def step_update(G: nx.DiGraph, state: dict, path_nodes: set = None):
+    """
+    One step as a diff from the neutral graph: [id, color, label] for every node
+    that isn't grey with an infinite distance, and [edge id, color, width] for
+    highlighted path edges. Everything not listed is drawn neutral.
+    """
+    state_sets = get_state_sets(state)
+    partition_colors = get_partition_colors(state) if 'owner' in state else None
+    distances = state.get('distances', {})
+    inf = float('inf')
+
+    nodes = []
+    for node in G.nodes():
+        color = get_node_color(node, state, path_nodes, partition_colors, state_sets)
+        if color != DEFAULT_NODE_COLOR or distances.get(node, inf) != inf:
+            nodes.append([node, color, node_label(node, distances)])
+
+    edges = []
+    if path_nodes:
+        # Edge is on the path if v is on it and u is v's parent
+        parents = state.get('parents', {})
+        for v in path_nodes:
+            u = parents.get(v)
+            if u in path_nodes and G.has_edge(u, v):
+                edges.append([edge_id(G, u, v), PATH_EDGE_COLOR, 3])
+
+    return {"nodes": nodes, "edges": edges}
+
+def step_update_script(update):
+    """<script> that applies a step_update to the static document's vis DataSets."""
+    payload = json.dumps(update, ensure_ascii=False).replace("</", "<\\/")
+    return f"""
+<script type="text/javascript">
+    (function () {{
+        var update = {payload};
+        nodes.update(update.nodes.map(function (n) {{ return {{id: n[0], color: n[1], label: n[2]}}; }}));
+        edges.update(update.edges.map(function (e) {{ return {{id: e[0], color: e[1], width: e[2]}}; }}));
+    }})();
+</script>
+"""
+
+def render_graph_html(G: nx.DiGraph, state: dict, path_nodes: set = None, height="500px", width="100%"):
+    """
+    Converts graph and state to a PyVis HTML string.
+    The graph document is cached per graph version; only the step's colors/labels are
+    added. For stepping through a run use graph_view, which keeps one iframe alive.
+    """
+    html = build_static_graph_html(G, height=height, width=width)
+    script = step_update_script(step_update(G, state, path_nodes))
+    return html.replace("</body>", script + "</body>", 1)
+
+def graph_data(G: nx.DiGraph):
+    """
+    (version, neutral graph) for graph_view's frontend: ids, labels, positions and
+    edge ids, cached per graph version.
+    """
+    def build():
+        positions = graph_layout(G)
+        return {
+            "directed": G.is_directed(),
+            "node_color": DEFAULT_NODE_COLOR,
+            "edge_color": DEFAULT_EDGE_COLOR,
+            "nodes": [{"id": n, "label": node_label(n, {}), "x": positions.get(n, (None, None))[0],
+                       "y": positions.get(n, (None, None))[1]} for n in G.nodes()],
+            "edges": [{"id": edge_id(G, u, v), "from": u, "to": v, "label": str(w)}
+                      for u, v, w in G.edges(data='weight', default=1)],
+        }
+    return _cached(G, "data", build)
+
+_graph_component = None
+
+def graph_view(G: nx.DiGraph, state: dict, path_nodes: set = None, height=500, key=None):
+    """
+    Draws one step in a Streamlit custom component (visualizer_frontend/) instead of an
+    HTML document: the iframe stays mounted across reruns, rebuilds the network only
+    when the graph's fingerprint changes, and otherwise just applies the step diff
+    (step_update) to its DataSets. No reload, no flicker, no re-layout per step.
+
+    The neutral graph itself is only sent when its version differs from the last one
+    sent for this key, or when a remounted iframe asks for it again (it reports
+    {"missing": version, "nonce": ...} as its value). Without a key it's always sent.
+    """
+    global _graph_component
+    import streamlit as st
+    if _graph_component is None:
+        import streamlit.components.v1 as components
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "visualizer_frontend")
+        _graph_component = components.declare_component("graph_view", path=path)
+
+    version, data = graph_data(G)
+    send_graph = True
+    if key is not None:
+        sent = st.session_state.setdefault("_graph_view_sent", {}) # key -> (version, last answered nonce)
+        last_version, answered = sent.get(key, (None, None))
+        asked = st.session_state.get(key) or {}
+        resend = asked.get("missing") == version and asked.get("nonce") != answered
+        send_graph = last_version != version or resend
+        sent[key] = (version, asked.get("nonce") if resend else answered)
+
+    return _graph_component(
+        graph=data if send_graph else None,
+        version=version,
+        update=step_update(G, state, path_nodes),
+        height=height,
+        key=key,
+        default=None,
+    )